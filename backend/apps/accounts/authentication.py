@@ -0,0 +1,93 @@
+"""
+Autenticação por token com cache, usada pela API REST e pelo WebSocket de notificações.
+
+O TokenAuthentication do DRF consulta authtoken_token + usuário a cada requisição, e o
+NotificationConsumer fazia o mesmo a cada conexão. Aqui o token (com o usuário, sem o
+hash da senha) fica no cache AUTH_TOKEN_CACHE_ALIAS por AUTH_TOKEN_CACHE_TIMEOUT segundos,
+indexado pelo SHA-256 da chave (a chave em si não vai para o cache).
+
+Invalidação (ver signals.py): remover o token (logout) apaga a entrada; salvar o usuário
+(troca de senha, desativação, mudança de cargo) apaga as entradas dos tokens dele, na hora
+e de novo após o commit. Com cache em memória local a invalidação só alcança o processo
+atual; nos demais a entrada expira pelo tempo de vida curto.
+"""
+import hashlib
+import logging
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.utils.translation import gettext_lazy as _
+from rest_framework import exceptions
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.authtoken.models import Token
+
+logger = logging.getLogger(__name__)
+
+PREFIXO = 'auth_token'
+
+
+def _cache():
+    return caches[getattr(settings, 'AUTH_TOKEN_CACHE_ALIAS', 'default')]
+
+
+def _chave(token_key):
+    return f'{PREFIXO}:{hashlib.sha256(token_key.encode("utf-8")).hexdigest()}'
+
+
+def obter_token(token_key):
+    """Token com o usuário já carregado, do cache ou do banco; None se o token não existe"""
+    chave = _chave(token_key)
+    try:
+        token = _cache().get(chave)
+    except Exception as e:
+        logger.warning(f'Cache de tokens indisponivel ({e}). Consultando o banco.')
+        token = None
+    if token is not None:
+        return token
+
+    token = Token.objects.select_related('user').defer('user__password').filter(key=token_key).first()
+    if token is not None:
+        try:
+            _cache().set(chave, token, getattr(settings, 'AUTH_TOKEN_CACHE_TIMEOUT', 60))
+        except Exception as e:
+            logger.warning(f'Nao foi possivel guardar o token no cache ({e}).')
+    return token
+
+
+def usuario_por_token(token_key):
+    """Usuário ativo dono do token, ou None"""
+    token = obter_token(token_key)
+    if token is None or not token.user.is_active:
+        return None
+    return token.user
+
+
+def invalidar_tokens(*token_keys):
+    """Remove os tokens do cache (a próxima requisição relê do banco)"""
+    if not token_keys:
+        return
+    try:
+        _cache().delete_many([_chave(token_key) for token_key in token_keys])
+    except Exception as e:
+        logger.warning(f'Nao foi possivel invalidar tokens no cache ({e}).')
+
+
+def invalidar_tokens_do_usuario(user_id):
+    """Invalida os tokens do usuário já e após o commit (evita que outra requisição regrave o estado antigo)"""
+    token_keys = list(Token.objects.filter(user_id=user_id).values_list('key', flat=True))
+    if token_keys:
+        invalidar_tokens(*token_keys)
+        transaction.on_commit(lambda: invalidar_tokens(*token_keys))
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """TokenAuthentication do DRF com o token e o usuário lidos do cache"""
+
+    def authenticate_credentials(self, key):
+        token = obter_token(key)
+        if token is None:
+            raise exceptions.AuthenticationFailed(_('Invalid token.'))
+        if not token.user.is_active:
+            raise exceptions.AuthenticationFailed(_('User inactive or deleted.'))
+        return (token.user, token)
@@ -1,5 +1,6 @@
 from django.contrib.auth.models import AbstractUser
 from django.db import models
+from apps.tracking import FieldTrackerMixin
 
 
 class Role(models.TextChoices):
@@ -11,7 +12,9 @@ class Role(models.TextChoices):
     PROCESSOS = 'processos', 'Processos'
 
 
-class User(AbstractUser):
+class User(FieldTrackerMixin, AbstractUser):
+    tracked_fields = ('role', 'is_active')
+
     role = models.CharField(
         max_length=20,
         choices=Role.choices,
@@ -0,0 +1,28 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from django.db import transaction
+from rest_framework.authtoken.models import Token
+from apps.response_cache import GRUPOS, invalidar_apos_commit
+from .authentication import invalidar_tokens, invalidar_tokens_do_usuario
+from .models import User
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def user_alterado(sender, instance, update_fields=None, **kwargs):
+    """Nome, cargo e foto aparecem em todas as listagens em cache"""
+    # O login só grava last_login, que nenhuma listagem exibe
+    if update_fields is not None and set(update_fields) <= {'last_login'}:
+        return
+    invalidar_apos_commit(*GRUPOS)
+    # Senha, situação (ativo) e cargo do usuário autenticado pelos tokens em cache
+    invalidar_tokens_do_usuario(instance.pk)
+
+
+@receiver(post_delete, sender=Token)
+def token_removido(sender, instance, **kwargs):
+    """Logout (ou remoção pelo admin): o token deixa de valer também no cache"""
+    # Após o delete o Django zera a pk (a própria key): guardar antes do on_commit
+    token_key = instance.key
+    invalidar_tokens(token_key)
+    transaction.on_commit(lambda: invalidar_tokens(token_key))
@@ -1,3 +1,42 @@
+from django.core.cache import cache
 from django.test import TestCase
+from rest_framework.authtoken.models import Token
 
-# Create your tests here.
+from .authentication import _chave, usuario_por_token
+from .models import User
+
+
+class CacheTokensTests(TestCase):
+    """Tokens em cache (authentication.py) invalidados no logout e na desativação"""
+
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.usuario = User.objects.create(username='dev', role='desenvolvedor')
+        self.token = Token.objects.create(user=self.usuario)
+        self.autorizacao = {'HTTP_AUTHORIZATION': f'Token {self.token.key}'}
+
+    def me(self):
+        return self.client.get('/api/users/me/', **self.autorizacao)
+
+    def test_logout_remove_o_token_do_cache(self):
+        self.assertEqual(self.me().status_code, 200)
+        self.assertIsNotNone(cache.get(_chave(self.token.key)))
+
+        with self.assertNoLogs('apps.accounts.authentication', 'WARNING'), \
+                self.captureOnCommitCallbacks(execute=True):
+            resposta = self.client.post('/api/users/logout/', **self.autorizacao)
+        self.assertEqual(resposta.status_code, 200)
+        self.assertIsNone(cache.get(_chave(self.token.key)))
+        self.assertEqual(self.me().status_code, 401)
+
+    def test_desativacao_invalida_os_tokens_do_usuario(self):
+        self.assertEqual(self.me().status_code, 200)
+
+        self.usuario.is_active = False
+        with self.captureOnCommitCallbacks(execute=True):
+            self.usuario.save()
+            # Já na transação: o cache não guarda mais o usuário ativo
+            self.assertIsNone(cache.get(_chave(self.token.key)))
+        self.assertIsNone(usuario_por_token(self.token.key))
+        self.assertEqual(self.me().status_code, 401)
@@ -8,6 +8,7 @@ from rest_framework.authtoken.models import Token
 from django.contrib.auth import login, logout
 from django.utils.decorators import method_decorator
 from django.views.decorators.csrf import csrf_exempt
+from apps.response_cache import resposta_em_cache
 from .models import User
 from .serializers import UserSerializer, LoginSerializer, ChangePasswordSerializer, RegisterSerializer
 
@@ -28,6 +29,10 @@ class UserViewSet(viewsets.ModelViewSet):
             queryset = queryset.filter(role=role)
         return queryset
 
+    @resposta_em_cache('users')
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+
     def get_serializer_context(self):
         context = super().get_serializer_context()
         context['request'] = self.request
@@ -1,3 +1,65 @@
 from django.contrib import admin
+from django.utils import timezone
+from .models import NotificationOutbox, SprintRollover, CardTodoTemplate
 
-# Register your models here.
+
+@admin.register(NotificationOutbox)
+class NotificationOutboxAdmin(admin.ModelAdmin):
+    list_display = ['id', 'tipo_evento', 'created_at', 'disponivel_em', 'processado_em', 'atraso_display', 'tentativas']
+    list_filter = ['tipo_evento', ('processado_em', admin.EmptyFieldListFilter)]
+    readonly_fields = [
+        'tipo_evento', 'payload', 'chave_agrupamento', 'tentativas', 'ultimo_erro', 'created_at', 'disponivel_em', 'processado_em',
+    ]
+    ordering = ['-id']
+
+    @admin.display(description='Atraso de entrega')
+    def atraso_display(self, obj):
+        return f'{obj.atraso_entrega.total_seconds():.1f}s'
+
+    def has_add_permission(self, request):
+        return False
+
+    def changelist_view(self, request, extra_context=None):
+        """Exibe a profundidade da outbox e o atraso de entrega acima da listagem"""
+        agora = timezone.now()
+        # Eventos ainda na janela de agrupamento não contam como atraso
+        pendentes = NotificationOutbox.objects.filter(processado_em__isnull=True, disponivel_em__lte=agora)
+        mais_antigo = pendentes.order_by('id').values_list('disponivel_em', flat=True).first()
+        # Atraso médio dos últimos eventos entregues
+        recentes = NotificationOutbox.objects.filter(
+            processado_em__isnull=False
+        ).order_by('-id').values_list('disponivel_em', 'processado_em')[:200]
+        atrasos = [max((processado - disponivel).total_seconds(), 0) for disponivel, processado in recentes]
+
+        extra_context = extra_context or {}
+        extra_context['outbox_stats'] = {
+            'pendentes': pendentes.count(),
+            'com_erro': pendentes.filter(tentativas__gt=0).count(),
+            'pendente_mais_antigo_s': round((agora - mais_antigo).total_seconds(), 1) if mais_antigo else 0,
+            'atraso_medio_s': round(sum(atrasos) / len(atrasos), 2) if atrasos else 0,
+            'atraso_maximo_s': round(max(atrasos), 2) if atrasos else 0,
+        }
+        return super().changelist_view(request, extra_context=extra_context)
+
+
+@admin.register(SprintRollover)
+class SprintRolloverAdmin(admin.ModelAdmin):
+    list_display = ['sprint', 'sprint_destino', 'status', 'projetos_criados', 'cards_copiados', 'todos_copiados', 'updated_at']
+    list_filter = ['status']
+    readonly_fields = [
+        'sprint', 'sprint_destino', 'criado_por', 'status', 'copiar_todos', 'projetos_mapeados', 'ultimo_card_id',
+        'resumo', 'projetos_criados', 'cards_copiados', 'todos_copiados', 'created_at', 'updated_at', 'concluida_em',
+    ]
+
+    def has_add_permission(self, request):
+        return False
+
+
+@admin.register(CardTodoTemplate)
+class CardTodoTemplateAdmin(admin.ModelAdmin):
+    """TODOs originais dos cards novos; as alterações valem para os próximos cards criados"""
+    list_display = ['label', 'area', 'codigo', 'ordem', 'depende_complexidade', 'ativo']
+    list_filter = ['area', 'ativo', 'depende_complexidade']
+    list_editable = ['ordem', 'ativo']
+    search_fields = ['label', 'codigo']
+    ordering = ['area', 'ordem', 'id']
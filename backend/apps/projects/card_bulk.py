@@ -0,0 +1,159 @@
+"""
+Alteração de cards em lote (POST /api/cards/bulk/).
+
+Reorganizar o quadro era um PATCH por card, e cada um pagava a leitura do estado anterior
+no pre_save, a comparação campo a campo, um CardLog e um evento de notificação. Aqui cada
+operação (lista de cards + novos valores de status, responsável, prioridade e/ou projeto)
+vira um único UPDATE, sem signals:
+
+- o estado anterior de todos os cards é lido em uma consulta (com lock);
+- só os cards que realmente mudam são atualizados (updated_at incluído, para o GET condicional);
+- o histórico é um CardLog compacto por card alterado, inserido com um bulk_create;
+- as notificações saem em um único evento na outbox, com um resumo por destinatário.
+"""
+import logging
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.utils import timezone
+
+from apps.response_cache import invalidar_apos_commit
+from .card_log_utils import STATUS_LABELS, PRIORIDADE_LABELS
+from .models import Card, CardLog, CardLogEventType, OutboxEventType, Project
+from .outbox import registrar_evento
+from .serializers import format_user_name
+
+logger = logging.getLogger(__name__)
+
+User = get_user_model()
+
+# Campo da operação -> campo do modelo
+CAMPOS_LOTE = {
+    'status': 'status',
+    'prioridade': 'prioridade',
+    'responsavel': 'responsavel_id',
+    'projeto': 'projeto_id',
+}
+
+# Limite de cards por requisição
+MAX_CARDS_LOTE = 500
+
+# Projeto das demandas: alterações nelas também avisam os supervisores
+PROJETO_DEMANDAS = 'Sugestões'
+
+
+def _descrever(diferencas, usuarios, projetos):
+    """Linhas do log de um card: "Campo: antes → depois" para cada campo alterado"""
+    linhas = []
+    for campo, (antes, depois) in diferencas.items():
+        if campo == 'status':
+            linhas.append(f'Status: {STATUS_LABELS.get(antes, antes)} → {STATUS_LABELS.get(depois, depois)}')
+        elif campo == 'prioridade':
+            linhas.append(f'Prioridade: {PRIORIDADE_LABELS.get(antes, antes)} → {PRIORIDADE_LABELS.get(depois, depois)}')
+        elif campo == 'responsavel_id':
+            nomes = [format_user_name(usuarios.get(user_id)) or 'Ninguém' for user_id in (antes, depois)]
+            linhas.append(f'Responsável: {nomes[0]} → {nomes[1]}')
+        elif campo == 'projeto_id':
+            nomes = [projetos[project_id]['nome'] if project_id in projetos else 'N/A' for project_id in (antes, depois)]
+            linhas.append(f'Projeto: {nomes[0]} → {nomes[1]}')
+    return linhas
+
+
+def aplicar_operacoes(operacoes, usuario=None):
+    """
+    Aplica as operações em uma transação. Cada operação: {'cards': [ids], e ao menos um de
+    'status', 'prioridade', 'responsavel', 'projeto'}. Um card aparece em uma só operação
+    (validado em CardBulkUpdateSerializer). Retorna os ids dos cards alterados.
+    """
+    card_ids = [card_id for operacao in operacoes for card_id in operacao['cards']]
+    with transaction.atomic():
+        atuais = {
+            linha['id']: linha
+            for linha in Card.objects.select_for_update().filter(id__in=card_ids).values(
+                'id', 'nome', 'projeto__nome', *CAMPOS_LOTE.values()
+            )
+        }
+        agora = timezone.now()
+        alterados = {}  # card_id -> {campo: (antes, depois)}
+        for operacao in operacoes:
+            novos = {campo_modelo: operacao[campo] for campo, campo_modelo in CAMPOS_LOTE.items() if campo in operacao}
+            mudaram = []
+            for card_id in operacao['cards']:
+                atual = atuais.get(card_id)
+                if atual is None:
+                    continue
+                diferencas = {campo: (atual[campo], valor) for campo, valor in novos.items() if atual[campo] != valor}
+                if diferencas:
+                    alterados[card_id] = diferencas
+                    mudaram.append(card_id)
+            if mudaram:
+                # update() não dispara signals nem auto_now: updated_at vai junto
+                Card.objects.filter(id__in=mudaram).update(**novos, updated_at=agora)
+
+        if not alterados:
+            return []
+
+        # Nomes para o histórico e destinatários: uma consulta por tabela, só se o campo mudou
+        usuario_ids = {
+            user_id for diferencas in alterados.values() for user_id in diferencas.get('responsavel_id', ()) if user_id
+        }
+        usuarios = User.objects.in_bulk(usuario_ids) if usuario_ids else {}
+        project_ids = {atuais[card_id]['projeto_id'] for card_id in alterados}
+        project_ids.update(
+            project_id for diferencas in alterados.values() for project_id in diferencas.get('projeto_id', ())
+        )
+        projetos = {
+            projeto['id']: projeto
+            for projeto in Project.objects.filter(id__in=project_ids).values('id', 'nome', 'gerente_atribuido_id')
+        }
+
+        usuario_id = getattr(usuario, 'id', None)
+        CardLog.objects.bulk_create([
+            CardLog(
+                card_id=card_id,
+                tipo_evento=CardLogEventType.MOVIMENTADO if 'status' in diferencas else CardLogEventType.ALTERACAO,
+                descricao='\n'.join(
+                    [f'O card "{atuais[card_id]["nome"]}" foi alterado em lote:']
+                    + [f'• {linha}' for linha in _descrever(diferencas, usuarios, projetos)]
+                ),
+                usuario_id=usuario_id,
+            )
+            for card_id, diferencas in alterados.items()
+        ], batch_size=500)
+
+        _registrar_notificacao(alterados, atuais, projetos, usuario)
+
+        if any('projeto_id' in diferencas for diferencas in alterados.values()):
+            # Contagem de cards da listagem de projetos em cache
+            invalidar_apos_commit('projects')
+
+    logger.info(f'Alteracao em lote: {len(alterados)} card(s) de {len(card_ids)} informado(s)')
+    return list(alterados)
+
+
+def _registrar_notificacao(alterados, atuais, projetos, usuario):
+    """Um único evento na outbox: por destinatário, quantos cards e quantas mudanças de cada tipo"""
+    destinatarios = {}
+    demandas = 0
+    for card_id, diferencas in alterados.items():
+        atual = atuais[card_id]
+        # Responsável e gerente do projeto, antes e depois da alteração
+        envolvidos = {atual['responsavel_id']}
+        envolvidos.update(diferencas.get('responsavel_id', ()))
+        for project_id in {atual['projeto_id'], *diferencas.get('projeto_id', ())}:
+            envolvidos.add(projetos.get(project_id, {}).get('gerente_atribuido_id'))
+        for user_id in envolvidos - {None}:
+            contagem = destinatarios.setdefault(str(user_id), {'cards': 0})
+            contagem['cards'] += 1
+            for campo in diferencas:
+                contagem[campo] = contagem.get(campo, 0) + 1
+        if atual['projeto__nome'] == PROJETO_DEMANDAS:
+            demandas += 1
+
+    registrar_evento(
+        OutboxEventType.CARDS_BULK_UPDATED,
+        usuario_nome=format_user_name(usuario) or 'Alguém',
+        destinatarios=destinatarios,
+        demandas=demandas,
+        card_ids=list(alterados)[:50],
+    )
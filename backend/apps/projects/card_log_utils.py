@@ -0,0 +1,164 @@
+"""
+Textos do histórico (CardLog) e das notificações de cards.
+
+Os mapas de labels são montados uma única vez a partir das choices dos modelos e
+compartilhados pelos signals e pela outbox, em vez de serem recriados a cada save.
+"""
+from django.contrib.auth import get_user_model
+
+from .models import CardStatus, Priority, CardArea, CardType, CardTodoStatus
+from .serializers import format_user_name
+
+User = get_user_model()
+
+# No quadro e no histórico o status final aparece como "Concluído"
+STATUS_LABELS = {**dict(CardStatus.choices), CardStatus.FINALIZADO.value: 'Concluído'}
+PRIORIDADE_LABELS = dict(Priority.choices)
+AREA_LABELS = dict(CardArea.choices)
+TIPO_LABELS = dict(CardType.choices)
+TODO_STATUS_LABELS = dict(CardTodoStatus.choices)
+
+# Itens de complexidade (ID -> label e horas), os mesmos exibidos no frontend
+COMPLEXIDADE_ITENS = {
+    'ler_script': {'label': 'Ler script e conferir informações do video', 'hours': 1},
+    'solicitar_usuario': {'label': 'Solicitar criação de usuário / vm', 'hours': 1},
+    'testes_iniciais': {'label': 'Testes iniciais na maquina', 'hours': 3},
+    'configurar_projeto': {'label': 'Configurar projeto na vm', 'hours': 1},
+    'desenvolvimento_basico': {'label': 'Desenvolvimento básico', 'hours': 8},
+    'desenvolvimento_medio': {'label': 'Desenvolvimento médio', 'hours': 24},
+    'desenvolvimento_dificil': {'label': 'Desenvolvimento difícil', 'hours': 40},
+}
+
+# Campos com choices comparados na atualização: (campo, label do campo, mapa de labels)
+CAMPOS_COM_CHOICES = (
+    ('prioridade', 'Prioridade', PRIORIDADE_LABELS),
+    ('area', 'Área', AREA_LABELS),
+    ('tipo', 'Tipo', TIPO_LABELS),
+)
+
+
+def _formatar_item_complexidade(item_id):
+    info = COMPLEXIDADE_ITENS.get(item_id)
+    if info:
+        return f'{info["label"]}: {info["hours"]}h'
+    # Fallback se não estiver no mapeamento
+    return item_id.replace('_', ' ').title()
+
+
+def _formatar_item_personalizado(item):
+    if isinstance(item, dict):
+        return f'{item.get("label", "Item personalizado")}: {item.get("hours", 0)}h'
+    return str(item)
+
+
+def formatar_complexidade(selected_items, selected_development, custom_items, omitir_dev_repetido=False):
+    """Lista de linhas da complexidade do card (itens selecionados, desenvolvimento e personalizados)"""
+    selected_items = selected_items or []
+    linhas = [_formatar_item_complexidade(item_id) for item_id in selected_items]
+    if selected_development and not (omitir_dev_repetido and selected_development in selected_items):
+        linhas.append(_formatar_item_complexidade(selected_development))
+    linhas.extend(_formatar_item_personalizado(item) for item in custom_items or [])
+    return linhas
+
+
+def descrever_criacao(card):
+    """Descrição do CardLog de criação com os dados iniciais do card"""
+    partes = [f'Card "{card.nome}" criado com os seguintes dados:', f'• Nome: {card.nome}']
+    if card.descricao:
+        partes.append(f'• Descrição: {card.descricao[:100]}{"..." if len(card.descricao) > 100 else ""}')
+    partes.append(f'• Status: {STATUS_LABELS.get(card.status, card.status)}')
+    partes.append(f'• Prioridade: {PRIORIDADE_LABELS.get(card.prioridade, card.prioridade)}')
+    partes.append(f'• Área: {AREA_LABELS.get(card.area, card.area)}')
+    partes.append(f'• Tipo: {TIPO_LABELS.get(card.tipo, card.tipo)}')
+    if card.responsavel_id:
+        partes.append(f'• Responsável: {format_user_name(card.responsavel)}')
+    else:
+        partes.append('• Responsável: Não atribuído')
+    if card.data_inicio:
+        partes.append(f'• Data de Início: {card.data_inicio.strftime("%d/%m/%Y %H:%M")}')
+    if card.data_fim:
+        partes.append(f'• Data de Fim: {card.data_fim.strftime("%d/%m/%Y %H:%M")}')
+    if card.script_url:
+        partes.append(f'• Script URL: {card.script_url}')
+
+    complexidade = formatar_complexidade(
+        card.complexidade_selected_items,
+        card.complexidade_selected_development,
+        card.complexidade_custom_items,
+    )
+    if complexidade:
+        partes.append('• Complexidade do projeto:')
+        partes.extend(f'  - {linha}' for linha in complexidade)
+    return '\n'.join(partes)
+
+
+def _formatar_data(valor):
+    return valor.strftime('%d/%m/%Y') if valor else 'Não definida'
+
+
+def descrever_alteracoes(card, anterior):
+    """
+    Compara o card com os valores anteriores (card._previous_data) em uma única passada.
+
+    Retorno: (lista de mudanças formatadas, se o comentário do card mudou)
+    """
+    changes = []
+
+    if anterior.get('nome') != card.nome:
+        changes.append(f'Nome: "{anterior.get("nome")}" → "{card.nome}"')
+
+    if anterior.get('descricao') != card.descricao:
+        old_desc = anterior.get('descricao') or '(vazio)'
+        new_desc = card.descricao or '(vazio)'
+        changes.append(f'Descrição: "{old_desc[:50]}..." → "{new_desc[:50]}..."')
+
+    for campo, label, labels in CAMPOS_COM_CHOICES:
+        old_value = anterior.get(campo)
+        new_value = getattr(card, campo)
+        if old_value != new_value:
+            changes.append(f'{label}: {labels.get(old_value, old_value)} → {labels.get(new_value, new_value)}')
+
+    old_resp_id = anterior.get('responsavel_id')
+    if old_resp_id != card.responsavel_id:
+        if old_resp_id:
+            old_user = User.objects.filter(id=old_resp_id).first()
+            old_resp = format_user_name(old_user) if old_user else 'N/A'
+        else:
+            old_resp = 'Ninguém'
+        new_resp = format_user_name(card.responsavel) if card.responsavel_id else 'Ninguém'
+        changes.append(f'Responsável: {old_resp} → {new_resp}')
+
+    if anterior.get('data_inicio') != card.data_inicio:
+        changes.append(f'Data de Início: {_formatar_data(anterior.get("data_inicio"))} → {_formatar_data(card.data_inicio)}')
+
+    if anterior.get('data_fim') != card.data_fim:
+        changes.append(f'Data de Fim: {_formatar_data(anterior.get("data_fim"))} → {_formatar_data(card.data_fim)}')
+
+    # Complexidade: mostra apenas o estado atual, no mesmo formato do log de criação
+    complexidade_mudou = (
+        (anterior.get('complexidade_selected_items') or []) != (card.complexidade_selected_items or []) or
+        anterior.get('complexidade_selected_development') != card.complexidade_selected_development or
+        (anterior.get('complexidade_custom_items') or []) != (card.complexidade_custom_items or [])
+    )
+    if complexidade_mudou:
+        linhas = formatar_complexidade(
+            card.complexidade_selected_items,
+            card.complexidade_selected_development,
+            card.complexidade_custom_items,
+            omitir_dev_repetido=True,
+        ) or ['Nenhum']
+        changes.append('\n'.join(['Complexidade do projeto:'] + [f'  - {linha}' for linha in linhas]))
+
+    # Comentário do card (None e string vazia são equivalentes)
+    old_comment = str(anterior.get('card_comment') or '').strip()
+    new_comment = str(card.card_comment or '').strip()
+    card_comment_changed = old_comment != new_comment
+
+    return changes, card_comment_changed
+
+
+def descrever_atualizacao(card, changes):
+    """Mensagem da atualização usada no CardLog e na notificação"""
+    if changes:
+        return f'O card "{card.nome}" foi atualizado:\n' + '\n'.join(f'• {change}' for change in changes)
+    return f'O card "{card.nome}" foi atualizado.'
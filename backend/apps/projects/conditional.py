@@ -0,0 +1,101 @@
+"""
+GET condicional (ETag) para o quadro de cards e as telas de prioridades.
+
+Essas telas são recarregadas o tempo todo, quase sempre sem nada ter mudado. Em vez de
+montar e serializar a resposta para só então comparar, cada escopo (cards de um projeto,
+prioridades de uma semana, usuários do quadro) tem uma versão calculada com consultas
+agregadas: quantidade de linhas e maior updated_at, inclusive dos relacionamentos que
+aparecem na resposta. A contagem pega remoções, que não mexem no updated_at.
+
+Relacionamentos de muitos (TODOs, eventos) são agregados cada um na sua tabela: juntá-los
+na mesma consulta dos cards multiplicaria as linhas (cards x TODOs x eventos).
+
+Se o cliente manda If-None-Match batendo com a versão atual, a view responde 304 antes de
+carregar e serializar os dados. Só o ETag é usado como validador: o maior updated_at não muda
+com remoções nem com o atraso que vira pelo relógio, então um Last-Modified/If-Modified-Since
+devolveria 304 com dados antigos.
+"""
+import hashlib
+
+from django.db.models import Count, Max
+from django.utils import timezone
+from django.utils.cache import get_conditional_response
+
+from .models import CardTodo, Event, WeeklyPriorityConfig
+
+
+def _versao_todos_eventos(card_ids):
+    """Contagem e maior updated_at dos TODOs, e contagem dos eventos, dos cards do subquery card_ids"""
+    versao = CardTodo.objects.filter(card_id__in=card_ids).order_by().aggregate(
+        todos_total=Count('id'),
+        todos_ultimo=Max('updated_at'),
+    )
+    versao['eventos_total'] = Event.objects.filter(card_id__in=card_ids).count()
+    return versao
+
+
+def versao_cards(queryset):
+    """Versão de um conjunto de cards: cards, TODOs, eventos, projeto, sprint e usuários exibidos"""
+    queryset = queryset.order_by()
+    # Só relacionamentos de um (FKs): o join não multiplica os cards
+    versao = queryset.aggregate(
+        total=Count('id', distinct=True),
+        ultimo=Max('updated_at'),
+        projeto_ultimo=Max('projeto__updated_at'),
+        sprint_ultimo=Max('projeto__sprint__updated_at'),
+        responsavel_ultimo=Max('responsavel__updated_at'),
+        criado_por_ultimo=Max('criado_por__updated_at'),
+    )
+    versao.update(_versao_todos_eventos(queryset.values('id')))
+    return versao
+
+
+def versao_prioridades(queryset):
+    """Versão de um conjunto de prioridades semanais, incluindo os cards priorizados"""
+    queryset = queryset.order_by()
+    versao = queryset.aggregate(
+        total=Count('id', distinct=True),
+        ultimo=Max('updated_at'),
+        card_ultimo=Max('card__updated_at'),
+        projeto_ultimo=Max('card__projeto__updated_at'),
+        usuario_ultimo=Max('usuario__updated_at'),
+    )
+    versao.update(_versao_todos_eventos(queryset.values('card_id')))
+    return versao
+
+
+def versao_usuarios(queryset):
+    """Versão da lista de usuários exibida nos quadros de prioridades"""
+    return queryset.order_by().aggregate(total=Count('id'), ultimo=Max('updated_at'))
+
+
+def gerar_etag(*partes):
+    """ETag forte a partir das versões dos escopos e de qualquer outro valor que altere a resposta"""
+    conteudo = repr([sorted(parte.items()) if isinstance(parte, dict) else parte for parte in partes])
+    return '"%s"' % hashlib.md5(conteudo.encode('utf-8'), usedforsecurity=False).hexdigest()
+
+
+def resposta_condicional(request, etag):
+    """Retorna a resposta 304 se o cliente já tem esta versão; None para seguir com a view"""
+    resposta = get_conditional_response(request, etag=etag)
+    if resposta is not None:
+        aplicar_validadores(resposta, etag)
+    return resposta
+
+
+def aplicar_validadores(response, etag):
+    """ETag na resposta; o navegador sempre revalida (no-cache) e não compartilha o cache"""
+    response['ETag'] = etag
+    response['Cache-Control'] = 'private, no-cache'
+    return response
+
+
+def marco_prazo_prioridades(agora=None):
+    """
+    Parte da versão das prioridades que depende só do relógio: o atraso muda quando o
+    dia vira ou quando passa o horário limite, mesmo sem nenhuma linha alterada
+    (mesma regra de services.anotar_situacao_prioridades).
+    """
+    agora = timezone.localtime(agora or timezone.now())
+    horario_limite = WeeklyPriorityConfig.get_config().horario_limite
+    return agora.date().isoformat(), agora.time() > horario_limite
@@ -3,7 +3,8 @@ import logging
 from channels.generic.websocket import AsyncWebsocketConsumer
 from channels.db import database_sync_to_async
 from django.contrib.auth import get_user_model
-from rest_framework.authtoken.models import Token
+from apps.accounts.authentication import usuario_por_token
+from .notification_utils import snapshot_nao_lidas
 
 logger = logging.getLogger(__name__)
 User = get_user_model()
@@ -45,6 +46,8 @@ class NotificationConsumer(AsyncWebsocketConsumer):
                 
                 logger.info(f'WebSocket conectado para usuario {self.user.username} (ID: {self.user_id})')
                 await self.accept()
+                # Estado inicial: o cliente não precisa consultar unread_count via HTTP
+                await self.send_snapshot()
                 return
         
         # Se não autenticado, rejeitar conexão
@@ -69,6 +72,9 @@ class NotificationConsumer(AsyncWebsocketConsumer):
                 await self.send(text_data=json.dumps({
                     'type': 'pong'
                 }))
+            elif message_type == 'sync':
+                # Cliente pediu para ressincronizar (ex.: após voltar de segundo plano)
+                await self.send_snapshot()
         except json.JSONDecodeError:
             pass
     
@@ -79,14 +85,28 @@ class NotificationConsumer(AsyncWebsocketConsumer):
         
         await self.send(text_data=json.dumps({
             'type': 'notification',
-            'data': notification_data
+            'data': notification_data,
+            'delta': event.get('delta', {'total': 0, 'mine': 0})
+        }))
+    
+    async def notification_read(self, event):
+        # Notificações marcadas como lidas (nesta ou em outra aba/dispositivo)
+        await self.send(text_data=json.dumps({
+            'type': 'read',
+            'ids': event.get('ids', []),
+            'all': event.get('all', False),
+            'counts': event.get('counts'),
+        }))
+    
+    async def send_snapshot(self):
+        snapshot = await database_sync_to_async(snapshot_nao_lidas)(self.user_id)
+        await self.send(text_data=json.dumps({
+            'type': 'snapshot',
+            'data': snapshot
         }))
     
     @database_sync_to_async
     def get_user_from_token(self, token_key):
         """Obter usuário a partir do token"""
-        try:
-            token = Token.objects.select_related('user').get(key=token_key)
-            return token.user if token.user.is_active else None
-        except Token.DoesNotExist:
-            return None
+        # Mesmo cache de tokens da API REST
+        return usuario_por_token(token_key)
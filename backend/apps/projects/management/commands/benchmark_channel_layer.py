@@ -0,0 +1,244 @@
+"""
+Comando para medir latência e vazão de entrega do channel layer com vários processos.
+
+Sobe N processos consumidores, cada um com uma parte das "conexões" (um canal inscrito
+em um grupo user_<id>, como o NotificationConsumer), e publica mensagens com group_send
+a partir do processo principal, como um worker Celery faria. Para cada quantidade de
+conexões informada, mostra mensagens entregues, vazão e latência p50/p95/p99.
+
+Exemplos:
+    # Redis local descartável (requer o binário redis-server no PATH), 2 shards
+    python manage.py benchmark_channel_layer --spawn-redis 2 --conexoes 100,500,2000
+
+    # Sem Redis instalado: fakeredis servindo o protocolo por TCP neste processo
+    # (pip install "fakeredis[lua]>=2.27"), 2 shards
+    python manage.py benchmark_channel_layer --fake-redis 2
+
+    # Redis já rodando (ex.: docker compose up -d redis)
+    python manage.py benchmark_channel_layer --hosts redis://127.0.0.1:6379/15
+
+    # Camada em memória: demonstra que nada atravessa processos
+    python manage.py benchmark_channel_layer --backend memory
+
+Com --fake-redis as mensagens atravessam os processos pelo mesmo caminho do Redis real
+(channels_redis, protocolo RESP, scripts Lua), então a rodada confirma a entrega entre
+processos. Vazão e latência, porém, medem o servidor em Python do fakeredis: para números
+de capacidade use --spawn-redis ou --hosts.
+"""
+import asyncio
+import multiprocessing
+import shutil
+import socket
+import statistics
+import subprocess
+import threading
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.module_loading import import_string
+
+from config.channel_layers import build_channel_layers
+
+
+def _carregar_layer(backend_path, config):
+    return import_string(backend_path)(**config)
+
+
+async def _consumir(backend_path, config, grupos, fila, timeout):
+    """Inscreve um canal por grupo e recebe as mensagens esperadas em cada um"""
+    layer = _carregar_layer(backend_path, config)
+    canais = []
+    for grupo, esperadas in grupos:
+        canal = await layer.new_channel()
+        await layer.group_add(grupo, canal)
+        canais.append((canal, esperadas))
+    fila.put(('pronto', None))
+
+    latencias = []
+    ultima_recepcao = 0.0
+
+    async def receber(canal, esperadas):
+        nonlocal ultima_recepcao
+        for _ in range(esperadas):
+            mensagem = await layer.receive(canal)
+            agora = time.time()
+            latencias.append(agora - mensagem['enviado_em'])
+            ultima_recepcao = max(ultima_recepcao, agora)
+
+    try:
+        await asyncio.wait_for(
+            asyncio.gather(*(receber(canal, esperadas) for canal, esperadas in canais)),
+            timeout=timeout
+        )
+    except asyncio.TimeoutError:
+        pass
+    fila.put(('resultado', {'latencias': latencias, 'ultima_recepcao': ultima_recepcao}))
+
+
+def _processo_consumidor(backend_path, config, grupos, fila, timeout):
+    asyncio.run(_consumir(backend_path, config, grupos, fila, timeout))
+
+
+async def _publicar(backend_path, config, grupos, mensagens, lote):
+    layer = _carregar_layer(backend_path, config)
+    for inicio in range(0, mensagens, lote):
+        await asyncio.gather(*(
+            layer.group_send(grupos[i % len(grupos)], {'type': 'bench.message', 'enviado_em': time.time()})
+            for i in range(inicio, min(inicio + lote, mensagens))
+        ))
+
+
+def _porta_livre():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def _percentil(valores, p):
+    if not valores:
+        return None
+    ordenados = sorted(valores)
+    return ordenados[min(len(ordenados) - 1, int(round(p / 100 * (len(ordenados) - 1))))]
+
+
+def _ms(segundos):
+    """Latência em ms, alinhada na coluna ('-' sem medição)"""
+    return f'{segundos * 1000:8.1f}' if segundos is not None else f'{"-":>8}'
+
+
+class Command(BaseCommand):
+    help = 'Mede latência e vazão do channel layer com vários processos consumidores.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--backend', default='redis', choices=['memory', 'redis', 'redis_pubsub'])
+        parser.add_argument('--hosts', default='', help='URLs Redis separadas por vírgula (uma por shard).')
+        parser.add_argument('--spawn-redis', type=int, default=0, metavar='N',
+                            help='Sobe N instâncias locais temporárias de redis-server como shards.')
+        parser.add_argument('--fake-redis', type=int, default=0, metavar='N',
+                            help='Sobe N servidores fakeredis (TCP, neste processo) como shards.')
+        parser.add_argument('--processos', type=int, default=4, help='Processos consumidores.')
+        parser.add_argument('--conexoes', default='50,200,1000',
+                            help='Quantidades de conexões a medir, separadas por vírgula.')
+        parser.add_argument('--mensagens', type=int, default=2000, help='Mensagens publicadas por rodada.')
+        parser.add_argument('--lote', type=int, default=200, help='group_send concorrentes por lote.')
+        parser.add_argument('--expiry', type=int, default=30)
+        parser.add_argument('--capacity', type=int, default=100)
+        parser.add_argument('--timeout', type=float, default=20.0, help='Segundos de espera por rodada.')
+
+    def handle(self, *args, **options):
+        servidores = []
+        try:
+            hosts = [h.strip() for h in options['hosts'].split(',') if h.strip()]
+            if options['spawn_redis']:
+                hosts = self._subir_redis(options['spawn_redis'], servidores)
+            elif options['fake_redis']:
+                hosts = self._subir_fakeredis(options['fake_redis'], servidores)
+            if options['backend'] != 'memory' and not hosts:
+                raise CommandError('Informe --hosts, --spawn-redis N ou --fake-redis N para os backends Redis.')
+
+            layers = build_channel_layers(
+                backend=options['backend'],
+                hosts=hosts,
+                prefix=f'bench{int(time.time())}',
+                expiry=options['expiry'],
+                capacity=options['capacity'],
+            )['default']
+            backend_path, config = layers['BACKEND'], layers.get('CONFIG', {})
+            self.stdout.write(f'Backend: {backend_path} | shards: {len(hosts) or "-"} | processos: {options["processos"]}')
+            self.stdout.write(f'{"conexões":>9} {"entregues":>13} {"msg/s":>9} {"p50 ms":>8} {"p95 ms":>8} {"p99 ms":>8}')
+
+            for conexoes in [int(c) for c in options['conexoes'].split(',') if c.strip()]:
+                self._rodada(backend_path, config, conexoes, options)
+        finally:
+            # Shards locais subidos pelo comando
+            for parar in servidores:
+                parar()
+
+    def _subir_redis(self, quantidade, servidores):
+        binario = shutil.which('redis-server')
+        if not binario:
+            raise CommandError('redis-server não encontrado no PATH; use --hosts com um Redis existente.')
+        import redis
+        hosts = []
+        for _ in range(quantidade):
+            porta = _porta_livre()
+            processo = subprocess.Popen(
+                [binario, '--port', str(porta), '--save', '', '--appendonly', 'no'],
+                stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+            )
+            servidores.append(lambda processo=processo: (processo.terminate(), processo.wait(timeout=5)))
+            cliente = redis.Redis(port=porta)
+            for _ in range(50):
+                try:
+                    cliente.ping()
+                    break
+                except redis.ConnectionError:
+                    time.sleep(0.1)
+            else:
+                raise CommandError(f'redis-server não respondeu na porta {porta}')
+            hosts.append(f'redis://127.0.0.1:{porta}/0')
+        return hosts
+
+    def _subir_fakeredis(self, quantidade, servidores):
+        try:
+            import lupa  # noqa: F401 (channels_redis usa scripts Lua)
+            from fakeredis import TcpFakeServer
+        except ImportError:
+            raise CommandError('fakeredis com suporte a Lua não instalado: pip install "fakeredis[lua]>=2.27".')
+        hosts = []
+        for _ in range(quantidade):
+            porta = _porta_livre()
+            # Cada TcpFakeServer tem o próprio estado: um shard independente por porta
+            servidor = TcpFakeServer(('127.0.0.1', porta), server_type='redis')
+            threading.Thread(target=servidor.serve_forever, daemon=True).start()
+            servidores.append(lambda servidor=servidor: (servidor.shutdown(), servidor.server_close()))
+            hosts.append(f'redis://127.0.0.1:{porta}/0')
+        self.stdout.write(self.style.WARNING(
+            'fakeredis: entrega entre processos pelo protocolo Redis; vazão e latência não representam um Redis real.'
+        ))
+        return hosts
+
+    def _rodada(self, backend_path, config, conexoes, options):
+        processos = options['processos']
+        mensagens = options['mensagens']
+        grupos = [f'bench_user_{i}' for i in range(conexoes)]
+        esperadas = {grupo: 0 for grupo in grupos}
+        for i in range(mensagens):
+            esperadas[grupos[i % conexoes]] += 1
+
+        ctx = multiprocessing.get_context('spawn')
+        fila = ctx.Queue()
+        workers = []
+        for p in range(processos):
+            meus = [(grupo, esperadas[grupo]) for grupo in grupos[p::processos]]
+            worker = ctx.Process(
+                target=_processo_consumidor,
+                args=(backend_path, config, meus, fila, options['timeout'])
+            )
+            worker.start()
+            workers.append(worker)
+
+        # Aguardar todos os consumidores inscritos antes de publicar
+        for _ in workers:
+            fila.get(timeout=60)
+
+        inicio = time.time()
+        asyncio.run(_publicar(backend_path, config, grupos, mensagens, options['lote']))
+
+        latencias = []
+        fim = inicio
+        for _ in workers:
+            _, resultado = fila.get(timeout=options['timeout'] + 30)
+            latencias.extend(resultado['latencias'])
+            fim = max(fim, resultado['ultima_recepcao'])
+        for worker in workers:
+            worker.join()
+
+        entregues = len(latencias)
+        vazao = entregues / (fim - inicio) if entregues and fim > inicio else 0
+        p50, p95, p99 = (_percentil(latencias, p) for p in (50, 95, 99))
+        self.stdout.write(
+            f'{conexoes:>9} {entregues:>6}/{mensagens:<6} {vazao:>9.0f} {_ms(p50)} {_ms(p95)} {_ms(p99)}'
+        )
+        if latencias and statistics.mean(latencias) > 1:
+            self.stdout.write(self.style.WARNING('  latência média acima de 1s: considere mais shards ou capacity maior'))
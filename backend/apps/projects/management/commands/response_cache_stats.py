@@ -0,0 +1,35 @@
+"""
+Mostra a taxa de acerto do cache de respostas das listagens de referência, por grupo.
+Os contadores ficam no backend do cache: com Redis refletem todos os processos; com
+cache em memória local só o processo atual (ou seja, nada útil fora do servidor).
+"""
+from django.core.management.base import BaseCommand
+
+from apps.response_cache import metricas, zerar_metricas, invalidar, GRUPOS
+
+
+class Command(BaseCommand):
+    help = 'Exibe acertos, faltas e taxa de acerto do cache de respostas por grupo.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--zerar', action='store_true', help='Zera os contadores depois de exibir.')
+        parser.add_argument('--invalidar', action='store_true', help='Invalida todas as respostas guardadas.')
+
+    def handle(self, *args, **options):
+        total_acertos = total_faltas = 0
+        self.stdout.write(f"{'grupo':<16}{'acertos':>10}{'faltas':>10}{'taxa':>8}")
+        for grupo, valores in metricas().items():
+            taxa = f"{valores['taxa_acerto']:.1%}" if valores['taxa_acerto'] is not None else '-'
+            self.stdout.write(f"{grupo:<16}{valores['acertos']:>10}{valores['faltas']:>10}{taxa:>8}")
+            total_acertos += valores['acertos']
+            total_faltas += valores['faltas']
+        total = total_acertos + total_faltas
+        taxa = f'{total_acertos / total:.1%}' if total else '-'
+        self.stdout.write(f"{'total':<16}{total_acertos:>10}{total_faltas:>10}{taxa:>8}")
+
+        if options['zerar']:
+            zerar_metricas()
+            self.stdout.write('Contadores zerados.')
+        if options['invalidar']:
+            invalidar(*GRUPOS)
+            self.stdout.write(self.style.SUCCESS('Respostas em cache invalidadas.'))
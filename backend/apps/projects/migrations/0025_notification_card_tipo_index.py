@@ -0,0 +1,19 @@
+# Generated by Django 5.2.10 on 2026-10-17 21:48
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0024_alter_card_tipo'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='notification',
+            index=models.Index(fields=['card_id', 'tipo', '-data_criacao'], name='projects_no_card_id_78cb96_idx'),
+        ),
+    ]
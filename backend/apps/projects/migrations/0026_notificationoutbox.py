@@ -0,0 +1,31 @@
+# Generated by Django 5.2.10 on 2026-10-17 21:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0025_notification_card_tipo_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='NotificationOutbox',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('tipo_evento', models.CharField(choices=[('card_created', 'Card Criado'), ('card_updated', 'Card Atualizado'), ('card_moved', 'Card Movido'), ('card_deleted', 'Card Deletado'), ('card_todo_created', 'TODO Criado'), ('card_todo_updated', 'TODO Atualizado'), ('card_todo_deleted', 'TODO Removido'), ('sprint_created', 'Sprint Criada'), ('project_created', 'Projeto Criado')], max_length=30, verbose_name='Tipo de Evento')),
+                ('payload', models.JSONField(blank=True, default=dict, verbose_name='Dados do Evento')),
+                ('tentativas', models.PositiveSmallIntegerField(default=0, verbose_name='Tentativas')),
+                ('ultimo_erro', models.TextField(blank=True, verbose_name='Último Erro')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Data de Criação')),
+                ('processado_em', models.DateTimeField(blank=True, null=True, verbose_name='Processado em')),
+            ],
+            options={
+                'verbose_name': 'Evento da Outbox de Notificações',
+                'verbose_name_plural': 'Outbox de Notificações',
+                'ordering': ['id'],
+                'indexes': [models.Index(fields=['processado_em', 'id'], name='projects_no_process_601870_idx')],
+            },
+        ),
+    ]
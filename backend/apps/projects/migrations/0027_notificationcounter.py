@@ -0,0 +1,46 @@
+# Generated by Django 5.2.10 on 2026-10-17 21:58
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Q
+
+
+def popular_contadores(apps, schema_editor):
+    """Cria os contadores a partir das notificações não lidas existentes"""
+    Notification = apps.get_model('projects', 'Notification')
+    NotificationCounter = apps.get_model('projects', 'NotificationCounter')
+    contagens = (
+        Notification.objects.filter(lida=False)
+        .values('usuario_id')
+        .annotate(total=Count('id'), minhas=Count('id', filter=~Q(tipo='sprint_created')))
+    )
+    NotificationCounter.objects.bulk_create([
+        NotificationCounter(usuario_id=c['usuario_id'], nao_lidas=c['total'], nao_lidas_minhas=c['minhas'])
+        for c in contagens
+    ], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0004_add_profile_picture'),
+        ('projects', '0026_notificationoutbox'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='NotificationCounter',
+            fields=[
+                ('usuario', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='notification_counter', serialize=False, to=settings.AUTH_USER_MODEL, verbose_name='Usuário')),
+                ('nao_lidas', models.IntegerField(default=0, verbose_name='Não lidas')),
+                ('nao_lidas_minhas', models.IntegerField(default=0, verbose_name='Não lidas (minhas)')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Data de Atualização')),
+            ],
+            options={
+                'verbose_name': 'Contador de Notificações',
+                'verbose_name_plural': 'Contadores de Notificações',
+            },
+        ),
+        migrations.RunPython(popular_contadores, migrations.RunPython.noop),
+    ]
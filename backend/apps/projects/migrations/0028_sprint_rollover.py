@@ -0,0 +1,23 @@
+# Generated by Django 5.2.10 on 2026-10-17 22:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0027_notificationcounter'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='notification',
+            name='tipo',
+            field=models.CharField(choices=[('card_created', 'Card Criado'), ('card_updated', 'Card Atualizado'), ('card_deleted', 'Card Deletado'), ('card_moved', 'Card Movido'), ('card_todo_updated', 'TODO do Card Atualizado'), ('sprint_created', 'Sprint Criada'), ('project_created', 'Projeto Criado'), ('role_changed', 'Cargo Alterado'), ('card_overdue', 'Card Atrasado'), ('card_due_24h', 'Card Vence em 24h'), ('card_due_1h', 'Card Vence em 1h'), ('card_due_10min', 'Card Vence em 10min'), ('log_created', 'Log Criado'), ('sprint_rollover', 'Cards Replicados')], max_length=30, verbose_name='Tipo de Notificação'),
+        ),
+        migrations.AlterField(
+            model_name='notificationoutbox',
+            name='tipo_evento',
+            field=models.CharField(choices=[('card_created', 'Card Criado'), ('card_updated', 'Card Atualizado'), ('card_moved', 'Card Movido'), ('card_deleted', 'Card Deletado'), ('card_todo_created', 'TODO Criado'), ('card_todo_updated', 'TODO Atualizado'), ('card_todo_deleted', 'TODO Removido'), ('sprint_created', 'Sprint Criada'), ('project_created', 'Projeto Criado'), ('sprint_rollover', 'Sprint Replicada')], max_length=30, verbose_name='Tipo de Evento'),
+        ),
+    ]
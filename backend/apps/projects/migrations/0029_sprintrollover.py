@@ -0,0 +1,41 @@
+# Generated by Django 5.2.10 on 2026-10-17 22:06
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0028_sprint_rollover'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SprintRollover',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.CharField(choices=[('em_andamento', 'Em Andamento'), ('concluida', 'Concluída')], default='em_andamento', max_length=20, verbose_name='Status')),
+                ('copiar_todos', models.BooleanField(default=False, verbose_name='Copiar TODOs')),
+                ('projetos_mapeados', models.JSONField(blank=True, default=dict, verbose_name='Projetos Replicados')),
+                ('ultimo_card_id', models.IntegerField(default=0, verbose_name='Último Card Copiado')),
+                ('resumo', models.JSONField(blank=True, default=dict, verbose_name='Resumo por Usuário')),
+                ('projetos_criados', models.IntegerField(default=0, verbose_name='Projetos Criados')),
+                ('cards_copiados', models.IntegerField(default=0, verbose_name='Cards Copiados')),
+                ('todos_copiados', models.IntegerField(default=0, verbose_name='TODOs Copiados')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Data de Criação')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Data de Atualização')),
+                ('concluida_em', models.DateTimeField(blank=True, null=True, verbose_name='Concluída em')),
+                ('criado_por', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='sprint_rollovers', to=settings.AUTH_USER_MODEL, verbose_name='Finalizada por')),
+                ('sprint', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='rollover', to='projects.sprint', verbose_name='Sprint de Origem')),
+                ('sprint_destino', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='rollovers_recebidos', to='projects.sprint', verbose_name='Sprint de Destino')),
+            ],
+            options={
+                'verbose_name': 'Replicação de Sprint',
+                'verbose_name_plural': 'Replicações de Sprint',
+                'ordering': ['-created_at'],
+            },
+        ),
+    ]
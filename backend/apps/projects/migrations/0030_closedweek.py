@@ -0,0 +1,67 @@
+# Generated by Django 5.2.10 on 2026-10-17 22:09
+
+import datetime
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def converter_semanas_fechadas(apps, schema_editor):
+    """Cria uma linha de ClosedWeek para cada semana marcada no dicionário semana_fechada"""
+    WeeklyPriorityConfig = apps.get_model('projects', 'WeeklyPriorityConfig')
+    ClosedWeek = apps.get_model('projects', 'ClosedWeek')
+    semanas = set()
+    for semana_fechada in WeeklyPriorityConfig.objects.values_list('semana_fechada', flat=True):
+        for semana_str, fechada in (semana_fechada or {}).items():
+            if not fechada:
+                continue
+            try:
+                semanas.add(datetime.date.fromisoformat(semana_str[:10]))
+            except ValueError:
+                continue
+    ClosedWeek.objects.bulk_create(
+        [ClosedWeek(semana_inicio=semana) for semana in sorted(semanas)],
+        batch_size=500,
+        ignore_conflicts=True
+    )
+
+
+def restaurar_semanas_fechadas(apps, schema_editor):
+    """Reverso: volta as semanas fechadas para o dicionário da configuração"""
+    WeeklyPriorityConfig = apps.get_model('projects', 'WeeklyPriorityConfig')
+    ClosedWeek = apps.get_model('projects', 'ClosedWeek')
+    semana_fechada = {
+        semana.isoformat(): True for semana in ClosedWeek.objects.values_list('semana_inicio', flat=True)
+    }
+    WeeklyPriorityConfig.objects.update(semana_fechada=semana_fechada)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0029_sprintrollover'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ClosedWeek',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('semana_inicio', models.DateField(unique=True, verbose_name='Início da Semana (Segunda-feira)')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Fechada em')),
+                ('fechada_por', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='semanas_fechadas', to=settings.AUTH_USER_MODEL, verbose_name='Fechada por')),
+            ],
+            options={
+                'verbose_name': 'Semana Fechada',
+                'verbose_name_plural': 'Semanas Fechadas',
+                'ordering': ['-semana_inicio'],
+            },
+        ),
+        migrations.RunPython(converter_semanas_fechadas, restaurar_semanas_fechadas),
+        migrations.RemoveField(
+            model_name='weeklypriorityconfig',
+            name='semana_fechada',
+        ),
+    ]
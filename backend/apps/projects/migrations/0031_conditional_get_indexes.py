@@ -0,0 +1,23 @@
+# Generated by Django 5.2.10 on 2026-10-17 22:18
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0030_closedweek'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='card',
+            index=models.Index(fields=['projeto', 'updated_at'], name='projects_ca_projeto_b84c81_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='weeklypriority',
+            index=models.Index(fields=['semana_inicio', 'updated_at'], name='projects_we_semana__53c72d_idx'),
+        ),
+    ]
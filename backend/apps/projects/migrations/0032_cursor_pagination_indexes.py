@@ -0,0 +1,47 @@
+# Generated by Django 5.2.10 on 2026-10-17 22:24
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0031_conditional_get_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='notification',
+            name='projects_no_usuario_9df5ec_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='notification',
+            name='projects_no_usuario_3faa3b_idx',
+        ),
+        migrations.AddIndex(
+            model_name='cardlog',
+            index=models.Index(fields=['card', '-data', '-id'], name='projects_ca_card_id_63ac33_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='cardlog',
+            index=models.Index(fields=['-data', '-id'], name='projects_ca_data_7e822f_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['card', '-data', '-id'], name='projects_ev_card_id_6e0e03_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['-data', '-id'], name='projects_ev_data_cd3a99_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='notification',
+            index=models.Index(fields=['usuario', 'lida', '-data_criacao', '-id'], name='projects_no_usuario_77d38b_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='notification',
+            index=models.Index(fields=['usuario', '-data_criacao', '-id'], name='projects_no_usuario_28aac2_idx'),
+        ),
+    ]
@@ -0,0 +1,57 @@
+# Generated by Django 5.2.10 on 2026-10-17 22:26
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0032_cursor_pagination_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedCardLog',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False, verbose_name='ID original')),
+                ('tipo_evento', models.CharField(choices=[('criado', 'Card Criado'), ('movimentado', 'Movimentado'), ('pendencia', 'Pendência'), ('atualizado', 'Atualizado'), ('alteracao', 'Alteração no Card'), ('responsavel_alterado', 'Responsável Alterado')], max_length=30, verbose_name='Tipo de Evento')),
+                ('descricao', models.TextField(verbose_name='Descrição')),
+                ('data', models.DateTimeField(verbose_name='Data do Evento')),
+                ('arquivado_em', models.DateTimeField(auto_now_add=True, verbose_name='Arquivado em')),
+                ('card', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='logs_arquivados', to='projects.card', verbose_name='Card')),
+                ('usuario', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='card_logs_arquivados', to=settings.AUTH_USER_MODEL, verbose_name='Usuário')),
+            ],
+            options={
+                'verbose_name': 'Log do Card Arquivado',
+                'verbose_name_plural': 'Logs dos Cards Arquivados',
+                'ordering': ['-data'],
+                'indexes': [models.Index(fields=['card', '-data', '-id'], name='projects_ar_card_id_04efd5_idx')],
+            },
+        ),
+        migrations.CreateModel(
+            name='ArchivedNotification',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False, verbose_name='ID original')),
+                ('tipo', models.CharField(choices=[('card_created', 'Card Criado'), ('card_updated', 'Card Atualizado'), ('card_deleted', 'Card Deletado'), ('card_moved', 'Card Movido'), ('card_todo_updated', 'TODO do Card Atualizado'), ('sprint_created', 'Sprint Criada'), ('project_created', 'Projeto Criado'), ('role_changed', 'Cargo Alterado'), ('card_overdue', 'Card Atrasado'), ('card_due_24h', 'Card Vence em 24h'), ('card_due_1h', 'Card Vence em 1h'), ('card_due_10min', 'Card Vence em 10min'), ('log_created', 'Log Criado'), ('sprint_rollover', 'Cards Replicados')], max_length=30, verbose_name='Tipo de Notificação')),
+                ('titulo', models.CharField(max_length=200, verbose_name='Título')),
+                ('mensagem', models.TextField(verbose_name='Mensagem')),
+                ('lida', models.BooleanField(default=True, verbose_name='Lida')),
+                ('data_criacao', models.DateTimeField(verbose_name='Data de Criação')),
+                ('card_id', models.IntegerField(blank=True, null=True, verbose_name='ID do Card')),
+                ('sprint_id', models.IntegerField(blank=True, null=True, verbose_name='ID da Sprint')),
+                ('project_id', models.IntegerField(blank=True, null=True, verbose_name='ID do Projeto')),
+                ('metadata', models.JSONField(blank=True, default=dict, verbose_name='Metadados')),
+                ('arquivada_em', models.DateTimeField(auto_now_add=True, verbose_name='Arquivada em')),
+                ('usuario', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='notificacoes_arquivadas', to=settings.AUTH_USER_MODEL, verbose_name='Usuário')),
+            ],
+            options={
+                'verbose_name': 'Notificação Arquivada',
+                'verbose_name_plural': 'Notificações Arquivadas',
+                'ordering': ['-data_criacao'],
+                'indexes': [models.Index(fields=['usuario', '-data_criacao', '-id'], name='projects_ar_usuario_7ca2b7_idx')],
+            },
+        ),
+    ]
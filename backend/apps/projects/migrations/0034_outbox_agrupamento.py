@@ -0,0 +1,36 @@
+# Generated by Django 5.2.10 on 2026-10-17 22:29
+
+import django.utils.timezone
+from django.db import migrations, models
+from django.db.models import F
+
+
+def preencher_disponivel_em(apps, schema_editor):
+    """Eventos já existentes ficaram disponíveis quando foram registrados"""
+    NotificationOutbox = apps.get_model('projects', 'NotificationOutbox')
+    NotificationOutbox.objects.update(disponivel_em=F('created_at'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0033_archived_history'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='notificationoutbox',
+            name='chave_agrupamento',
+            field=models.CharField(blank=True, default='', max_length=100, verbose_name='Chave de Agrupamento'),
+        ),
+        migrations.AddField(
+            model_name='notificationoutbox',
+            name='disponivel_em',
+            field=models.DateTimeField(default=django.utils.timezone.now, verbose_name='Disponível em'),
+        ),
+        migrations.RunPython(preencher_disponivel_em, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='notificationoutbox',
+            index=models.Index(fields=['chave_agrupamento', 'processado_em', 'disponivel_em'], name='projects_no_chave_a_c50eb0_idx'),
+        ),
+    ]
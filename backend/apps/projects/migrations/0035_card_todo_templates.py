@@ -0,0 +1,126 @@
+# Generated by Django 5.2.10 on 2026-10-17 22:34
+
+from django.db import migrations, models
+
+
+# TODOs originais que antes ficavam fixos em CardSerializer.create
+MODELOS_POR_AREA = {
+    'backend': [
+        ('modelagem_banco', 'Modelagem Do Banco De Dados (Models)'),
+        ('criacao_interfaces_repositories', 'Criação De Interfaces E Implementação De Repositories'),
+        ('criacao_use_cases', 'Criação De Use Cases'),
+        ('registro_dependencias', 'Registro De Dependências Em Containers (Di)'),
+        ('criacao_serializers', 'Criação De Serializers'),
+        ('criacao_views_urls', 'Criação De Views E Urls'),
+        ('criacao_permissoes', 'Criação E Aplicação De Permissões'),
+        ('testes_unitarios', 'Testes Unitários E De Cobertura'),
+        ('testes_manuais', 'Testes Manuais (Postman / Insomnia)'),
+        ('atualizacao_documentacao', 'Atualização Da Documentação Da Api'),
+        ('criacao_pr_code_review', 'Criação De Pr E Ajustes De Code Review'),
+        ('build_deploy_testes', 'Build E Deploy Em Ambiente De Testes'),
+        ('build_deploy_producao', 'Build E Deploy Em Produção'),
+        ('pull_aplicacao_vm', 'Pull Da Aplicação Na Vm'),
+    ],
+    'frontend': [
+        ('definicao_validacao_contratos', 'Definição E Validação De Contratos - Interfaces'),
+        ('construcao_repository_service', 'Construção Do Repository / Service'),
+        ('construcao_usecases', 'Construção Dos Usecases'),
+        ('garantir_independencia_ui', 'Garantir Independência Da Ui Em Relação Aos Usecases'),
+        ('implementacao_testes_unitarios', 'Implementação De Testes Unitários (Usecases / Services / Repositories)'),
+        ('ajustes_contratos_regras', 'Ajustes De Contratos E Regras De Negócio (Se Necessário)'),
+        ('construcao_componentes_complementares', 'Construção De Componentes Complementares (Shared / Design System)'),
+        ('construcao_tela', 'Construção Da Tela'),
+        ('tratamento_estados', 'Tratamento De Estados (Loading, Erro, Empty)'),
+        ('ajustes_responsividade', 'Ajustes De Responsividade'),
+        ('integracao_backend', 'Integração Com O Backend'),
+        ('mapeamento_dto_adapter', 'Mapeamento Dto, Via Adapter'),
+        ('testar_funcionalidades', 'Testar Funcionalidades (Fluxos Principais E Edge Cases)'),
+        ('validacao_visual_ux', 'Validação Visual E De Ux'),
+        ('code_review', 'Code Review'),
+        ('aplicar_correcoes_code_review', 'Aplicar Correções Do Code Review'),
+        ('build_deploy_producao', 'Build E Deploy Em Produção'),
+        ('pull_aplicacao_vm', 'Pull Da Aplicação Na Vm'),
+    ],
+    'rpa': [
+        ('ler_script_conferir', 'Ler Script E Conferir Informações Do Vídeo'),
+        ('solicitar_usuario_vm', 'Solicitar Usuário Para Acessar A Vm'),
+        ('testes_iniciais_local', 'Testes Iniciais Na Máquina Local'),
+        ('configurar_projeto_vm', 'Configurar Projeto Na Vm'),
+        ('desenvolvimento_basico', 'Desenvolvimento (Básico)'),
+        ('desenvolvimento_medio', 'Desenvolvimento (Médio)'),
+        ('desenvolvimento_dificil', 'Desenvolvimento (Dificl)'),
+        ('testes_homologacao_mapeamento', 'Testes/Homologação E Mapeamento De Erros'),
+        ('documentacao', 'Documentação'),
+        ('correcoes_code_review', 'Correções Code Review'),
+    ],
+    'sistema': [
+        ('ler_script_conferir', 'Ler Script E Conferir Informações Do Vídeo'),
+        ('solicitar_usuario_vm', 'Solicitar Usuário Para Acessar A Vm'),
+        ('testes_iniciais_local', 'Testes Iniciais Na Máquina Local'),
+        ('configurar_projeto_vm', 'Configurar Projeto Na Vm'),
+        ('desenvolvimento_basico', 'Desenvolvimento (Básico)'),
+        ('desenvolvimento_medio', 'Desenvolvimento (Médio)'),
+        ('desenvolvimento_dificil', 'Desenvolvimento (Dificl)'),
+        ('testes_homologacao_mapeamento', 'Testes/Homologação E Mapeamento De Erros'),
+        ('documentacao', 'Documentação'),
+        ('correcoes_code_review', 'Correções Code Review'),
+    ],
+    'script': [
+        ('ler_script_conferir', 'Ler Script E Conferir Informações Do Vídeo'),
+        ('solicitar_usuario_vm', 'Solicitar Usuário Para Acessar A Vm'),
+        ('testes_iniciais_local', 'Testes Iniciais Na Máquina Local'),
+        ('configurar_projeto_vm', 'Configurar Projeto Na Vm'),
+        ('desenvolvimento_basico', 'Desenvolvimento (Básico)'),
+        ('desenvolvimento_medio', 'Desenvolvimento (Médio)'),
+        ('desenvolvimento_dificil', 'Desenvolvimento (Dificl)'),
+        ('testes_homologacao_mapeamento', 'Testes/Homologação E Mapeamento De Erros'),
+        ('documentacao', 'Documentação'),
+        ('correcoes_code_review', 'Correções Code Review'),
+    ],
+}
+
+# Desenvolvimento só entra no card se o nível foi escolhido na complexidade
+CODIGOS_DESENVOLVIMENTO = {'desenvolvimento_basico', 'desenvolvimento_medio', 'desenvolvimento_dificil'}
+
+
+def criar_modelos(apps, schema_editor):
+    CardTodoTemplate = apps.get_model('projects', 'CardTodoTemplate')
+    CardTodoTemplate.objects.bulk_create([
+        CardTodoTemplate(
+            area=area, codigo=codigo, label=label, ordem=ordem,
+            depende_complexidade=codigo in CODIGOS_DESENVOLVIMENTO,
+        )
+        for area, itens in MODELOS_POR_AREA.items()
+        for ordem, (codigo, label) in enumerate(itens)
+    ], ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0034_outbox_agrupamento'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CardTodoTemplate',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('area', models.CharField(choices=[('rpa', 'RPA'), ('frontend', 'Frontend'), ('backend', 'Backend'), ('script', 'Script'), ('sistema', 'Sistema')], max_length=20, verbose_name='Área')),
+                ('codigo', models.CharField(help_text='Identificador usado nas opções de complexidade (ex.: desenvolvimento_basico)', max_length=100, verbose_name='Código')),
+                ('label', models.CharField(max_length=500, verbose_name='Texto do TODO')),
+                ('ordem', models.IntegerField(default=0, verbose_name='Ordem')),
+                ('depende_complexidade', models.BooleanField(default=False, help_text='Só é criado se o código foi selecionado na complexidade do card', verbose_name='Depende da Complexidade')),
+                ('ativo', models.BooleanField(default=True, verbose_name='Ativo')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Data de Criação')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Data de Atualização')),
+            ],
+            options={
+                'verbose_name': 'Modelo de TODO',
+                'verbose_name_plural': 'Modelos de TODO',
+                'ordering': ['area', 'ordem', 'id'],
+                'unique_together': {('area', 'codigo')},
+            },
+        ),
+        migrations.RunPython(criar_modelos, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.10 on 2026-10-17 22:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0035_card_todo_templates'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='notificationoutbox',
+            name='tipo_evento',
+            field=models.CharField(choices=[('card_created', 'Card Criado'), ('card_updated', 'Card Atualizado'), ('card_moved', 'Card Movido'), ('card_deleted', 'Card Deletado'), ('card_todo_created', 'TODO Criado'), ('card_todo_updated', 'TODO Atualizado'), ('card_todo_deleted', 'TODO Removido'), ('sprint_created', 'Sprint Criada'), ('project_created', 'Projeto Criado'), ('sprint_rollover', 'Sprint Replicada'), ('cards_bulk_updated', 'Cards Alterados em Lote')], max_length=30, verbose_name='Tipo de Evento'),
+        ),
+    ]
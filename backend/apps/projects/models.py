@@ -1,6 +1,14 @@
+import copy
+import datetime
+import time
+import uuid
+
 from django.db import models
 from django.conf import settings
+from django.core.cache import cache
 from django.core.validators import MinValueValidator
+from django.utils import timezone
+from apps.tracking import FieldTrackerMixin
 
 
 class Sprint(models.Model):
@@ -140,7 +148,14 @@ class CardType(models.TextChoices):
     MANUTENCAO = 'manutencao', 'Manutenção'
 
 
-class Card(models.Model):
+class Card(FieldTrackerMixin, models.Model):
+    # Campos comparados pelos signals para montar logs e notificações de alteração
+    tracked_fields = (
+        'nome', 'descricao', 'status', 'prioridade', 'area', 'tipo', 'responsavel_id', 'projeto_id',
+        'data_inicio', 'data_fim', 'complexidade_selected_items',
+        'complexidade_selected_development', 'complexidade_custom_items', 'card_comment',
+    )
+
     nome = models.CharField(max_length=200, verbose_name='Nome do Card')
     descricao = models.TextField(verbose_name='Descrição/Instruções', blank=True)
     script_url = models.URLField(
@@ -232,6 +247,10 @@ class Card(models.Model):
         verbose_name = 'Card'
         verbose_name_plural = 'Cards'
         ordering = ['projeto', 'prioridade', 'created_at']
+        indexes = [
+            # Versão do quadro por projeto (GET condicional): contagem e maior updated_at pelo índice
+            models.Index(fields=['projeto', 'updated_at']),
+        ]
 
     def __str__(self):
         return f"{self.nome} - {self.projeto.nome}"
@@ -244,7 +263,9 @@ class CardTodoStatus(models.TextChoices):
     WARNING = 'warning', 'Aviso'
 
 
-class CardTodo(models.Model):
+class CardTodo(FieldTrackerMixin, models.Model):
+    tracked_fields = ('status', 'comment')
+
     card = models.ForeignKey(
         Card,
         on_delete=models.CASCADE,
@@ -286,6 +307,79 @@ class CardTodo(models.Model):
         return f"{self.card.nome} - {self.label}"
 
 
+# Modelos de TODO por área, memoizados no processo com o mesmo esquema da configuração
+# semanal: versão no cache do Django, conferida a cada MODELOS_TODO_VERIFICACAO_SEGUNDOS
+MODELOS_TODO_VERSAO_KEY = 'card_todo_templates:versao'
+MODELOS_TODO_VERIFICACAO_SEGUNDOS = 5
+MODELOS_TODO_IDADE_MAXIMA_SEGUNDOS = 60
+_modelos_todo_memo = {'por_area': None, 'versao': None, 'verificado_em': 0.0, 'carregado_em': 0.0}
+
+
+class CardTodoTemplate(models.Model):
+    """TODO original criado automaticamente nos cards novos da área (editável pelo admin)"""
+    area = models.CharField(max_length=20, choices=CardArea.choices, verbose_name='Área')
+    codigo = models.CharField(
+        max_length=100,
+        verbose_name='Código',
+        help_text='Identificador usado nas opções de complexidade (ex.: desenvolvimento_basico)'
+    )
+    label = models.CharField(max_length=500, verbose_name='Texto do TODO')
+    ordem = models.IntegerField(default=0, verbose_name='Ordem')
+    depende_complexidade = models.BooleanField(
+        default=False,
+        verbose_name='Depende da Complexidade',
+        help_text='Só é criado se o código foi selecionado na complexidade do card'
+    )
+    ativo = models.BooleanField(default=True, verbose_name='Ativo')
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name='Data de Criação')
+    updated_at = models.DateTimeField(auto_now=True, verbose_name='Data de Atualização')
+
+    class Meta:
+        verbose_name = 'Modelo de TODO'
+        verbose_name_plural = 'Modelos de TODO'
+        ordering = ['area', 'ordem', 'id']
+        unique_together = [['area', 'codigo']]
+
+    def __str__(self):
+        return f"{self.get_area_display()} - {self.label}"
+
+    @classmethod
+    def modelos_por_area(cls):
+        """
+        {área: ((codigo, label, depende_complexidade), ...)} dos modelos ativos, em ordem.
+        Memoizado no processo; o banco só é lido quando a versão no cache muda.
+        """
+        memo = _modelos_todo_memo
+        agora = time.monotonic()
+        if memo['por_area'] is not None and agora - memo['verificado_em'] < MODELOS_TODO_VERIFICACAO_SEGUNDOS:
+            return memo['por_area']
+
+        versao = cache.get(MODELOS_TODO_VERSAO_KEY)
+        if versao is None:
+            cache.add(MODELOS_TODO_VERSAO_KEY, uuid.uuid4().hex, None)
+            versao = cache.get(MODELOS_TODO_VERSAO_KEY)
+        if (memo['por_area'] is None or memo['versao'] != versao
+                or agora - memo['carregado_em'] >= MODELOS_TODO_IDADE_MAXIMA_SEGUNDOS):
+            por_area = {}
+            for area, codigo, label, depende in cls.objects.filter(ativo=True).order_by('ordem', 'id').values_list(
+                'area', 'codigo', 'label', 'depende_complexidade'
+            ):
+                por_area.setdefault(area, []).append((codigo, label, depende))
+            memo.update(
+                por_area={area: tuple(itens) for area, itens in por_area.items()},
+                versao=versao, carregado_em=agora,
+            )
+        memo['verificado_em'] = agora
+        return memo['por_area']
+
+    @classmethod
+    def invalidar_cache(cls, local_apenas=False):
+        """Descarta os modelos memoizados neste processo e, por padrão, nos demais (nova versão)"""
+        _modelos_todo_memo.update(por_area=None, versao=None, verificado_em=0.0, carregado_em=0.0)
+        if not local_apenas:
+            cache.set(MODELOS_TODO_VERSAO_KEY, uuid.uuid4().hex, None)
+
+
 class EventType(models.TextChoices):
     PENDENCIA = 'pendencia', 'Pendência'
     PRIORIDADE = 'prioridade', 'Prioridade'
@@ -319,6 +413,11 @@ class Event(models.Model):
         verbose_name = 'Evento'
         verbose_name_plural = 'Eventos'
         ordering = ['-data']
+        indexes = [
+            # Paginação por cursor (data, id) com e sem filtro por card
+            models.Index(fields=['card', '-data', '-id']),
+            models.Index(fields=['-data', '-id']),
+        ]
 
     def __str__(self):
         return f"{self.get_tipo_display()} - {self.card.nome} ({self.data})"
@@ -360,6 +459,11 @@ class CardLog(models.Model):
         verbose_name = 'Log do Card'
         verbose_name_plural = 'Logs dos Cards'
         ordering = ['-data']
+        indexes = [
+            # Paginação por cursor (data, id) com e sem filtro por card
+            models.Index(fields=['card', '-data', '-id']),
+            models.Index(fields=['-data', '-id']),
+        ]
 
     def __str__(self):
         return f"{self.card.nome} - {self.get_tipo_evento_display()} ({self.data})"
@@ -379,6 +483,71 @@ class NotificationType(models.TextChoices):
     CARD_DUE_1H = 'card_due_1h', 'Card Vence em 1h'
     CARD_DUE_10MIN = 'card_due_10min', 'Card Vence em 10min'
     LOG_CREATED = 'log_created', 'Log Criado'
+    SPRINT_ROLLOVER = 'sprint_rollover', 'Cards Replicados'
+
+
+class OutboxEventType(models.TextChoices):
+    CARD_CREATED = 'card_created', 'Card Criado'
+    CARD_UPDATED = 'card_updated', 'Card Atualizado'
+    CARD_MOVED = 'card_moved', 'Card Movido'
+    CARD_DELETED = 'card_deleted', 'Card Deletado'
+    CARD_TODO_CREATED = 'card_todo_created', 'TODO Criado'
+    CARD_TODO_UPDATED = 'card_todo_updated', 'TODO Atualizado'
+    CARD_TODO_DELETED = 'card_todo_deleted', 'TODO Removido'
+    SPRINT_CREATED = 'sprint_created', 'Sprint Criada'
+    PROJECT_CREATED = 'project_created', 'Projeto Criado'
+    SPRINT_ROLLOVER = 'sprint_rollover', 'Sprint Replicada'
+    CARDS_BULK_UPDATED = 'cards_bulk_updated', 'Cards Alterados em Lote'
+
+
+class NotificationOutbox(models.Model):
+    """
+    Outbox transacional de notificações: os signals registram aqui um evento compacto
+    na mesma transação da escrita do modelo, e um worker Celery entrega as notificações
+    depois do commit, em lote.
+    """
+    tipo_evento = models.CharField(
+        max_length=30,
+        choices=OutboxEventType.choices,
+        verbose_name='Tipo de Evento'
+    )
+    payload = models.JSONField(default=dict, blank=True, verbose_name='Dados do Evento')
+    tentativas = models.PositiveSmallIntegerField(default=0, verbose_name='Tentativas')
+    ultimo_erro = models.TextField(blank=True, verbose_name='Último Erro')
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name='Data de Criação')
+    # Eventos com janela de agrupamento (ex.: TODOs de um card) só são entregues a partir daqui
+    disponivel_em = models.DateTimeField(default=timezone.now, verbose_name='Disponível em')
+    chave_agrupamento = models.CharField(max_length=100, blank=True, default='', verbose_name='Chave de Agrupamento')
+    processado_em = models.DateTimeField(null=True, blank=True, verbose_name='Processado em')
+
+    class Meta:
+        verbose_name = 'Evento da Outbox de Notificações'
+        verbose_name_plural = 'Outbox de Notificações'
+        ordering = ['id']
+        indexes = [
+            models.Index(fields=['processado_em', 'id']),
+            models.Index(fields=['chave_agrupamento', 'processado_em', 'disponivel_em']),
+        ]
+
+    def __str__(self):
+        situacao = 'processado' if self.processado_em else 'pendente'
+        return f"{self.get_tipo_evento_display()} #{self.id} ({situacao})"
+
+    @property
+    def atraso_entrega(self):
+        """Tempo entre o evento ficar disponível e a entrega (ou até agora, se pendente)"""
+        fim = self.processado_em or timezone.now()
+        return max(fim - self.disponivel_em, datetime.timedelta(0))
+
+
+# Cache da configuração semanal (singleton) no processo. A versão fica no cache do Django
+# (compartilhado entre processos quando o backend é Redis/Memcached): ao salvar a configuração,
+# a versão muda e cada processo recarrega na próxima verificação.
+CONFIG_SEMANAL_VERSAO_KEY = 'weekly_priority_config:versao'
+CONFIG_SEMANAL_VERIFICACAO_SEGUNDOS = 5
+# Com o cache em memória local (padrão) a versão não é compartilhada: recarregar mesmo assim após este tempo
+CONFIG_SEMANAL_IDADE_MAXIMA_SEGUNDOS = 60
+_config_semanal_memo = {'config': None, 'versao': None, 'verificado_em': 0.0, 'carregado_em': 0.0}
 
 
 class WeeklyPriorityConfig(models.Model):
@@ -392,12 +561,6 @@ class WeeklyPriorityConfig(models.Model):
         verbose_name='Fechamento Automático',
         help_text='Se habilitado, a semana será fechada automaticamente ao chegar no horário limite'
     )
-    semana_fechada = models.JSONField(
-        default=dict,
-        blank=True,
-        verbose_name='Semanas Fechadas',
-        help_text='Dicionário com as semanas fechadas no formato {semana_inicio: True}'
-    )
     created_at = models.DateTimeField(auto_now_add=True, verbose_name='Data de Criação')
     updated_at = models.DateTimeField(auto_now=True, verbose_name='Data de Atualização')
 
@@ -410,33 +573,98 @@ class WeeklyPriorityConfig(models.Model):
 
     @classmethod
     def get_config(cls):
-        """Retorna a configuração, criando uma se não existir"""
-        config, _ = cls.objects.get_or_create(pk=1)
-        return config
+        """
+        Retorna a configuração, criando uma se não existir.
+
+        Memoizada no processo: a versão no cache compartilhado é conferida no máximo a cada
+        CONFIG_SEMANAL_VERIFICACAO_SEGUNDOS, e o banco só é lido quando ela muda. Retorna
+        uma cópia, então alterações do chamador não vazam para a memoização.
+        """
+        memo = _config_semanal_memo
+        agora = time.monotonic()
+        if memo['config'] is not None and agora - memo['verificado_em'] < CONFIG_SEMANAL_VERIFICACAO_SEGUNDOS:
+            return copy.deepcopy(memo['config'])
+
+        # Ler a versão antes do banco: se ela mudar no meio, a próxima verificação recarrega
+        versao = cache.get(CONFIG_SEMANAL_VERSAO_KEY)
+        if versao is None:
+            cache.add(CONFIG_SEMANAL_VERSAO_KEY, uuid.uuid4().hex, None)
+            versao = cache.get(CONFIG_SEMANAL_VERSAO_KEY)
+        if (memo['config'] is None or memo['versao'] != versao
+                or agora - memo['carregado_em'] >= CONFIG_SEMANAL_IDADE_MAXIMA_SEGUNDOS):
+            config, criada = cls.objects.get_or_create(pk=1)
+            if criada:
+                # O default de horario_limite é uma string; recarregar para memoizar um time
+                config.refresh_from_db()
+            memo.update(config=config, versao=versao, carregado_em=agora)
+        memo['verificado_em'] = agora
+        return copy.deepcopy(memo['config'])
+
+    @classmethod
+    def invalidar_cache(cls, local_apenas=False):
+        """
+        Descarta a configuração memoizada neste processo e, por padrão, nos demais (nova versão).
+        local_apenas=True zera só a memoização do processo (ex.: entre testes, cujo rollback
+        não passa pelos signals).
+        """
+        _config_semanal_memo.update(config=None, versao=None, verificado_em=0.0, carregado_em=0.0)
+        if not local_apenas:
+            cache.set(CONFIG_SEMANAL_VERSAO_KEY, uuid.uuid4().hex, None)
     
+    # As semanas fechadas ficam em ClosedWeek (uma linha por semana); os métodos abaixo
+    # continuam aqui para os chamadores existentes
     def is_semana_fechada(self, semana_inicio):
         """Verifica se uma semana específica está fechada"""
-        if not self.semana_fechada:
-            return False
-        semana_str = semana_inicio.isoformat() if hasattr(semana_inicio, 'isoformat') else str(semana_inicio)
-        return self.semana_fechada.get(semana_str, False)
-    
-    def fechar_semana(self, semana_inicio):
-        """Marca uma semana como fechada"""
-        if not self.semana_fechada:
-            self.semana_fechada = {}
-        semana_str = semana_inicio.isoformat() if hasattr(semana_inicio, 'isoformat') else str(semana_inicio)
-        self.semana_fechada[semana_str] = True
-        self.save()
-    
+        return ClosedWeek.objects.filter(semana_inicio=_normalizar_semana(semana_inicio)).exists()
+
+    def fechar_semana(self, semana_inicio, usuario=None):
+        """Marca uma semana como fechada. Retorna False se ela já estava fechada"""
+        _, criada = ClosedWeek.objects.get_or_create(
+            semana_inicio=_normalizar_semana(semana_inicio),
+            defaults={'fechada_por': usuario}
+        )
+        return criada
+
     def abrir_semana(self, semana_inicio):
-        """Marca uma semana como aberta (remove do dicionário)"""
-        if not self.semana_fechada:
-            return
-        semana_str = semana_inicio.isoformat() if hasattr(semana_inicio, 'isoformat') else str(semana_inicio)
-        if semana_str in self.semana_fechada:
-            del self.semana_fechada[semana_str]
-            self.save()
+        """Marca uma semana como aberta (remove o registro de fechamento)"""
+        ClosedWeek.objects.filter(semana_inicio=_normalizar_semana(semana_inicio)).delete()
+
+
+def _normalizar_semana(semana_inicio):
+    if isinstance(semana_inicio, str):
+        return datetime.date.fromisoformat(semana_inicio)
+    if isinstance(semana_inicio, datetime.datetime):
+        return semana_inicio.date()
+    return semana_inicio
+
+
+class ClosedWeek(models.Model):
+    """
+    Semana de prioridades fechada. A chave única em semana_inicio torna o fechamento
+    um INSERT atômico (fechamentos concorrentes não se sobrescrevem) e a consulta
+    "esta semana está fechada?" uma busca pelo índice.
+    """
+    semana_inicio = models.DateField(
+        unique=True,
+        verbose_name='Início da Semana (Segunda-feira)'
+    )
+    fechada_por = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='semanas_fechadas',
+        verbose_name='Fechada por'
+    )
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name='Fechada em')
+
+    class Meta:
+        verbose_name = 'Semana Fechada'
+        verbose_name_plural = 'Semanas Fechadas'
+        ordering = ['-semana_inicio']
+
+    def __str__(self):
+        return f"Semana de {self.semana_inicio}"
 
 
 class WeeklyPriority(models.Model):
@@ -479,12 +707,20 @@ class WeeklyPriority(models.Model):
         verbose_name_plural = 'Prioridades Semanais'
         unique_together = [['usuario', 'card', 'semana_inicio']]  # Um usuário pode ter múltiplas prioridades por semana, mas não o mesmo card duplicado
         ordering = ['-semana_inicio', 'usuario']
+        indexes = [
+            # Versão das prioridades da semana (GET condicional)
+            models.Index(fields=['semana_inicio', 'updated_at']),
+        ]
 
     def __str__(self):
         return f"{self.usuario.username} - {self.card.nome} ({self.semana_inicio} a {self.semana_fim})"
 
     def is_concluido(self):
         """Verifica se o card foi concluído"""
+        # Valor calculado no SQL por services.anotar_situacao_prioridades, se disponível
+        anotado = getattr(self, 'concluido_anotado', None)
+        if anotado is not None:
+            return anotado
         return self.card.status == 'finalizado'
 
     def is_atrasado(self):
@@ -492,6 +728,10 @@ class WeeklyPriority(models.Model):
         from django.utils import timezone
         from datetime import datetime, time
         
+        anotado = getattr(self, 'atrasado_anotado', None)
+        if anotado is not None:
+            return anotado
+
         config = WeeklyPriorityConfig.get_config()
         horario_limite = config.horario_limite
         
@@ -534,9 +774,180 @@ class Notification(models.Model):
         verbose_name_plural = 'Notificações'
         ordering = ['-data_criacao']
         indexes = [
-            models.Index(fields=['usuario', 'lida', '-data_criacao']),
-            models.Index(fields=['usuario', '-data_criacao']),
+            # Paginação por cursor (data_criacao, id) das notificações do usuário
+            models.Index(fields=['usuario', 'lida', '-data_criacao', '-id']),
+            models.Index(fields=['usuario', '-data_criacao', '-id']),
+            # Usado pelo anti-join do verificador de prazos (card_id + tipo + janela recente)
+            models.Index(fields=['card_id', 'tipo', '-data_criacao']),
+        ]
+
+    def __str__(self):
+        return f"{self.titulo} - {self.usuario.username} ({'Lida' if self.lida else 'Não lida'})"
+
+
+class NotificationCounter(models.Model):
+    """
+    Contadores de notificações não lidas por usuário, mantidos de forma incremental
+    (ver notification_utils). Evitam COUNT(*) em Notification a cada consulta do sino;
+    a tarefa reconciliar_contadores_notificacoes corrige eventuais divergências.
+    """
+    usuario = models.OneToOneField(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='notification_counter',
+        verbose_name='Usuário'
+    )
+    nao_lidas = models.IntegerField(default=0, verbose_name='Não lidas')
+    # Não lidas excluindo as notificações gerais (filtro "minhas")
+    nao_lidas_minhas = models.IntegerField(default=0, verbose_name='Não lidas (minhas)')
+    updated_at = models.DateTimeField(auto_now=True, verbose_name='Data de Atualização')
+
+    class Meta:
+        verbose_name = 'Contador de Notificações'
+        verbose_name_plural = 'Contadores de Notificações'
+
+    def __str__(self):
+        return f"{self.usuario_id}: {self.nao_lidas} não lidas"
+
+
+class SprintRolloverStatus(models.TextChoices):
+    EM_ANDAMENTO = 'em_andamento', 'Em Andamento'
+    CONCLUIDA = 'concluida', 'Concluída'
+
+
+class SprintRollover(models.Model):
+    """
+    Checkpoint da replicação de uma sprint finalizada (ver rollover.py).
+
+    Uma linha por sprint de origem (chave de idempotência): a sprint de destino e o
+    mapeamento dos projetos são gravados uma única vez, e cada lote de cards copiado
+    avança ultimo_card_id na mesma transação. Uma task repetida ou interrompida
+    continua do ponto em que parou, sem duplicar projetos nem cards.
+    """
+    sprint = models.OneToOneField(
+        Sprint,
+        on_delete=models.CASCADE,
+        related_name='rollover',
+        verbose_name='Sprint de Origem'
+    )
+    sprint_destino = models.ForeignKey(
+        Sprint,
+        on_delete=models.CASCADE,
+        related_name='rollovers_recebidos',
+        verbose_name='Sprint de Destino'
+    )
+    criado_por = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='sprint_rollovers',
+        verbose_name='Finalizada por'
+    )
+    status = models.CharField(
+        max_length=20,
+        choices=SprintRolloverStatus.choices,
+        default=SprintRolloverStatus.EM_ANDAMENTO,
+        verbose_name='Status'
+    )
+    copiar_todos = models.BooleanField(default=False, verbose_name='Copiar TODOs')
+    # {id do projeto de origem: id do projeto criado na sprint de destino}
+    projetos_mapeados = models.JSONField(default=dict, blank=True, verbose_name='Projetos Replicados')
+    ultimo_card_id = models.IntegerField(default=0, verbose_name='Último Card Copiado')
+    # {id do usuário: {'cards': n, 'projetos': n}} para a notificação de resumo
+    resumo = models.JSONField(default=dict, blank=True, verbose_name='Resumo por Usuário')
+    projetos_criados = models.IntegerField(default=0, verbose_name='Projetos Criados')
+    cards_copiados = models.IntegerField(default=0, verbose_name='Cards Copiados')
+    todos_copiados = models.IntegerField(default=0, verbose_name='TODOs Copiados')
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name='Data de Criação')
+    updated_at = models.DateTimeField(auto_now=True, verbose_name='Data de Atualização')
+    concluida_em = models.DateTimeField(null=True, blank=True, verbose_name='Concluída em')
+
+    class Meta:
+        verbose_name = 'Replicação de Sprint'
+        verbose_name_plural = 'Replicações de Sprint'
+        ordering = ['-created_at']
+
+    def __str__(self):
+        return f"{self.sprint_id} → {self.sprint_destino_id} ({self.get_status_display()})"
+
+
+class ArchivedNotification(models.Model):
+    """
+    Notificação lida movida para o arquivo pela tarefa de retenção (ver retention.py).
+    Mantém o id original; servida sob demanda em /api/notifications/archived/.
+    """
+    id = models.BigIntegerField(primary_key=True, verbose_name='ID original')
+    usuario = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='notificacoes_arquivadas',
+        verbose_name='Usuário'
+    )
+    tipo = models.CharField(
+        max_length=30,
+        choices=NotificationType.choices,
+        verbose_name='Tipo de Notificação'
+    )
+    titulo = models.CharField(max_length=200, verbose_name='Título')
+    mensagem = models.TextField(verbose_name='Mensagem')
+    lida = models.BooleanField(default=True, verbose_name='Lida')
+    data_criacao = models.DateTimeField(verbose_name='Data de Criação')
+    card_id = models.IntegerField(null=True, blank=True, verbose_name='ID do Card')
+    sprint_id = models.IntegerField(null=True, blank=True, verbose_name='ID da Sprint')
+    project_id = models.IntegerField(null=True, blank=True, verbose_name='ID do Projeto')
+    metadata = models.JSONField(default=dict, blank=True, verbose_name='Metadados')
+    arquivada_em = models.DateTimeField(auto_now_add=True, verbose_name='Arquivada em')
+
+    class Meta:
+        verbose_name = 'Notificação Arquivada'
+        verbose_name_plural = 'Notificações Arquivadas'
+        ordering = ['-data_criacao']
+        indexes = [
+            models.Index(fields=['usuario', '-data_criacao', '-id']),
+        ]
+
+    def __str__(self):
+        return f"{self.titulo} - {self.usuario_id} (arquivada)"
+
+
+class ArchivedCardLog(models.Model):
+    """
+    Log de card de sprint finalizada movido para o arquivo pela tarefa de retenção.
+    Mantém o id original; servido sob demanda em /api/card-logs/archived/?card=.
+    """
+    id = models.BigIntegerField(primary_key=True, verbose_name='ID original')
+    card = models.ForeignKey(
+        Card,
+        on_delete=models.CASCADE,
+        related_name='logs_arquivados',
+        verbose_name='Card'
+    )
+    tipo_evento = models.CharField(
+        max_length=30,
+        choices=CardLogEventType.choices,
+        verbose_name='Tipo de Evento'
+    )
+    descricao = models.TextField(verbose_name='Descrição')
+    usuario = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        related_name='card_logs_arquivados',
+        null=True,
+        blank=True,
+        verbose_name='Usuário'
+    )
+    data = models.DateTimeField(verbose_name='Data do Evento')
+    arquivado_em = models.DateTimeField(auto_now_add=True, verbose_name='Arquivado em')
+
+    class Meta:
+        verbose_name = 'Log do Card Arquivado'
+        verbose_name_plural = 'Logs dos Cards Arquivados'
+        ordering = ['-data']
+        indexes = [
+            models.Index(fields=['card', '-data', '-id']),
         ]
 
     def __str__(self):
-        return f"{self.titulo} - {self.usuario.username} ({'Lida' if self.lida else 'Não lida'})"
\ No newline at end of file
+        return f"{self.card_id} - {self.get_tipo_evento_display()} ({self.data}, arquivado)"
@@ -1,13 +1,54 @@
+import asyncio
+from collections import defaultdict
 from channels.layers import get_channel_layer
 from asgiref.sync import async_to_sync
 from django.contrib.auth import get_user_model
-from .models import Notification, NotificationType
+from django.db import transaction
+from django.db.models import Count, F, Q, Value
+from django.db.models.functions import Greatest
+from .models import Notification, NotificationType, NotificationCounter
 import logging
 
 logger = logging.getLogger(__name__)
 
 User = get_user_model()
 
+# Notificações gerais não entram no filtro "minhas" nem no contador nao_lidas_minhas
+TIPOS_NOTIFICACAO_GERAIS = (NotificationType.SPRINT_CREATED,)
+
+
+def serialize_notification(notification):
+    """Representação da notificação enviada pelo WebSocket (mesmos campos da API)"""
+    return {
+        'id': str(notification.id),
+        'tipo': notification.tipo,
+        'tipo_display': notification.get_tipo_display(),
+        'titulo': notification.titulo,
+        'mensagem': notification.mensagem,
+        'lida': notification.lida,
+        'data_criacao': notification.data_criacao.isoformat(),
+        'card_id': str(notification.card_id) if notification.card_id else None,
+        'sprint_id': str(notification.sprint_id) if notification.sprint_id else None,
+        'project_id': str(notification.project_id) if notification.project_id else None,
+        'metadata': notification.metadata,
+    }
+
+
+def build_notification_message(notification):
+    """
+    Monta a mensagem do channel layer para uma notificação já persistida.
+    'delta' é a variação que ela causa nos contadores de não lidas do destinatário.
+    """
+    nao_lida = not notification.lida
+    return {
+        'type': 'notification_message',
+        'notification': serialize_notification(notification),
+        'delta': {
+            'total': 1 if nao_lida else 0,
+            'mine': 1 if nao_lida and notification.tipo not in TIPOS_NOTIFICACAO_GERAIS else 0,
+        },
+    }
+
 
 def send_notification(
     user_id,
@@ -47,6 +88,7 @@ def send_notification(
         project_id=project_id,
         metadata=metadata or {}
     )
+    incrementar_contadores_nao_lidas([notification])
     
     # Enviar via WebSocket
     try:
@@ -54,22 +96,7 @@ def send_notification(
         if channel_layer:
             async_to_sync(channel_layer.group_send)(
                 f'user_{user_id}',
-                {
-                    'type': 'notification_message',
-                    'notification': {
-                        'id': str(notification.id),
-                        'tipo': notification.tipo,
-                        'tipo_display': notification.get_tipo_display(),
-                        'titulo': notification.titulo,
-                        'mensagem': notification.mensagem,
-                        'lida': notification.lida,
-                        'data_criacao': notification.data_criacao.isoformat(),
-                        'card_id': str(notification.card_id) if notification.card_id else None,
-                        'sprint_id': str(notification.sprint_id) if notification.sprint_id else None,
-                        'project_id': str(notification.project_id) if notification.project_id else None,
-                        'metadata': notification.metadata,
-                    }
-                }
+                build_notification_message(notification)
             )
             logger.info(f'Notificacao enviada via WebSocket para usuario {user_id}: {titulo}')
         else:
@@ -93,23 +120,267 @@ def send_notification_to_multiple_users(
 ):
     """
     Envia notificação para múltiplos usuários.
+
+    Os destinatários são validados em uma única consulta, as notificações são
+    inseridas com bulk_create e os frames WebSocket são enviados em um único
+    lote, de modo que o custo não cresce em round trips por destinatário.
     
     Args:
-        user_ids: Lista de IDs de usuários
+        user_ids: Lista de IDs de usuários (IDs repetidos recebem uma única notificação)
         ... (outros parâmetros iguais a send_notification)
     """
-    notifications = []
-    for user_id in user_ids:
-        notification = send_notification(
-            user_id=user_id,
+    # Remover duplicados preservando a ordem
+    user_ids = list(dict.fromkeys(int(user_id) for user_id in user_ids if user_id is not None))
+    if not user_ids:
+        return []
+
+    existentes = set(User.objects.filter(id__in=user_ids).values_list('id', flat=True))
+    notifications = [
+        Notification(
+            usuario_id=user_id,
             tipo=tipo,
             titulo=titulo,
             mensagem=mensagem,
             card_id=card_id,
             sprint_id=sprint_id,
             project_id=project_id,
-            metadata=metadata
+            metadata=metadata or {}
+        )
+        for user_id in user_ids
+        if user_id in existentes
+    ]
+    return deliver_notifications(notifications)
+
+
+def deliver_notifications(notifications, batch_size=500):
+    """
+    Persiste notificações em lote e envia todas via WebSocket em um único lote assíncrono.
+
+    O INSERT e o incremento dos contadores ficam na mesma transação (um rollback desfaz os
+    dois), e o envio só acontece após o commit: se o chamador estiver dentro de um atomic()
+    que for desfeito, nenhum cliente recebe notificações que não existem.
+
+    Args:
+        notifications: Lista de instâncias de Notification ainda não salvas
+        batch_size: Tamanho máximo de cada INSERT do bulk_create
+    """
+    if not notifications:
+        return []
+
+    with transaction.atomic():
+        created = Notification.objects.bulk_create(notifications, batch_size=batch_size)
+        incrementar_contadores_nao_lidas(created)
+        transaction.on_commit(lambda: broadcast_notifications(created))
+    return created
+
+
+def broadcast_notifications(notifications):
+    """
+    Envia várias notificações já persistidas pelo channel layer.
+    Todos os group_send são disparados juntos em um único ciclo do event loop,
+    em vez de um async_to_sync bloqueante por notificação.
+    """
+    if not notifications:
+        return
+
+    try:
+        channel_layer = get_channel_layer()
+        if not channel_layer:
+            logger.warning('Channel layer nao disponivel. %s notificacoes criadas mas nao enviadas via WebSocket.', len(notifications))
+            return
+
+        messages = [
+            (f'user_{notification.usuario_id}', build_notification_message(notification))
+            for notification in notifications
+        ]
+
+        async def _send_all():
+            return await asyncio.gather(
+                *(channel_layer.group_send(group, message) for group, message in messages),
+                return_exceptions=True
+            )
+
+        results = async_to_sync(_send_all)()
+        errors = [result for result in results if isinstance(result, Exception)]
+        if errors:
+            logger.error(f'Erro ao enviar {len(errors)} de {len(messages)} notificacoes via WebSocket: {errors[0]}')
+        else:
+            logger.info(f'{len(messages)} notificacoes enviadas via WebSocket em lote')
+    except Exception as e:
+        logger.error(f'Erro ao enviar notificacoes em lote via WebSocket: {e}')
+        # Continuar mesmo se houver erro no WebSocket - as notificações já foram salvas no banco
+
+
+# ---------------------------------------------------------------------------
+# Contadores de não lidas (NotificationCounter)
+# ---------------------------------------------------------------------------
+
+def incrementar_contadores_nao_lidas(notifications):
+    """
+    Soma as notificações não lidas recém-criadas nos contadores dos destinatários.
+    Deve rodar na mesma transação do INSERT, para que um rollback desfaça os dois.
+    Usuários com o mesmo incremento são atualizados em um único UPDATE.
+    """
+    deltas = defaultdict(lambda: [0, 0])
+    for notification in notifications:
+        if notification.lida:
+            continue
+        delta = deltas[notification.usuario_id]
+        delta[0] += 1
+        if notification.tipo not in TIPOS_NOTIFICACAO_GERAIS:
+            delta[1] += 1
+    if not deltas:
+        return
+
+    # Garantir que os contadores existam (usuários novos começam em zero)
+    NotificationCounter.objects.bulk_create(
+        [NotificationCounter(usuario_id=usuario_id) for usuario_id in deltas],
+        ignore_conflicts=True
+    )
+    grupos = defaultdict(list)
+    for usuario_id, (total, minhas) in deltas.items():
+        grupos[(total, minhas)].append(usuario_id)
+    for (total, minhas), usuario_ids in grupos.items():
+        NotificationCounter.objects.filter(usuario_id__in=usuario_ids).update(
+            nao_lidas=F('nao_lidas') + total,
+            nao_lidas_minhas=F('nao_lidas_minhas') + minhas
+        )
+
+
+def marcar_notificacao_como_lida(notification):
+    """
+    Marca a notificação como lida e decrementa o contador do usuário.
+    Retorna False se ela já estava lida (nada é alterado, o contador não muda).
+    """
+    atualizadas = Notification.objects.filter(pk=notification.pk, lida=False).update(lida=True)
+    notification.lida = True
+    if not atualizadas:
+        return False
+    minhas = 0 if notification.tipo in TIPOS_NOTIFICACAO_GERAIS else 1
+    NotificationCounter.objects.filter(usuario_id=notification.usuario_id).update(
+        nao_lidas=Greatest(F('nao_lidas') - 1, Value(0)),
+        nao_lidas_minhas=Greatest(F('nao_lidas_minhas') - minhas, Value(0))
+    )
+    return True
+
+
+def marcar_todas_como_lidas(usuario_id):
+    """
+    Marca todas as notificações do usuário como lidas e zera o contador, na mesma transação.
+    O contador fica travado antes do UPDATE: uma notificação entregue em paralelo ou já foi
+    incrementada e é marcada junto, ou espera o commit e incrementa o contador zerado.
+    """
+    with transaction.atomic():
+        list(NotificationCounter.objects.select_for_update().filter(usuario_id=usuario_id).values_list('pk'))
+        count = Notification.objects.filter(usuario_id=usuario_id, lida=False).update(lida=True)
+        NotificationCounter.objects.filter(usuario_id=usuario_id).update(nao_lidas=0, nao_lidas_minhas=0)
+    return count
+
+
+def _contar_nao_lidas(filtro):
+    """Contagem real a partir da tabela de notificações, agrupada por usuário"""
+    return (
+        Notification.objects.filter(filtro, lida=False)
+        .values('usuario_id')
+        .annotate(total=Count('id'), minhas=Count('id', filter=~Q(tipo__in=TIPOS_NOTIFICACAO_GERAIS)))
+        .order_by()
+    )
+
+
+def obter_contadores_nao_lidas(usuario_id):
+    """
+    Retorna {'total': ..., 'mine': ...} a partir do contador do usuário.
+    Sem contador ainda (primeiro acesso), calcula uma vez a partir da tabela e o cria.
+    """
+    contador = NotificationCounter.objects.filter(usuario_id=usuario_id).values_list(
+        'nao_lidas', 'nao_lidas_minhas'
+    ).first()
+    if contador is None:
+        real = _contar_nao_lidas(Q(usuario_id=usuario_id)).order_by('usuario_id').first() or {'total': 0, 'minhas': 0}
+        NotificationCounter.objects.get_or_create(
+            usuario_id=usuario_id,
+            defaults={'nao_lidas': real['total'], 'nao_lidas_minhas': real['minhas']}
         )
-        if notification:
-            notifications.append(notification)
-    return notifications
+        contador = (real['total'], real['minhas'])
+    return {'total': contador[0], 'mine': contador[1]}
+
+
+def reconciliar_contadores_nao_lidas(batch_size=500):
+    """
+    Recalcula os contadores a partir da tabela e corrige os divergentes
+    (notificações removidas, falhas entre o INSERT e o UPDATE, edições manuais).
+    Retorna o número de contadores corrigidos.
+
+    A primeira passada, sem locks, só aponta os divergentes. Cada lote deles é corrigido em
+    uma transação com os contadores travados e a contagem refeita depois do lock, para não
+    sobrescrever um incremento de uma entrega feita entre a leitura e a escrita.
+    """
+    reais = {c['usuario_id']: (c['total'], c['minhas']) for c in _contar_nao_lidas(Q())}
+    atuais = {
+        usuario_id: (total, minhas)
+        for usuario_id, total, minhas in NotificationCounter.objects.values_list(
+            'usuario_id', 'nao_lidas', 'nao_lidas_minhas'
+        )
+    }
+    divergentes = sorted(
+        usuario_id for usuario_id, contador in atuais.items() if contador != reais.get(usuario_id, (0, 0))
+    )
+
+    corrigidos = 0
+    for inicio in range(0, len(divergentes), batch_size):
+        lote = divergentes[inicio:inicio + batch_size]
+        with transaction.atomic():
+            contadores = list(
+                NotificationCounter.objects.select_for_update().filter(usuario_id__in=lote).order_by('usuario_id')
+            )
+            reais_lote = {
+                c['usuario_id']: (c['total'], c['minhas']) for c in _contar_nao_lidas(Q(usuario_id__in=lote))
+            }
+            corrigir = []
+            for contador in contadores:
+                total, minhas = reais_lote.get(contador.usuario_id, (0, 0))
+                if (contador.nao_lidas, contador.nao_lidas_minhas) != (total, minhas):
+                    contador.nao_lidas, contador.nao_lidas_minhas = total, minhas
+                    corrigir.append(contador)
+            NotificationCounter.objects.bulk_update(corrigir, ['nao_lidas', 'nao_lidas_minhas'])
+        corrigidos += len(corrigir)
+
+    # Contadores que ainda não existem: quem criar primeiro (aqui ou na entrega) prevalece
+    faltantes = [
+        NotificationCounter(usuario_id=usuario_id, nao_lidas=total, nao_lidas_minhas=minhas)
+        for usuario_id, (total, minhas) in reais.items()
+        if usuario_id not in atuais
+    ]
+    NotificationCounter.objects.bulk_create(faltantes, batch_size=batch_size, ignore_conflicts=True)
+    return corrigidos + len(faltantes)
+
+
+def snapshot_nao_lidas(usuario_id, limite=50):
+    """Estado inicial enviado ao conectar o WebSocket: contadores e as não lidas mais recentes"""
+    recentes = Notification.objects.filter(usuario_id=usuario_id, lida=False).order_by('-data_criacao')[:limite]
+    return {
+        'counts': obter_contadores_nao_lidas(usuario_id),
+        'notifications': [serialize_notification(n) for n in recentes],
+    }
+
+
+def notificar_leitura(usuario_id, ids=None, todas=False):
+    """
+    Avisa as conexões WebSocket do usuário (outras abas/dispositivos) que notificações
+    foram marcadas como lidas. Envia após o commit, com os contadores já atualizados.
+    """
+    def _enviar():
+        try:
+            channel_layer = get_channel_layer()
+            if not channel_layer:
+                return
+            async_to_sync(channel_layer.group_send)(f'user_{usuario_id}', {
+                'type': 'notification_read',
+                'ids': [str(i) for i in ids or []],
+                'all': todas,
+                'counts': obter_contadores_nao_lidas(usuario_id),
+            })
+        except Exception as e:
+            logger.error(f'Erro ao enviar leitura de notificacoes via WebSocket: {e}')
+
+    transaction.on_commit(_enviar)
@@ -0,0 +1,607 @@
+"""
+Outbox transacional de notificações.
+
+Os signals chamam registrar_evento() dentro da mesma transação que salvou o modelo,
+gravando apenas um evento compacto. Depois do commit, processar_outbox() (executado
+por um worker Celery) lê os eventos pendentes em lote, monta as mensagens, resolve os
+destinatários e entrega as notificações com bulk_create + envio WebSocket em lote.
+
+Eventos de TODO (criado/alterado/removido) são agrupados por card: o primeiro abre uma
+janela de NOTIFICACAO_TODOS_JANELA_SEGUNDOS, os seguintes entram na mesma janela, e no fim
+dela o worker entrega um único resumo por destinatário em vez de um aviso por TODO.
+"""
+import logging
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import Card, Project, Notification, NotificationType, NotificationOutbox, OutboxEventType
+from .notification_utils import broadcast_notifications, incrementar_contadores_nao_lidas
+from .recipients import usuarios_por_cargos, usuarios_ativos
+from .serializers import format_user_name
+
+logger = logging.getLogger(__name__)
+
+User = get_user_model()
+
+# Eventos que falham este número de vezes ficam parados na outbox (visíveis no admin)
+MAX_TENTATIVAS = 5
+TAMANHO_LOTE = 200
+
+# Conexão com o broker ao enfileirar: sem retentativas e com timeout curto. Depois de uma
+# falha, os eventos seguintes são entregues na própria requisição por este tempo, sem pagar
+# a tentativa de novo a cada escrita
+BROKER_TIMEOUT_SEGUNDOS = 2
+BROKER_ESPERA_APOS_FALHA_SEGUNDOS = 30
+_broker = {'falhou_em': None}
+
+PAPEIS_GESTAO = ['supervisor', 'gerente', 'admin']
+PAPEIS_SUPERVISAO = ['supervisor', 'admin']
+
+
+def registrar_evento(tipo_evento, chave_agrupamento='', janela_segundos=0, **payload):
+    """
+    Registra um evento na outbox e agenda a entrega para depois do commit.
+    O payload deve conter apenas valores serializáveis em JSON (ids, textos).
+
+    Com chave_agrupamento e janela_segundos o evento só fica disponível quando fechar a
+    janela aberta pelo primeiro evento pendente da mesma chave (ou uma nova, se não houver),
+    para ser entregue junto com os demais. Com NOTIFICATION_OUTBOX_SINCRONO, ou com o broker
+    fora do ar, não há espera.
+    """
+    sem_janela = (
+        not chave_agrupamento or not janela_segundos
+        or getattr(settings, 'NOTIFICATION_OUTBOX_SINCRONO', False)
+        # Broker fora do ar: não haveria worker para entregar a janela depois
+        or _broker_indisponivel()
+    )
+    if sem_janela:
+        evento = NotificationOutbox.objects.create(
+            tipo_evento=tipo_evento, payload=payload, chave_agrupamento=chave_agrupamento
+        )
+        transaction.on_commit(_disparar_processamento)
+        return evento
+
+    agora = timezone.now()
+    disponivel_em = NotificationOutbox.objects.filter(
+        chave_agrupamento=chave_agrupamento, processado_em__isnull=True, disponivel_em__gt=agora
+    ).order_by('disponivel_em').values_list('disponivel_em', flat=True).first()
+    nova_janela = disponivel_em is None
+    if nova_janela:
+        disponivel_em = agora + timedelta(seconds=janela_segundos)
+    evento = NotificationOutbox.objects.create(
+        tipo_evento=tipo_evento, payload=payload, chave_agrupamento=chave_agrupamento, disponivel_em=disponivel_em
+    )
+    if nova_janela:
+        transaction.on_commit(lambda: _agendar_processamento(chave_agrupamento, janela_segundos))
+    return evento
+
+
+def _broker_indisponivel():
+    """True se o broker falhou há menos de BROKER_ESPERA_APOS_FALHA_SEGUNDOS (não tentar de novo ainda)"""
+    falhou_em = _broker['falhou_em']
+    return falhou_em is not None and time.monotonic() - falhou_em < BROKER_ESPERA_APOS_FALHA_SEGUNDOS
+
+
+def _enfileirar_processamento(countdown=None):
+    """
+    Enfileira o worker sem retentativas, numa conexão própria com timeout curto: sem broker
+    o delay() padrão ficava ~19s tentando reconectar dentro da requisição. O resultado da
+    task não é usado (ignore_result), então o backend de resultados não é contatado.
+    Retorna False se o broker não respondeu.
+    """
+    if _broker_indisponivel():
+        return False
+    try:
+        from .tasks import processar_outbox_notificacoes
+        with processar_outbox_notificacoes.app.connection_for_write(
+            transport_options={'max_retries': 0}, connect_timeout=BROKER_TIMEOUT_SEGUNDOS
+        ) as conexao:
+            processar_outbox_notificacoes.apply_async(
+                countdown=countdown, retry=False, ignore_result=True, connection=conexao
+            )
+    except Exception as e:
+        _broker['falhou_em'] = time.monotonic()
+        logger.warning(f'Broker do Celery indisponivel ({e}). Entregando notificacoes na propria requisicao.')
+        return False
+    _broker['falhou_em'] = None
+    return True
+
+
+def _disparar_processamento():
+    """Enfileira o worker; sem broker disponível, entrega na própria requisição"""
+    try:
+        if getattr(settings, 'NOTIFICATION_OUTBOX_SINCRONO', False) or not _enfileirar_processamento():
+            processar_outbox()
+    except Exception as e:
+        # A entrega nunca deve quebrar a requisição que gerou o evento; o Beat tenta de novo
+        logger.error(f'Erro ao processar a outbox de notificacoes: {e}', exc_info=True)
+
+
+def _agendar_processamento(chave_agrupamento, segundos):
+    """
+    Agenda o worker para quando a janela de agrupamento fechar (o Beat também varre a outbox).
+    Sem broker ninguém entregaria a janela depois: ela é fechada agora e entregue na requisição.
+    """
+    if _enfileirar_processamento(countdown=segundos + 1):
+        return
+    try:
+        NotificationOutbox.objects.filter(
+            chave_agrupamento=chave_agrupamento, processado_em__isnull=True
+        ).update(disponivel_em=timezone.now())
+        processar_outbox()
+    except Exception as e:
+        logger.error(f'Erro ao processar a outbox de notificacoes: {e}', exc_info=True)
+
+
+class _LoteEntrega:
+    """Contexto de um lote: carrega cards/projetos de uma vez e acumula as notificações"""
+
+    def __init__(self, eventos):
+        card_ids = {e.payload.get('card_id') for e in eventos if e.payload.get('card_id')}
+        project_ids = {e.payload.get('project_id') for e in eventos if e.payload.get('project_id')}
+        self.cards = Card.objects.select_related('projeto', 'criado_por').in_bulk(card_ids) if card_ids else {}
+        self.projects = Project.objects.select_related('sprint').in_bulk(project_ids) if project_ids else {}
+        self.notificacoes = []
+
+    def usuarios_por_papeis(self, papeis):
+        """IDs dos usuários ativos com os papéis informados (diretório em memória, sem consulta)"""
+        return usuarios_por_cargos(papeis)
+
+    def usuarios_ativos(self):
+        return usuarios_ativos()
+
+    def notificar(self, user_ids, **campos):
+        for user_id in dict.fromkeys(user_id for user_id in user_ids if user_id):
+            self.notificacoes.append(Notification(usuario_id=user_id, **campos))
+
+    def persistir(self):
+        """Insere as notificações do lote descartando destinatários que não existem mais"""
+        if not self.notificacoes:
+            return []
+        existentes = set(
+            User.objects.filter(id__in={n.usuario_id for n in self.notificacoes}).values_list('id', flat=True)
+        )
+        validas = [n for n in self.notificacoes if n.usuario_id in existentes]
+        criadas = Notification.objects.bulk_create(validas, batch_size=500)
+        incrementar_contadores_nao_lidas(criadas)
+        return criadas
+
+
+def _destinatarios_card(card, lote, papeis=None):
+    user_ids = list(lote.usuarios_por_papeis(papeis)) if papeis else []
+    user_ids.append(card.responsavel_id)
+    user_ids.append(card.projeto.gerente_atribuido_id)
+    return user_ids
+
+
+def _card_created(payload, lote):
+    card = lote.cards.get(payload['card_id'])
+    if not card:
+        return
+    metadata = {'card_nome': card.nome, 'project_nome': card.projeto.nome}
+
+    # Card criado - notificar responsável
+    lote.notificar(
+        [card.responsavel_id],
+        tipo=NotificationType.CARD_CREATED,
+        titulo='Novo Card Atribuído',
+        mensagem=f'Um novo card "{card.nome}" foi criado e atribuído a você.',
+        card_id=card.id,
+        project_id=card.projeto_id,
+        metadata=metadata
+    )
+
+    # Notificar gerente do projeto
+    lote.notificar(
+        [card.projeto.gerente_atribuido_id],
+        tipo=NotificationType.CARD_CREATED,
+        titulo='Novo Card Criado',
+        mensagem=f'Um novo card "{card.nome}" foi criado no projeto "{card.projeto.nome}".',
+        card_id=card.id,
+        project_id=card.projeto_id,
+        metadata=metadata
+    )
+
+    # Se for uma demanda (card no projeto "Sugestões"), notificar todos os supervisores
+    if card.projeto.nome == 'Sugestões':
+        criador_nome = format_user_name(card.criado_por) if card.criado_por else 'Usuário desconhecido'
+        lote.notificar(
+            lote.usuarios_por_papeis(PAPEIS_SUPERVISAO),
+            tipo=NotificationType.CARD_CREATED,
+            titulo='Nova Demanda Criada',
+            mensagem=f'Uma nova demanda "{card.nome}" foi criada por {criador_nome} e aguarda avaliação.',
+            card_id=card.id,
+            project_id=card.projeto_id,
+            metadata={'card_nome': card.nome, 'criador': criador_nome}
+        )
+
+
+def _card_moved(payload, lote):
+    card = lote.cards.get(payload['card_id'])
+    if not card:
+        return
+    lote.notificar(
+        _destinatarios_card(card, lote),
+        tipo=NotificationType.CARD_MOVED,
+        titulo='Card Movido',
+        mensagem=f'O card "{card.nome}" foi movido de "{payload["old_label"]}" para "{payload["new_label"]}".',
+        card_id=card.id,
+        project_id=card.projeto_id,
+        metadata={
+            'card_nome': card.nome,
+            'project_nome': card.projeto.nome,
+            'old_status': payload['old_status'],
+            'new_status': payload['new_status']
+        }
+    )
+
+
+def _card_updated(payload, lote):
+    card = lote.cards.get(payload['card_id'])
+    if not card:
+        return
+    changes = payload.get('changes', [])
+
+    if payload.get('comment_changed'):
+        # Notificar supervisores e gerentes sobre mudança no comentário do card
+        lote.notificar(
+            _destinatarios_card(card, lote, PAPEIS_GESTAO),
+            tipo=NotificationType.CARD_UPDATED,
+            titulo='Comentário do Card Atualizado',
+            mensagem=f'O comentário do card "{card.nome}" foi atualizado.',
+            card_id=card.id,
+            project_id=card.projeto_id,
+            metadata={
+                'card_nome': card.nome,
+                'comment_changed': True
+            }
+        )
+
+    # Notificar responsável e gerente do projeto
+    lote.notificar(
+        _destinatarios_card(card, lote),
+        tipo=NotificationType.CARD_UPDATED,
+        titulo='Card Atualizado',
+        mensagem=payload['mensagem'],
+        card_id=card.id,
+        project_id=card.projeto_id,
+        metadata={
+            'card_nome': card.nome,
+            'project_nome': card.projeto.nome,
+            'changes': changes
+        }
+    )
+
+    # Se for uma demanda (card no projeto "Sugestões"), notificar todos os supervisores
+    if card.projeto.nome == 'Sugestões':
+        criador_nome = format_user_name(card.criado_por) if card.criado_por else 'Usuário desconhecido'
+        lote.notificar(
+            lote.usuarios_por_papeis(PAPEIS_SUPERVISAO),
+            tipo=NotificationType.CARD_UPDATED,
+            titulo='Demanda Atualizada',
+            mensagem=f'A demanda "{card.nome}" criada por {criador_nome} foi atualizada.',
+            card_id=card.id,
+            project_id=card.projeto_id,
+            metadata={'card_nome': card.nome, 'criador': criador_nome, 'changes': changes}
+        )
+
+
+def _card_deleted(payload, lote):
+    lote.notificar(
+        payload.get('user_ids', []),
+        tipo=NotificationType.CARD_DELETED,
+        titulo='Card Deletado',
+        mensagem=f'O card "{payload["card_nome"]}" foi deletado.',
+        project_id=payload.get('project_id'),
+        metadata={'card_nome': payload['card_nome'], 'project_nome': payload.get('project_nome')}
+    )
+
+
+def _card_todo_created(payload, lote):
+    card = lote.cards.get(payload['card_id'])
+    if not card:
+        return
+    lote.notificar(
+        _destinatarios_card(card, lote, PAPEIS_GESTAO),
+        tipo=NotificationType.CARD_TODO_UPDATED,
+        titulo='Novo TODO Adicionado',
+        mensagem=f'Um novo TODO "{payload["todo_label"]}" foi adicionado ao card "{card.nome}".',
+        card_id=card.id,
+        project_id=card.projeto_id,
+        metadata={
+            'card_nome': card.nome,
+            'todo_label': payload['todo_label'],
+            'todo_id': payload['todo_id'],
+            'is_new': True
+        }
+    )
+
+
+def _card_todo_updated(payload, lote):
+    card = lote.cards.get(payload['card_id'])
+    if not card:
+        return
+    status_changed = payload.get('status_changed')
+    comment_changed = payload.get('comment_changed')
+    todo_label = payload['todo_label']
+
+    if status_changed and comment_changed:
+        mensagem = f'O TODO "{todo_label}" do card "{card.nome}" foi alterado de "{payload["old_label"]}" para "{payload["new_label"]}" e o comentário foi atualizado.'
+    elif status_changed:
+        mensagem = f'O TODO "{todo_label}" do card "{card.nome}" foi alterado de "{payload["old_label"]}" para "{payload["new_label"]}".'
+    else:  # comment_changed
+        mensagem = f'O comentário do TODO "{todo_label}" do card "{card.nome}" foi atualizado.'
+
+    lote.notificar(
+        _destinatarios_card(card, lote, PAPEIS_GESTAO),
+        tipo=NotificationType.CARD_TODO_UPDATED,
+        titulo='TODO Atualizado',
+        mensagem=mensagem,
+        card_id=card.id,
+        project_id=card.projeto_id,
+        metadata={
+            'card_nome': card.nome,
+            'todo_label': todo_label,
+            'old_status': payload.get('old_status') if status_changed else None,
+            'new_status': payload.get('new_status') if status_changed else None,
+            'comment_changed': comment_changed,
+            'todo_id': payload['todo_id']
+        }
+    )
+
+
+def _card_todo_deleted(payload, lote):
+    card = lote.cards.get(payload['card_id'])
+    if not card:
+        return
+    lote.notificar(
+        _destinatarios_card(card, lote, PAPEIS_GESTAO),
+        tipo=NotificationType.CARD_TODO_UPDATED,
+        titulo='TODO Removido',
+        mensagem=f'O TODO "{payload["todo_label"]}" foi removido do card "{card.nome}".',
+        card_id=card.id,
+        project_id=card.projeto_id,
+        metadata={
+            'card_nome': card.nome,
+            'todo_label': payload['todo_label'],
+            'todo_id': payload['todo_id'],
+            'is_deleted': True
+        }
+    )
+
+
+ROTULOS_RESUMO_TODOS = {
+    OutboxEventType.CARD_TODO_CREATED: 'adicionado(s)',
+    OutboxEventType.CARD_TODO_UPDATED: 'alterado(s)',
+    OutboxEventType.CARD_TODO_DELETED: 'removido(s)',
+}
+# Limite de alterações listadas no metadata do resumo
+MAX_ALTERACOES_RESUMO = 50
+
+
+def _card_todos_resumo(eventos, lote):
+    """Vários eventos de TODO do mesmo card na janela: um único aviso por destinatário"""
+    card = lote.cards.get(eventos[0].payload['card_id'])
+    if not card:
+        return
+    contagem = dict.fromkeys(ROTULOS_RESUMO_TODOS, 0)
+    alteracoes = []
+    for evento in eventos:
+        payload = evento.payload
+        contagem[evento.tipo_evento] += 1
+        status_changed = payload.get('status_changed')
+        alteracoes.append({
+            'tipo': evento.tipo_evento,
+            'todo_id': payload['todo_id'],
+            'todo_label': payload['todo_label'],
+            'old_status': payload.get('old_status') if status_changed else None,
+            'new_status': payload.get('new_status') if status_changed else None,
+            'comment_changed': bool(payload.get('comment_changed')),
+        })
+    partes = [f'{total} {ROTULOS_RESUMO_TODOS[tipo]}' for tipo, total in contagem.items() if total]
+
+    lote.notificar(
+        _destinatarios_card(card, lote, PAPEIS_GESTAO),
+        tipo=NotificationType.CARD_TODO_UPDATED,
+        titulo='TODOs Atualizados',
+        mensagem=f'Os TODOs do card "{card.nome}" tiveram {len(eventos)} alterações: {", ".join(partes)}.',
+        card_id=card.id,
+        project_id=card.projeto_id,
+        metadata={
+            'card_nome': card.nome,
+            'resumo': {str(tipo): total for tipo, total in contagem.items()},
+            'alteracoes': alteracoes[:MAX_ALTERACOES_RESUMO],
+        }
+    )
+
+
+def _sprint_created(payload, lote):
+    lote.notificar(
+        lote.usuarios_ativos(),
+        tipo=NotificationType.SPRINT_CREATED,
+        titulo='Nova Sprint Criada',
+        mensagem=f'A sprint "{payload["sprint_nome"]}" foi criada.',
+        sprint_id=payload['sprint_id'],
+        metadata={'sprint_nome': payload['sprint_nome']}
+    )
+
+
+def _project_created(payload, lote):
+    project = lote.projects.get(payload['project_id'])
+    if not project or not project.gerente_atribuido_id:
+        return
+    # Notificar gerente atribuído
+    lote.notificar(
+        [project.gerente_atribuido_id],
+        tipo=NotificationType.PROJECT_CREATED,
+        titulo='Novo Projeto Atribuído',
+        mensagem=f'Um novo projeto "{project.nome}" foi criado e atribuído a você.',
+        project_id=project.id,
+        sprint_id=project.sprint_id,
+        metadata={'project_nome': project.nome, 'sprint_nome': project.sprint.nome}
+    )
+
+
+def _sprint_rollover(payload, lote):
+    # Um aviso por pessoa com o total de cards e projetos replicados (em vez de um por card)
+    for user_id, contagem in payload.get('destinatarios', {}).items():
+        partes = []
+        if contagem.get('cards'):
+            partes.append(f'{contagem["cards"]} card(s) sob sua responsabilidade')
+        if contagem.get('projetos'):
+            partes.append(f'{contagem["projetos"]} projeto(s) que você gerencia')
+        if not partes:
+            continue
+        lote.notificar(
+            [int(user_id)],
+            tipo=NotificationType.SPRINT_ROLLOVER,
+            titulo='Pendências Replicadas',
+            mensagem=(
+                f'A sprint "{payload["sprint_origem_nome"]}" foi finalizada: '
+                f'{" e ".join(partes)} foram replicados para a sprint "{payload["sprint_nome"]}".'
+            ),
+            sprint_id=payload['sprint_id'],
+            metadata={
+                'sprint_nome': payload['sprint_nome'],
+                'sprint_origem_id': payload['sprint_origem_id'],
+                'sprint_origem_nome': payload['sprint_origem_nome'],
+                'cards': contagem.get('cards', 0),
+                'projetos': contagem.get('projetos', 0),
+            }
+        )
+
+
+# Rótulos do resumo de alteração em lote, por campo alterado
+ROTULOS_RESUMO_LOTE = {
+    'status': 'movido(s) de etapa',
+    'responsavel_id': 'com responsável alterado',
+    'prioridade': 'com prioridade alterada',
+    'projeto_id': 'transferido(s) de projeto',
+}
+
+
+def _cards_bulk_updated(payload, lote):
+    # Um aviso por pessoa envolvida com o total de cards e de cada tipo de alteração
+    usuario_nome = payload['usuario_nome']
+    card_ids = payload.get('card_ids', [])
+    for user_id, contagem in payload.get('destinatarios', {}).items():
+        partes = [f'{contagem[campo]} {rotulo}' for campo, rotulo in ROTULOS_RESUMO_LOTE.items() if contagem.get(campo)]
+        lote.notificar(
+            [int(user_id)],
+            tipo=NotificationType.CARD_UPDATED,
+            titulo='Cards Alterados em Lote',
+            mensagem=f'{usuario_nome} alterou {contagem["cards"]} card(s) que envolvem você: {", ".join(partes)}.',
+            metadata={'alteracoes': contagem, 'card_ids': card_ids, 'em_lote': True}
+        )
+
+    # Demandas (projeto "Sugestões") alteradas: avisar todos os supervisores
+    if payload.get('demandas'):
+        lote.notificar(
+            [user_id for user_id in lote.usuarios_por_papeis(PAPEIS_SUPERVISAO) if str(user_id) not in payload.get('destinatarios', {})],
+            tipo=NotificationType.CARD_UPDATED,
+            titulo='Demandas Alteradas em Lote',
+            mensagem=f'{usuario_nome} alterou {payload["demandas"]} demanda(s) em lote.',
+            metadata={'demandas': payload['demandas'], 'card_ids': card_ids, 'em_lote': True}
+        )
+
+
+HANDLERS = {
+    OutboxEventType.CARD_CREATED: _card_created,
+    OutboxEventType.CARD_MOVED: _card_moved,
+    OutboxEventType.CARD_UPDATED: _card_updated,
+    OutboxEventType.CARD_DELETED: _card_deleted,
+    OutboxEventType.CARD_TODO_CREATED: _card_todo_created,
+    OutboxEventType.CARD_TODO_UPDATED: _card_todo_updated,
+    OutboxEventType.CARD_TODO_DELETED: _card_todo_deleted,
+    OutboxEventType.SPRINT_CREATED: _sprint_created,
+    OutboxEventType.PROJECT_CREATED: _project_created,
+    OutboxEventType.SPRINT_ROLLOVER: _sprint_rollover,
+    OutboxEventType.CARDS_BULK_UPDATED: _cards_bulk_updated,
+}
+
+
+def _agrupar_eventos(eventos):
+    """
+    Grupos de entrega na ordem do primeiro evento de cada um: eventos de TODO do mesmo
+    card ficam juntos (viram um resumo), os demais são entregues um a um.
+    """
+    grupos = []
+    todos_por_card = {}
+    for evento in eventos:
+        if evento.tipo_evento not in ROTULOS_RESUMO_TODOS:
+            grupos.append([evento])
+            continue
+        card_id = evento.payload.get('card_id')
+        if card_id not in todos_por_card:
+            todos_por_card[card_id] = []
+            grupos.append(todos_por_card[card_id])
+        todos_por_card[card_id].append(evento)
+    return grupos
+
+
+def _entregar(grupo, lote):
+    if len(grupo) > 1:
+        _card_todos_resumo(grupo, lote)
+        return
+    evento = grupo[0]
+    handler = HANDLERS.get(evento.tipo_evento)
+    if handler:
+        handler(evento.payload, lote)
+    else:
+        logger.warning(f'Evento da outbox sem handler: {evento.tipo_evento} (#{evento.id})')
+
+
+def processar_outbox(limite=TAMANHO_LOTE):
+    """
+    Processa um lote de eventos pendentes da outbox.
+    Os eventos são travados com SELECT ... FOR UPDATE SKIP LOCKED, então vários workers
+    podem rodar em paralelo sem entregar o mesmo evento duas vezes.
+
+    Retorno: número de eventos lidos no lote (0 quando a outbox está vazia).
+    """
+    with transaction.atomic():
+        eventos = list(
+            NotificationOutbox.objects.select_for_update(skip_locked=True)
+            .filter(processado_em__isnull=True, tentativas__lt=MAX_TENTATIVAS, disponivel_em__lte=timezone.now())
+            .order_by('id')[:limite]
+        )
+        if not eventos:
+            return 0
+
+        lote = _LoteEntrega(eventos)
+        processados = []
+        falhas = []
+        for grupo in _agrupar_eventos(eventos):
+            marca = len(lote.notificacoes)
+            try:
+                _entregar(grupo, lote)
+                processados.extend(evento.id for evento in grupo)
+            except Exception as e:
+                ids = ', '.join(f'#{evento.id}' for evento in grupo)
+                logger.error(f'Erro ao processar evento(s) {ids} da outbox: {e}', exc_info=True)
+                # Descartar as notificações parciais deste grupo; ele será tentado de novo
+                del lote.notificacoes[marca:]
+                for evento in grupo:
+                    evento.tentativas += 1
+                    evento.ultimo_erro = str(e)[:1000]
+                    falhas.append(evento)
+
+        notificacoes = lote.persistir()
+        NotificationOutbox.objects.filter(id__in=processados).update(
+            processado_em=timezone.now(),
+            tentativas=F('tentativas') + 1
+        )
+        if falhas:
+            NotificationOutbox.objects.bulk_update(falhas, ['tentativas', 'ultimo_erro'])
+
+        # Enviar via WebSocket somente depois que as notificações estiverem commitadas
+        transaction.on_commit(lambda: broadcast_notifications(notificacoes))
+
+    logger.info(f'Outbox: {len(processados)} eventos entregues, {len(falhas)} com erro, {len(notificacoes)} notificacoes criadas')
+    return len(eventos)
@@ -0,0 +1,39 @@
+"""
+Paginação por cursor (keyset) para os históricos que só crescem: notificações, logs e eventos.
+
+Com PageNumberPagination cada página fazia um COUNT da tabela inteira e um OFFSET cada
+vez maior. Aqui a página seguinte é buscada a partir da posição da última linha
+(data decrescente, id como desempate), usando os índices compostos dos modelos: rolar
+até o fim do histórico custa o mesmo que carregar a primeira página, e não há COUNT.
+A resposta traz apenas next/previous/results; o cliente deve seguir o link next.
+"""
+from rest_framework.filters import OrderingFilter
+from rest_framework.pagination import CursorPagination
+
+
+class HistoricoCursorPagination(CursorPagination):
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+
+
+class DataCriacaoCursorPagination(HistoricoCursorPagination):
+    ordering = ('-data_criacao', '-id')
+
+
+class DataCursorPagination(HistoricoCursorPagination):
+    ordering = ('-data', '-id')
+
+
+class OrdenacaoComDesempateFilter(OrderingFilter):
+    """
+    OrderingFilter para as listagens por cursor: ?ordering= troca a ordenação do cursor, então
+    o id é sempre acrescentado como desempate, no mesmo sentido do primeiro campo. Sem ele,
+    linhas com a mesma data vêm em ordem indefinida e o cursor pula ou repete linhas.
+    """
+
+    def get_ordering(self, request, queryset, view):
+        ordering = super().get_ordering(request, queryset, view)
+        if ordering and ordering[-1].lstrip('-') != 'id':
+            ordering = [*ordering, '-id' if ordering[0].startswith('-') else 'id']
+        return ordering
@@ -0,0 +1,115 @@
+"""
+Diretório de destinatários por cargo, em memória do processo.
+
+Cada evento de notificação que alcança "todos os supervisores" (ou gestores) precisava de
+um User.objects.filter(role__in=..., is_active=True). Os cargos quase nunca mudam, então
+o processo guarda {cargo: ids dos usuários ativos} e resolve os destinatários sem consulta.
+
+Invalidação:
+- no próprio processo, os signals de User (user_pre_save / user_role_changed e a remoção)
+  descartam o diretório na hora;
+- nos outros processos (workers Celery, outros servidores), pela chave de versão
+  DESTINATARIOS_CHAVE_VERSAO no cache RESPONSE_CACHE_ALIAS, incrementada após o commit.
+  Cada leitura compara a versão local com a do cache e recarrega se mudou.
+
+Se o cache não estiver acessível, ou for memória local (que não é compartilhada entre
+processos), o diretório também é recarregado a cada DESTINATARIOS_TTL_SEGUNDOS.
+"""
+import logging
+import threading
+import time
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import transaction
+
+logger = logging.getLogger(__name__)
+
+User = get_user_model()
+
+DESTINATARIOS_CHAVE_VERSAO = 'destinatarios:versao'
+
+_lock = threading.Lock()
+_estado = {'versao': None, 'carregado_em': 0.0, 'por_cargo': None}
+
+
+def _cache():
+    return caches[getattr(settings, 'RESPONSE_CACHE_ALIAS', 'default')]
+
+
+def _versao_compartilhada():
+    """Versão atual no cache compartilhado; None se ele não estiver acessível ou não for compartilhado"""
+    try:
+        cache = _cache()
+        if isinstance(cache, LocMemCache):
+            return None
+        versao = cache.get(DESTINATARIOS_CHAVE_VERSAO)
+        if versao is None:
+            # Valor novo a cada recriação: nunca coincide com uma versão já usada antes
+            cache.add(DESTINATARIOS_CHAVE_VERSAO, time.time_ns(), None)
+            versao = cache.get(DESTINATARIOS_CHAVE_VERSAO)
+        return versao
+    except Exception as e:
+        logger.warning(f'Versao do diretorio de destinatarios indisponivel ({e}).')
+        return None
+
+
+def _carregar():
+    por_cargo = {}
+    for user_id, cargo in User.objects.filter(is_active=True).values_list('id', 'role'):
+        por_cargo.setdefault(cargo, []).append(user_id)
+    return {cargo: tuple(ids) for cargo, ids in por_cargo.items()}
+
+
+def _diretorio():
+    versao = _versao_compartilhada()
+    agora = time.monotonic()
+    with _lock:
+        por_cargo = _estado['por_cargo']
+        expirado = (
+            versao is None
+            and agora - _estado['carregado_em'] > getattr(settings, 'DESTINATARIOS_TTL_SEGUNDOS', 300)
+        )
+        if por_cargo is None or versao != _estado['versao'] or expirado:
+            por_cargo = _carregar()
+            _estado.update(versao=versao, carregado_em=agora, por_cargo=por_cargo)
+        return por_cargo
+
+
+def usuarios_por_cargos(cargos):
+    """IDs dos usuários ativos com algum dos cargos informados"""
+    por_cargo = _diretorio()
+    return [user_id for cargo in dict.fromkeys(cargos) for user_id in por_cargo.get(cargo, ())]
+
+
+def usuarios_ativos():
+    """IDs de todos os usuários ativos"""
+    return [user_id for ids in _diretorio().values() for user_id in ids]
+
+
+def _descartar_local():
+    with _lock:
+        _estado['por_cargo'] = None
+
+
+def _incrementar_versao():
+    _descartar_local()
+    try:
+        cache = _cache()
+        try:
+            cache.incr(DESTINATARIOS_CHAVE_VERSAO)
+        except ValueError:
+            cache.set(DESTINATARIOS_CHAVE_VERSAO, time.time_ns(), None)
+    except Exception as e:
+        logger.warning(f'Nao foi possivel invalidar o diretorio de destinatarios no cache ({e}).')
+
+
+def invalidar_destinatarios():
+    """
+    Descarta o diretório deste processo já (a transação atual enxerga a mudança) e o dos
+    demais após o commit, quando a mudança fica visível para eles.
+    """
+    _descartar_local()
+    transaction.on_commit(_incrementar_versao)
@@ -0,0 +1,114 @@
+"""
+Retenção do histórico: Notification, CardLog e NotificationOutbox só cresciam.
+
+- Notificações lidas com mais de RETENCAO_NOTIFICACOES_LIDAS_DIAS vão para ArchivedNotification
+  (não lidas nunca são arquivadas, então os contadores de não lidas não mudam);
+- logs de cards de sprints finalizadas com mais de RETENCAO_LOGS_SPRINT_FINALIZADA_DIAS vão
+  para ArchivedCardLog;
+- eventos da outbox já entregues há mais de RETENCAO_OUTBOX_PROCESSADA_DIAS são apagados.
+
+Cada lote (ARQUIVAMENTO_TAMANHO_LOTE linhas, por id) é uma transação: copia para a tabela
+de arquivo, com o id original, e apaga as linhas copiadas. Se o processo cair no meio, o
+lote é desfeito inteiro; se a cópia já existir (execução repetida), ignore_conflicts evita
+duplicar. Cada execução processa no máximo ARQUIVAMENTO_MAX_LOTES lotes por tabela; o
+restante fica para a próxima.
+"""
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from .models import (
+    Notification, ArchivedNotification, CardLog, ArchivedCardLog, NotificationOutbox,
+)
+
+logger = logging.getLogger(__name__)
+
+CAMPOS_NOTIFICACAO = (
+    'id', 'usuario_id', 'tipo', 'titulo', 'mensagem', 'lida', 'data_criacao',
+    'card_id', 'sprint_id', 'project_id', 'metadata',
+)
+CAMPOS_CARD_LOG = ('id', 'card_id', 'tipo_evento', 'descricao', 'usuario_id', 'data')
+
+
+def _config(nome, padrao):
+    return getattr(settings, nome, padrao)
+
+
+def _limite(dias, agora=None):
+    return (agora or timezone.now()) - timedelta(days=dias)
+
+
+def _mover_em_lotes(queryset, modelo_arquivo, campos, batch_size, max_lotes):
+    """Copia as linhas do queryset para modelo_arquivo e apaga as originais, lote a lote"""
+    total = 0
+    for _ in range(max_lotes):
+        with transaction.atomic():
+            lote = list(queryset.order_by('id').values(*campos)[:batch_size])
+            if not lote:
+                break
+            modelo_arquivo.objects.bulk_create(
+                [modelo_arquivo(**linha) for linha in lote], batch_size=batch_size, ignore_conflicts=True
+            )
+            queryset.model.objects.filter(id__in=[linha['id'] for linha in lote]).delete()
+        total += len(lote)
+        if len(lote) < batch_size:
+            break
+    return total
+
+
+def arquivar_notificacoes(dias=None, batch_size=None, max_lotes=None, agora=None):
+    """Move notificações lidas mais antigas que a retenção para ArchivedNotification"""
+    dias = dias if dias is not None else _config('RETENCAO_NOTIFICACOES_LIDAS_DIAS', 90)
+    queryset = Notification.objects.filter(lida=True, data_criacao__lt=_limite(dias, agora))
+    return _mover_em_lotes(
+        queryset, ArchivedNotification, CAMPOS_NOTIFICACAO,
+        batch_size or _config('ARQUIVAMENTO_TAMANHO_LOTE', 1000),
+        max_lotes or _config('ARQUIVAMENTO_MAX_LOTES', 50),
+    )
+
+
+def arquivar_logs(dias=None, batch_size=None, max_lotes=None, agora=None):
+    """Move logs de cards de sprints finalizadas mais antigos que a retenção para ArchivedCardLog"""
+    dias = dias if dias is not None else _config('RETENCAO_LOGS_SPRINT_FINALIZADA_DIAS', 180)
+    queryset = CardLog.objects.filter(card__projeto__sprint__finalizada=True, data__lt=_limite(dias, agora))
+    return _mover_em_lotes(
+        queryset, ArchivedCardLog, CAMPOS_CARD_LOG,
+        batch_size or _config('ARQUIVAMENTO_TAMANHO_LOTE', 1000),
+        max_lotes or _config('ARQUIVAMENTO_MAX_LOTES', 50),
+    )
+
+
+def limpar_outbox(dias=None, batch_size=None, max_lotes=None, agora=None):
+    """Apaga eventos da outbox entregues há mais tempo que a retenção"""
+    dias = dias if dias is not None else _config('RETENCAO_OUTBOX_PROCESSADA_DIAS', 7)
+    batch_size = batch_size or _config('ARQUIVAMENTO_TAMANHO_LOTE', 1000)
+    limite = _limite(dias, agora)
+    total = 0
+    for _ in range(max_lotes or _config('ARQUIVAMENTO_MAX_LOTES', 50)):
+        ids = list(
+            NotificationOutbox.objects.filter(processado_em__lt=limite).order_by('id').values_list('id', flat=True)[:batch_size]
+        )
+        if not ids:
+            break
+        NotificationOutbox.objects.filter(id__in=ids).delete()
+        total += len(ids)
+        if len(ids) < batch_size:
+            break
+    return total
+
+
+def aplicar_retencao(agora=None):
+    """Executa as três etapas; retorna quantas linhas cada uma moveu/apagou"""
+    resultado = {
+        'notificacoes_arquivadas': arquivar_notificacoes(agora=agora),
+        'logs_arquivados': arquivar_logs(agora=agora),
+        'outbox_removidos': limpar_outbox(agora=agora),
+    }
+    logger.info(
+        'Retencao: %(notificacoes_arquivadas)s notificacoes e %(logs_arquivados)s logs arquivados, '
+        '%(outbox_removidos)s eventos da outbox removidos', resultado
+    )
+    return resultado
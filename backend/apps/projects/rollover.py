@@ -0,0 +1,293 @@
+"""
+Replicação (rollover) de sprint em lote.
+
+Ao finalizar uma sprint, os projetos com cards não entregues são copiados para a sprint
+de destino. Antes cada projeto e cada card eram criados com objects.create(), e cada card
+disparava o signal de criação (CardLog completo + evento de notificação). Aqui projetos,
+cards, TODOs e logs são inseridos com bulk_create em lotes, sem signals. Cada card copiado
+ganha um CardLog curto (o histórico continua por card), e a replicação inteira gera um único
+evento na outbox com um resumo por destinatário.
+
+O progresso fica em SprintRollover (uma linha por sprint de origem):
+- iniciar_replicacao(): escolhe o destino e cria os projetos (uma transação);
+- replicar_proximo_lote(): copia o próximo lote de cards e avança o checkpoint (uma transação por lote);
+- concluir_replicacao(): registra a notificação de resumo e marca a sprint como finalizada.
+Se o processo cair no meio, chamar de novo retoma do último lote gravado.
+"""
+import logging
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import Exists, OuterRef
+from django.utils import timezone
+
+from apps.response_cache import invalidar_apos_commit
+from .models import (
+    Sprint, Project, Card, CardTodo, CardLog, CardLogEventType, CardStatus, ProjectStatus,
+    OutboxEventType, SprintRollover, SprintRolloverStatus,
+)
+from .outbox import registrar_evento
+
+logger = logging.getLogger(__name__)
+
+TAMANHO_LOTE = 500
+
+# Cards nesses status já foram entregues (ou descartados) e não passam para a próxima sprint
+STATUS_NAO_REPLICADOS = [CardStatus.FINALIZADO, CardStatus.INVIABILIZADO]
+
+# Campos copiados como estão; os demais recebem valores padrão no lugar de None
+CAMPOS_CARD_COPIADOS = (
+    'nome', 'script_url', 'area', 'tipo', 'responsavel_id', 'status', 'prioridade', 'data_inicio', 'data_fim',
+)
+
+
+def get_proxima_sprint(sprint):
+    """
+    Retorna a sprint de destino para replicação: sprint em andamento ou
+    a próxima por data_inicio. Retorna None se não houver.
+    """
+    hoje = timezone.now().date()
+    # 1) Sprint em andamento: data_inicio <= hoje <= data_fim
+    em_andamento = Sprint.objects.filter(
+        data_inicio__lte=hoje,
+        data_fim__gte=hoje,
+    ).exclude(pk=sprint.pk).order_by('data_inicio').first()
+    if em_andamento:
+        return em_andamento
+    # 2) Próxima por data_inicio (primeira com data_inicio > data_fim da sprint que está finalizando)
+    proxima = Sprint.objects.filter(
+        data_inicio__gt=sprint.data_fim,
+    ).order_by('data_inicio').first()
+    return proxima
+
+
+def _cards_pendentes():
+    return Card.objects.exclude(status__in=STATUS_NAO_REPLICADOS)
+
+
+def _copiar_card(card, novo_projeto_id, criado_por_id):
+    return Card(
+        projeto_id=novo_projeto_id,
+        descricao=card.descricao or '',
+        criado_por_id=criado_por_id or card.criado_por_id,
+        complexidade_selected_items=card.complexidade_selected_items or [],
+        complexidade_selected_development=card.complexidade_selected_development or '',
+        complexidade_custom_items=card.complexidade_custom_items or [],
+        card_comment=card.card_comment or '',
+        **{campo: getattr(card, campo) for campo in CAMPOS_CARD_COPIADOS},
+    )
+
+
+def _somar_resumo(resumo, user_id, chave):
+    # Chaves de JSON são strings; o handler da outbox converte de volta para int
+    contagem = resumo.setdefault(str(user_id), {'cards': 0, 'projetos': 0})
+    contagem[chave] += 1
+
+
+def iniciar_replicacao(sprint, criado_por_user=None, copiar_todos=None):
+    """
+    Cria (ou retoma) o checkpoint da replicação da sprint, já com os projetos copiados.
+
+    Se a replicação já começou, retorna o checkpoint existente sem alterar destino nem
+    opções. Retorna None se não houver sprint de destino.
+    copiar_todos: também copia os TODOs dos cards (status e comentários incluídos);
+    None usa settings.SPRINT_ROLLOVER_COPIAR_TODOS.
+    """
+    existente = SprintRollover.objects.filter(sprint=sprint).first()
+    if existente:
+        return existente
+
+    destino = get_proxima_sprint(sprint)
+    if destino is None:
+        return None
+    if copiar_todos is None:
+        copiar_todos = getattr(settings, 'SPRINT_ROLLOVER_COPIAR_TODOS', False)
+
+    try:
+        with transaction.atomic():
+            projetos = list(
+                sprint.projects.filter(Exists(_cards_pendentes().filter(projeto=OuterRef('pk')))).order_by('id')
+            )
+            novos_projetos = Project.objects.bulk_create([
+                Project(
+                    nome=project.nome,
+                    descricao=project.descricao or '',
+                    sprint=destino,
+                    gerente_atribuido_id=project.gerente_atribuido_id,
+                    desenvolvedor_id=project.desenvolvedor_id,
+                    status=ProjectStatus.CRIADO,
+                )
+                for project in projetos
+            ], batch_size=TAMANHO_LOTE)
+
+            # bulk_create não dispara signals: invalidar as listagens em cache manualmente
+            invalidar_apos_commit('sprints', 'projects')
+
+            resumo = {}
+            for novo in novos_projetos:
+                if novo.gerente_atribuido_id:
+                    _somar_resumo(resumo, novo.gerente_atribuido_id, 'projetos')
+
+            # O OneToOne em sprint garante um único checkpoint: se outro worker criou
+            # primeiro, esta transação (com os projetos acima) é desfeita
+            return SprintRollover.objects.create(
+                sprint=sprint,
+                sprint_destino=destino,
+                criado_por=criado_por_user,
+                copiar_todos=copiar_todos,
+                projetos_mapeados={str(antigo.id): novo.id for antigo, novo in zip(projetos, novos_projetos)},
+                projetos_criados=len(novos_projetos),
+                resumo=resumo,
+            )
+    except IntegrityError:
+        return SprintRollover.objects.get(sprint=sprint)
+
+
+def replicar_proximo_lote(rollover_id, batch_size=TAMANHO_LOTE):
+    """
+    Copia o próximo lote de cards pendentes e avança o checkpoint na mesma transação.
+    Retorna o número de cards copiados (0 quando não há mais nada a copiar).
+    """
+    with transaction.atomic():
+        # O lock serializa workers concorrentes na mesma replicação
+        rollover = SprintRollover.objects.select_for_update().select_related('sprint', 'sprint_destino').get(pk=rollover_id)
+        if rollover.status != SprintRolloverStatus.EM_ANDAMENTO or not rollover.projetos_mapeados:
+            return 0
+
+        projeto_destino = {int(antigo): novo for antigo, novo in rollover.projetos_mapeados.items()}
+        lote = list(
+            _cards_pendentes()
+            .filter(projeto_id__in=projeto_destino, id__gt=rollover.ultimo_card_id)
+            .order_by('id')[:batch_size]
+        )
+        if not lote:
+            return 0
+
+        novos_cards = Card.objects.bulk_create(
+            [_copiar_card(card, projeto_destino[card.projeto_id], rollover.criado_por_id) for card in lote],
+            batch_size=batch_size
+        )
+        for novo in novos_cards:
+            if novo.responsavel_id:
+                _somar_resumo(rollover.resumo, novo.responsavel_id, 'cards')
+        # Contagem de cards da listagem de projetos em cache
+        invalidar_apos_commit('projects')
+
+        # Histórico: um registro por card novo, inserido de uma vez
+        descricao_log = (
+            f'Card replicado da sprint "{rollover.sprint.nome}" para a sprint '
+            f'"{rollover.sprint_destino.nome}" (pendente na finalização).'
+        )
+        CardLog.objects.bulk_create([
+            CardLog(
+                card_id=novo.id,
+                tipo_evento=CardLogEventType.CRIADO,
+                descricao=descricao_log,
+                usuario_id=rollover.criado_por_id,
+            )
+            for novo in novos_cards
+        ], batch_size=batch_size)
+
+        if rollover.copiar_todos:
+            card_destino = {antigo.id: novo.id for antigo, novo in zip(lote, novos_cards)}
+            novos_todos = CardTodo.objects.bulk_create([
+                CardTodo(
+                    card_id=card_destino[todo.card_id],
+                    label=todo.label,
+                    is_original=todo.is_original,
+                    status=todo.status,
+                    comment=todo.comment,
+                    order=todo.order,
+                )
+                for todo in CardTodo.objects.filter(card_id__in=card_destino).order_by('card_id', 'order', 'id')
+            ], batch_size=batch_size)
+            rollover.todos_copiados += len(novos_todos)
+
+        rollover.ultimo_card_id = lote[-1].id
+        rollover.cards_copiados += len(novos_cards)
+        rollover.save(update_fields=['ultimo_card_id', 'cards_copiados', 'todos_copiados', 'resumo', 'updated_at'])
+        return len(novos_cards)
+
+
+def concluir_replicacao(rollover_id):
+    """Registra a notificação de resumo e marca a sprint de origem como finalizada (idempotente)"""
+    with transaction.atomic():
+        rollover = SprintRollover.objects.select_for_update().select_related('sprint', 'sprint_destino').get(pk=rollover_id)
+        if rollover.status == SprintRolloverStatus.CONCLUIDA:
+            return rollover
+
+        if rollover.resumo:
+            registrar_evento(
+                OutboxEventType.SPRINT_ROLLOVER,
+                sprint_origem_id=rollover.sprint_id,
+                sprint_origem_nome=rollover.sprint.nome,
+                sprint_id=rollover.sprint_destino_id,
+                sprint_nome=rollover.sprint_destino.nome,
+                destinatarios=rollover.resumo,
+            )
+
+        rollover.status = SprintRolloverStatus.CONCLUIDA
+        rollover.concluida_em = timezone.now()
+        rollover.save(update_fields=['status', 'concluida_em', 'updated_at'])
+
+        sprint = rollover.sprint
+        sprint.finalizada = True
+        sprint.save(update_fields=['finalizada', 'updated_at'])
+
+    logger.info(
+        f'Sprint {rollover.sprint_id} replicada para {rollover.sprint_destino_id}: {rollover.projetos_criados} projeto(s), '
+        f'{rollover.cards_copiados} card(s), {rollover.todos_copiados} TODO(s)'
+    )
+    return rollover
+
+
+def replicar_sprint(sprint, criado_por_user=None, copiar_todos=None, batch_size=TAMANHO_LOTE, max_lotes=None):
+    """
+    Executa (ou retoma) a replicação da sprint.
+    Retorna o SprintRollover, ou None se não houver sprint de destino. Com max_lotes, para
+    depois de copiar esse número de lotes e retorna o checkpoint ainda EM_ANDAMENTO (a
+    próxima chamada continua dele); sem limite, copia tudo e retorna a replicação concluída.
+    """
+    rollover = iniciar_replicacao(sprint, criado_por_user=criado_por_user, copiar_todos=copiar_todos)
+    if rollover is None:
+        return None
+    lotes = 0
+    while replicar_proximo_lote(rollover.id, batch_size=batch_size):
+        lotes += 1
+        if max_lotes is not None and lotes >= max_lotes:
+            return SprintRollover.objects.select_related('sprint_destino').get(pk=rollover.id)
+    return concluir_replicacao(rollover.id)
+
+
+def encadear_sprints(sprints):
+    """
+    Separa as sprints a finalizar em grupos independentes, cada um em ordem de data_fim.
+
+    Se o destino de uma sprint é outra sprint da lista (também vencida), as duas ficam no
+    mesmo grupo: a de destino só pode ser replicada depois de receber os cards da anterior,
+    senão eles ficam numa sprint já finalizada e não seguem adiante. Grupos diferentes não
+    compartilham destino e podem rodar em paralelo. Retorna uma lista de listas de ids.
+    """
+    sprints = sorted(sprints, key=lambda sprint: (sprint.data_fim, sprint.pk))
+    pai = {sprint.pk: sprint.pk for sprint in sprints}
+
+    def raiz(sprint_id):
+        while pai[sprint_id] != sprint_id:
+            pai[sprint_id] = pai[pai[sprint_id]]
+            sprint_id = pai[sprint_id]
+        return sprint_id
+
+    # Replicação já iniciada: o destino está fixado no checkpoint
+    destinos = dict(SprintRollover.objects.filter(sprint__in=sprints).values_list('sprint_id', 'sprint_destino_id'))
+    for sprint in sprints:
+        destino_id = destinos.get(sprint.pk)
+        if destino_id is None:
+            destino = get_proxima_sprint(sprint)
+            destino_id = destino.pk if destino else None
+        if destino_id in pai:
+            pai[raiz(sprint.pk)] = raiz(destino_id)
+
+    grupos = {}
+    for sprint in sprints:
+        grupos.setdefault(raiz(sprint.pk), []).append(sprint.pk)
+    return list(grupos.values())
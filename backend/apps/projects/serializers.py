@@ -1,7 +1,14 @@
 from rest_framework import serializers
-from .models import Sprint, Project, Card, CardTodo, Event, CardLog, Notification, WeeklyPriority, WeeklyPriorityConfig, CardArea
+from django.contrib.auth import get_user_model
+from .models import (
+    Sprint, Project, Card, CardTodo, Event, CardLog, Notification, WeeklyPriority, WeeklyPriorityConfig, ClosedWeek, CardArea,
+    CardStatus, Priority,
+    ArchivedCardLog, ArchivedNotification,
+)
 from apps.accounts.serializers import UserSerializer
 
+User = get_user_model()
+
 
 def format_user_name(user):
     """Formata o nome do usuário com first_name e last_name"""
@@ -24,11 +31,16 @@ class SprintSerializer(serializers.ModelSerializer):
     data_fim = serializers.DateField(
         input_formats=['%Y-%m-%d', '%Y-%m-%dT%H:%M:%S', '%Y-%m-%dT%H:%M', '%Y-%m-%dT%H:%M:%S.%f']
     )
-    projects_count = serializers.IntegerField(source='projects.count', read_only=True)
+    projects_count = serializers.SerializerMethodField()
 
     def get_supervisor_name(self, obj):
         return format_user_name(obj.supervisor)
 
+    def get_projects_count(self, obj):
+        # Usa a contagem pré-carregada (carregar_cards_para_leitura) quando disponível
+        count = getattr(obj, 'projects_count', None)
+        return count if count is not None else obj.projects.count()
+
     class Meta:
         model = Sprint
         fields = ['id', 'nome', 'data_inicio', 'data_fim', 'duracao_dias', 
@@ -47,7 +59,11 @@ class ProjectSerializer(serializers.ModelSerializer):
     def get_desenvolvedor_name(self, obj):
         return format_user_name(obj.desenvolvedor)
     status_display = serializers.CharField(source='get_status_display', read_only=True)
-    cards_count = serializers.IntegerField(source='cards.count', read_only=True)
+    cards_count = serializers.SerializerMethodField()
+
+    def get_cards_count(self, obj):
+        count = getattr(obj, 'cards_count', None)
+        return count if count is not None else obj.cards.count()
 
     def validate_nome(self, value):
         """
@@ -130,7 +146,11 @@ class CardSerializer(serializers.ModelSerializer):
     prioridade_display = serializers.CharField(source='get_prioridade_display', read_only=True)
     area_display = serializers.CharField(source='get_area_display', read_only=True)
     tipo_display = serializers.CharField(source='get_tipo_display', read_only=True)
-    events_count = serializers.IntegerField(source='events.count', read_only=True)
+    events_count = serializers.SerializerMethodField()
+    
+    def get_events_count(self, obj):
+        count = getattr(obj, 'events_count', None)
+        return count if count is not None else obj.events.count()
     
     # Campos explícitos para garantir que sejam sempre processados
     complexidade_selected_items = serializers.JSONField(required=False, allow_null=False, default=list)
@@ -163,275 +183,37 @@ class CardSerializer(serializers.ModelSerializer):
         validated_data.setdefault('complexidade_selected_development', None)
         validated_data.setdefault('complexidade_custom_items', [])
         
-        # Passar usuário da requisição para o signal via thread-local (ANTES de criar)
-        usuario = None
+        # Passar usuário da requisição para o signal via thread-local (ANTES de criar);
+        # o signal de post_save é o único responsável pelo CardLog de criação
+        from apps.projects import signals
+        request = self.context.get('request')
+        usuario = getattr(request, 'user', None) if request else None
+        signals._thread_locals.user = usuario
         try:
-            from apps.projects import signals
-            if self.context.get('request') and hasattr(self.context['request'], 'user'):
-                usuario = self.context['request'].user
-                signals._thread_locals.user = usuario
-        except (ImportError, AttributeError):
-            pass
-        
-        instance = super().create(validated_data)
+            instance = super().create(validated_data)
+        finally:
+            # Não deixar o usuário vazar para o próximo save feito nesta thread
+            signals._thread_locals.user = None
         
-        # Também passar como atributo da instância (fallback)
         if usuario:
             instance._request_user = usuario
         
-        # Criar log diretamente aqui como garantia (o signal pode não estar sendo executado)
-        try:
-            from apps.projects.models import CardLog, CardLogEventType
-            
-            # Construir descrição completa
-            def format_user_name(user):
-                if not user:
-                    return None
-                if user.first_name and user.last_name:
-                    return f"{user.first_name} {user.last_name}"
-                elif user.first_name:
-                    return user.first_name
-                elif user.last_name:
-                    return user.last_name
-                return user.username
-            
-            prioridade_labels = {
-                'baixa': 'Baixa', 'media': 'Média', 'alta': 'Alta', 'absoluta': 'Absoluta',
-            }
-            area_labels = {
-                'rpa': 'RPA', 'frontend': 'Frontend', 'backend': 'Backend',
-                'script': 'Script', 'sistema': 'Sistema',
-            }
-            tipo_labels = {
-                'nova_robotizacao': 'Nova Robotização',
-                'nova_automacao': 'Nova Automação',
-                'feature': 'Feature',
-                'bug': 'Bug',
-                'refact_completo': 'Refact Completo',
-                'refact_pontual': 'Refact Pontual',
-                'otimizacao_processo': 'Otimização de Processo',
-                'melhoria_fluxo': 'Melhoria de Fluxo',
-                'novo_script': 'Novo Script',
-                'ferramenta': 'Ferramenta',
-                'qualidade': 'Qualidade',
-                'teste_software': 'Teste de Software',
-                'raspagem_dados': 'Raspagem de Dados',
-                'novo_painel': 'Novo Painel',
-                'ia': 'IA',
-                'auditoria': 'Auditoria',
-                'manutencao': 'Manutenção',
-            }
-            status_labels = {
-                'a_desenvolver': 'A Desenvolver', 'em_desenvolvimento': 'Em Desenvolvimento',
-                'parado_pendencias': 'Parado por Pendências', 'em_homologacao': 'Em Homologação',
-                'finalizado': 'Concluído', 'inviabilizado': 'Inviabilizado',
-            }
-            
-            descricao_parts = [f'Card "{instance.nome}" criado com os seguintes dados:']
-            descricao_parts.append(f'• Nome: {instance.nome}')
-            if instance.descricao:
-                descricao_parts.append(f'• Descrição: {instance.descricao[:100]}{"..." if len(instance.descricao) > 100 else ""}')
-            descricao_parts.append(f'• Status: {status_labels.get(instance.status, instance.status)}')
-            descricao_parts.append(f'• Prioridade: {prioridade_labels.get(instance.prioridade, instance.prioridade)}')
-            descricao_parts.append(f'• Área: {area_labels.get(instance.area, instance.area)}')
-            descricao_parts.append(f'• Tipo: {tipo_labels.get(instance.tipo, instance.tipo)}')
-            if instance.responsavel:
-                descricao_parts.append(f'• Responsável: {format_user_name(instance.responsavel)}')
-            else:
-                descricao_parts.append('• Responsável: Não atribuído')
-            if instance.data_inicio:
-                descricao_parts.append(f'• Data de Início: {instance.data_inicio.strftime("%d/%m/%Y %H:%M")}')
-            if instance.data_fim:
-                descricao_parts.append(f'• Data de Fim: {instance.data_fim.strftime("%d/%m/%Y %H:%M")}')
-            if instance.script_url:
-                descricao_parts.append(f'• Script URL: {instance.script_url}')
-            
-            # Mapeamento de complexidade (ID -> label e horas)
-            complexidade_map = {
-                'ler_script': {'label': 'Ler script e conferir informações do video', 'hours': 1},
-                'solicitar_usuario': {'label': 'Solicitar criação de usuário / vm', 'hours': 1},
-                'testes_iniciais': {'label': 'Testes iniciais na maquina', 'hours': 3},
-                'configurar_projeto': {'label': 'Configurar projeto na vm', 'hours': 1},
-                'desenvolvimento_basico': {'label': 'Desenvolvimento básico', 'hours': 8},
-                'desenvolvimento_medio': {'label': 'Desenvolvimento médio', 'hours': 24},
-                'desenvolvimento_dificil': {'label': 'Desenvolvimento difícil', 'hours': 40},
-            }
-            
-            # Complexidade do projeto
-            has_complexidade = (
-                instance.complexidade_selected_items or 
-                instance.complexidade_selected_development or 
-                instance.complexidade_custom_items
-            )
-            if has_complexidade:
-                descricao_parts.append('• Complexidade do projeto:')
-                
-                # Itens selecionados
-                if instance.complexidade_selected_items:
-                    for item_id in instance.complexidade_selected_items:
-                        if item_id in complexidade_map:
-                            item_info = complexidade_map[item_id]
-                            descricao_parts.append(f'  - {item_info["label"]}: {item_info["hours"]}h')
-                        else:
-                            # Fallback se não estiver no mapeamento
-                            label = item_id.replace('_', ' ').title()
-                            descricao_parts.append(f'  - {label}')
-                
-                # Desenvolvimento selecionado (como item de complexidade)
-                if instance.complexidade_selected_development:
-                    dev_id = instance.complexidade_selected_development
-                    if dev_id in complexidade_map:
-                        dev_info = complexidade_map[dev_id]
-                        descricao_parts.append(f'  - {dev_info["label"]}: {dev_info["hours"]}h')
-                    else:
-                        # Fallback se não estiver no mapeamento
-                        label = dev_id.replace('_', ' ').title()
-                        descricao_parts.append(f'  - {label}')
-                
-                # Itens personalizados
-                if instance.complexidade_custom_items:
-                    for custom_item in instance.complexidade_custom_items:
-                        if isinstance(custom_item, dict):
-                            label = custom_item.get('label', 'Item personalizado')
-                            hours = custom_item.get('hours', 0)
-                            descricao_parts.append(f'  - {label}: {hours}h')
-                        else:
-                            descricao_parts.append(f'  - {custom_item}')
-            
-            descricao_completa = '\n'.join(descricao_parts)
-            
-            # Verificar se já existe um log (para evitar duplicação se o signal também criar)
-            if not CardLog.objects.filter(card=instance, tipo_evento=CardLogEventType.CRIADO).exists():
-                CardLog.objects.create(
-                    card=instance,
-                    tipo_evento=CardLogEventType.CRIADO,
-                    descricao=descricao_completa,
-                    usuario=usuario
-                )
-        except Exception as e:
-            import logging
-            logger = logging.getLogger(__name__)
-            logger.error(f'Erro ao criar CardLog no serializer para card {instance.id}: {str(e)}', exc_info=True)
-        
-        # Criar TODOs baseados na área do card
+        # Criar TODOs originais a partir dos modelos da área (CardTodoTemplate, editáveis no admin).
+        # Um único bulk_create: sem signals, então nenhum aviso por TODO para os gestores
         try:
-            from apps.projects.models import CardTodo, CardTodoStatus
-            
-            # Mapeamento de área para TODOs (baseado no frontend)
-            todos_by_area = {
-                'backend': [
-                    {'id': 'modelagem_banco', 'label': 'Modelagem Do Banco De Dados (Models)'},
-                    {'id': 'criacao_interfaces_repositories', 'label': 'Criação De Interfaces E Implementação De Repositories'},
-                    {'id': 'criacao_use_cases', 'label': 'Criação De Use Cases'},
-                    {'id': 'registro_dependencias', 'label': 'Registro De Dependências Em Containers (Di)'},
-                    {'id': 'criacao_serializers', 'label': 'Criação De Serializers'},
-                    {'id': 'criacao_views_urls', 'label': 'Criação De Views E Urls'},
-                    {'id': 'criacao_permissoes', 'label': 'Criação E Aplicação De Permissões'},
-                    {'id': 'testes_unitarios', 'label': 'Testes Unitários E De Cobertura'},
-                    {'id': 'testes_manuais', 'label': 'Testes Manuais (Postman / Insomnia)'},
-                    {'id': 'atualizacao_documentacao', 'label': 'Atualização Da Documentação Da Api'},
-                    {'id': 'criacao_pr_code_review', 'label': 'Criação De Pr E Ajustes De Code Review'},
-                    {'id': 'build_deploy_testes', 'label': 'Build E Deploy Em Ambiente De Testes'},
-                    {'id': 'build_deploy_producao', 'label': 'Build E Deploy Em Produção'},
-                    {'id': 'pull_aplicacao_vm', 'label': 'Pull Da Aplicação Na Vm'},
-                ],
-                'frontend': [
-                    {'id': 'definicao_validacao_contratos', 'label': 'Definição E Validação De Contratos - Interfaces'},
-                    {'id': 'construcao_repository_service', 'label': 'Construção Do Repository / Service'},
-                    {'id': 'construcao_usecases', 'label': 'Construção Dos Usecases'},
-                    {'id': 'garantir_independencia_ui', 'label': 'Garantir Independência Da Ui Em Relação Aos Usecases'},
-                    {'id': 'implementacao_testes_unitarios', 'label': 'Implementação De Testes Unitários (Usecases / Services / Repositories)'},
-                    {'id': 'ajustes_contratos_regras', 'label': 'Ajustes De Contratos E Regras De Negócio (Se Necessário)'},
-                    {'id': 'construcao_componentes_complementares', 'label': 'Construção De Componentes Complementares (Shared / Design System)'},
-                    {'id': 'construcao_tela', 'label': 'Construção Da Tela'},
-                    {'id': 'tratamento_estados', 'label': 'Tratamento De Estados (Loading, Erro, Empty)'},
-                    {'id': 'ajustes_responsividade', 'label': 'Ajustes De Responsividade'},
-                    {'id': 'integracao_backend', 'label': 'Integração Com O Backend'},
-                    {'id': 'mapeamento_dto_adapter', 'label': 'Mapeamento Dto, Via Adapter'},
-                    {'id': 'testar_funcionalidades', 'label': 'Testar Funcionalidades (Fluxos Principais E Edge Cases)'},
-                    {'id': 'validacao_visual_ux', 'label': 'Validação Visual E De Ux'},
-                    {'id': 'code_review', 'label': 'Code Review'},
-                    {'id': 'aplicar_correcoes_code_review', 'label': 'Aplicar Correções Do Code Review'},
-                    {'id': 'build_deploy_producao', 'label': 'Build E Deploy Em Produção'},
-                    {'id': 'pull_aplicacao_vm', 'label': 'Pull Da Aplicação Na Vm'},
-                ],
-                'rpa': [
-                    {'id': 'ler_script_conferir', 'label': 'Ler Script E Conferir Informações Do Vídeo'},
-                    {'id': 'solicitar_usuario_vm', 'label': 'Solicitar Usuário Para Acessar A Vm'},
-                    {'id': 'testes_iniciais_local', 'label': 'Testes Iniciais Na Máquina Local'},
-                    {'id': 'configurar_projeto_vm', 'label': 'Configurar Projeto Na Vm'},
-                    {'id': 'desenvolvimento_basico', 'label': 'Desenvolvimento (Básico)'},
-                    {'id': 'desenvolvimento_medio', 'label': 'Desenvolvimento (Médio)'},
-                    {'id': 'desenvolvimento_dificil', 'label': 'Desenvolvimento (Dificl)'},
-                    {'id': 'testes_homologacao_mapeamento', 'label': 'Testes/Homologação E Mapeamento De Erros'},
-                    {'id': 'documentacao', 'label': 'Documentação'},
-                    {'id': 'correcoes_code_review', 'label': 'Correções Code Review'},
-                ],
-                'sistema': [
-                    {'id': 'ler_script_conferir', 'label': 'Ler Script E Conferir Informações Do Vídeo'},
-                    {'id': 'solicitar_usuario_vm', 'label': 'Solicitar Usuário Para Acessar A Vm'},
-                    {'id': 'testes_iniciais_local', 'label': 'Testes Iniciais Na Máquina Local'},
-                    {'id': 'configurar_projeto_vm', 'label': 'Configurar Projeto Na Vm'},
-                    {'id': 'desenvolvimento_basico', 'label': 'Desenvolvimento (Básico)'},
-                    {'id': 'desenvolvimento_medio', 'label': 'Desenvolvimento (Médio)'},
-                    {'id': 'desenvolvimento_dificil', 'label': 'Desenvolvimento (Dificl)'},
-                    {'id': 'testes_homologacao_mapeamento', 'label': 'Testes/Homologação E Mapeamento De Erros'},
-                    {'id': 'documentacao', 'label': 'Documentação'},
-                    {'id': 'correcoes_code_review', 'label': 'Correções Code Review'},
-                ],
-                'script': [
-                    {'id': 'ler_script_conferir', 'label': 'Ler Script E Conferir Informações Do Vídeo'},
-                    {'id': 'solicitar_usuario_vm', 'label': 'Solicitar Usuário Para Acessar A Vm'},
-                    {'id': 'testes_iniciais_local', 'label': 'Testes Iniciais Na Máquina Local'},
-                    {'id': 'configurar_projeto_vm', 'label': 'Configurar Projeto Na Vm'},
-                    {'id': 'desenvolvimento_basico', 'label': 'Desenvolvimento (Básico)'},
-                    {'id': 'desenvolvimento_medio', 'label': 'Desenvolvimento (Médio)'},
-                    {'id': 'desenvolvimento_dificil', 'label': 'Desenvolvimento (Dificl)'},
-                    {'id': 'testes_homologacao_mapeamento', 'label': 'Testes/Homologação E Mapeamento De Erros'},
-                    {'id': 'documentacao', 'label': 'Documentação'},
-                    {'id': 'correcoes_code_review', 'label': 'Correções Code Review'},
-                ],
-            }
-            
-            # Obter lista de TODOs para a área do card
-            area = instance.area
-            todos_list = todos_by_area.get(area, [])
-            
-            # IDs de desenvolvimento que devem ser verificados se foram selecionados
-            development_ids = ['desenvolvimento_basico', 'desenvolvimento_medio', 'desenvolvimento_dificil']
-            
-            # Criar TODOs para todos os itens da área
-            # Todos os TODOs devem aparecer, exceto os de desenvolvimento que só aparecem se selecionados
-            order = 0
-            selected_items = instance.complexidade_selected_items or []
-            selected_development = instance.complexidade_selected_development
-            
-            for todo_item in todos_list:
-                todo_id = todo_item['id']
-                todo_label = todo_item['label']
-                
-                # Verificar se é um TODO de desenvolvimento
-                is_development = todo_id in development_ids
-                
-                # Se for desenvolvimento, verificar se foi selecionado na complexidade
-                # Se não for desenvolvimento, sempre criar
-                should_create = True
-                if is_development:
-                    # Só criar se foi selecionado em complexidade_selected_items ou complexidade_selected_development
-                    should_create = todo_id in selected_items or todo_id == selected_development
-                
-                if should_create:
-                    # Verificar se já existe para evitar duplicatas
-                    if not CardTodo.objects.filter(card=instance, label=todo_label, is_original=True).exists():
-                        CardTodo.objects.create(
-                            card=instance,
-                            label=todo_label,
-                            is_original=True,
-                            status=CardTodoStatus.PENDING,
-                            order=order,
-                        )
-                    order += 1
-                    
+            from apps.projects.models import CardTodo, CardTodoStatus, CardTodoTemplate
+
+            # Modelos que dependem da complexidade só entram se foram selecionados
+            selecionados = set(instance.complexidade_selected_items or [])
+            selecionados.add(instance.complexidade_selected_development)
+            modelos = [
+                label for codigo, label, depende_complexidade in CardTodoTemplate.modelos_por_area().get(instance.area, ())
+                if not depende_complexidade or codigo in selecionados
+            ]
+            CardTodo.objects.bulk_create([
+                CardTodo(card=instance, label=label, is_original=True, status=CardTodoStatus.PENDING, order=order)
+                for order, label in enumerate(modelos)
+            ])
         except Exception as e:
             import logging
             logger = logging.getLogger(__name__)
@@ -445,6 +227,14 @@ class CardSerializer(serializers.ModelSerializer):
         if self.context.get('request') and hasattr(self.context['request'], 'user'):
             instance._request_user = self.context['request'].user
         return super().update(instance, validated_data)
+    
+    def to_representation(self, instance):
+        # Contagens anotadas em services.anotar_cards_para_leitura descem para projeto e sprint
+        if getattr(instance, 'projeto_cards_count', None) is not None and instance.projeto:
+            instance.projeto.cards_count = instance.projeto_cards_count
+            if instance.projeto.sprint:
+                instance.projeto.sprint.projects_count = instance.sprint_projects_count
+        return super().to_representation(instance)
 
     def validate_nome(self, value):
         """
@@ -466,6 +256,30 @@ class CardSerializer(serializers.ModelSerializer):
         read_only_fields = ['created_at', 'updated_at', 'criado_por']
 
 
+class CardListSerializer(CardSerializer):
+    """
+    Representação enxuta do card para listagens (quadros, filtros, métricas).
+
+    Por padrão omite os campos caros (projeto_detail, todos, events_count); eles podem
+    ser pedidos com expand=. fields= limita a resposta às colunas informadas.
+    O retrieve continua usando o CardSerializer completo.
+    """
+    EXPANSIVEIS = ('projeto_detail', 'todos', 'events_count')
+
+    def __init__(self, *args, fields=None, expand=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        expand = set(expand or ())
+        for nome in self.EXPANSIVEIS:
+            if nome not in expand:
+                self.fields.pop(nome, None)
+        if fields:
+            # id sempre presente para o frontend conseguir identificar o card
+            manter = set(fields) | {'id'} | expand
+            for nome in list(self.fields):
+                if nome not in manter:
+                    self.fields.pop(nome)
+
+
 class EventSerializer(serializers.ModelSerializer):
     card_detail = CardSerializer(source='card', read_only=True)
     usuario_name = serializers.SerializerMethodField()
@@ -514,12 +328,118 @@ class NotificationSerializer(serializers.ModelSerializer):
         read_only_fields = ['data_criacao']
 
 
+class ArchivedCardLogSerializer(CardLogSerializer):
+    """Log arquivado: mesmos campos do CardLogSerializer, sem card_detail"""
+    card_detail = None
+
+    class Meta:
+        model = ArchivedCardLog
+        fields = ['id', 'card', 'tipo_evento', 'tipo_evento_display', 'descricao', 'usuario',
+                  'usuario_name', 'usuario_role', 'usuario_role_display', 'data', 'arquivado_em']
+        read_only_fields = fields
+
+
+class ArchivedNotificationSerializer(NotificationSerializer):
+    class Meta:
+        model = ArchivedNotification
+        fields = NotificationSerializer.Meta.fields + ['arquivada_em']
+        read_only_fields = fields
+
+
 class WeeklyPriorityConfigSerializer(serializers.ModelSerializer):
+    # Semanas fechadas recentes no formato antigo {semana_inicio: True} (somente leitura)
+    semana_fechada = serializers.SerializerMethodField()
+
+    SEMANAS_FECHADAS_EXIBIDAS = 12
+
     class Meta:
         model = WeeklyPriorityConfig
         fields = ['id', 'horario_limite', 'fechamento_automatico', 'semana_fechada', 'created_at', 'updated_at']
         read_only_fields = ['created_at', 'updated_at']
 
+    def get_semana_fechada(self, obj):
+        semanas = ClosedWeek.objects.values_list('semana_inicio', flat=True)[:self.SEMANAS_FECHADAS_EXIBIDAS]
+        return {semana.isoformat(): True for semana in semanas}
+
+
+class WeeklyPriorityPlanItemSerializer(serializers.Serializer):
+    usuario = serializers.IntegerField()
+    cards = serializers.ListField(child=serializers.IntegerField(), allow_empty=True)
+
+
+class WeeklyPriorityPlanSerializer(serializers.Serializer):
+    """
+    Plano de prioridades de uma semana: para cada usuário informado, a lista completa de cards.
+    Com substituir=True, usuários fora do plano ficam sem prioridades na semana.
+    """
+    semana_inicio = serializers.DateField(required=False)
+    substituir = serializers.BooleanField(default=False)
+    plano = WeeklyPriorityPlanItemSerializer(many=True)
+
+    def validate_semana_inicio(self, value):
+        if value.weekday() != 0:
+            raise serializers.ValidationError('semana_inicio deve ser uma segunda-feira.')
+        return value
+
+    def validate_plano(self, value):
+        usuarios = [item['usuario'] for item in value]
+        if len(usuarios) != len(set(usuarios)):
+            raise serializers.ValidationError('Cada usuário deve aparecer uma única vez no plano.')
+        # Validar todos os ids com uma consulta por tabela
+        existentes = set(User.objects.filter(id__in=usuarios).values_list('id', flat=True))
+        faltando = [u for u in usuarios if u not in existentes]
+        if faltando:
+            raise serializers.ValidationError(f'Usuário(s) não encontrado(s): {faltando}')
+        cards = {card_id for item in value for card_id in item['cards']}
+        faltando = cards - set(Card.objects.filter(id__in=cards).values_list('id', flat=True))
+        if faltando:
+            raise serializers.ValidationError(f'Card(s) não encontrado(s): {sorted(faltando)}')
+        return value
+
+
+class CardBulkOperationSerializer(serializers.Serializer):
+    """Uma operação do lote: os cards e os novos valores (ao menos um campo)"""
+    cards = serializers.ListField(child=serializers.IntegerField(), allow_empty=False)
+    status = serializers.ChoiceField(choices=CardStatus.choices, required=False)
+    prioridade = serializers.ChoiceField(choices=Priority.choices, required=False)
+    responsavel = serializers.IntegerField(required=False, allow_null=True)
+    projeto = serializers.IntegerField(required=False)
+
+    def validate(self, attrs):
+        if not {'status', 'prioridade', 'responsavel', 'projeto'} & attrs.keys():
+            raise serializers.ValidationError('Informe ao menos um campo a alterar (status, prioridade, responsavel, projeto).')
+        return attrs
+
+
+class CardBulkUpdateSerializer(serializers.Serializer):
+    """
+    Alterações em lote: {"operacoes": [{"cards": [1, 2], "status": "em_homologacao"},
+    {"cards": [3], "responsavel": 7, "prioridade": "alta"}]}. Cada card aparece em uma só operação.
+    """
+    operacoes = CardBulkOperationSerializer(many=True, allow_empty=False)
+
+    def validate_operacoes(self, value):
+        from .card_bulk import MAX_CARDS_LOTE
+
+        cards = [card_id for operacao in value for card_id in operacao['cards']]
+        if len(cards) != len(set(cards)):
+            raise serializers.ValidationError('Cada card deve aparecer uma única vez no lote.')
+        if len(cards) > MAX_CARDS_LOTE:
+            raise serializers.ValidationError(f'No máximo {MAX_CARDS_LOTE} cards por lote.')
+        # Validar todos os ids com uma consulta por tabela
+        faltando = set(cards) - set(Card.objects.filter(id__in=cards).values_list('id', flat=True))
+        if faltando:
+            raise serializers.ValidationError(f'Card(s) não encontrado(s): {sorted(faltando)}')
+        usuarios = {operacao['responsavel'] for operacao in value if operacao.get('responsavel')}
+        faltando = usuarios - set(User.objects.filter(id__in=usuarios).values_list('id', flat=True))
+        if faltando:
+            raise serializers.ValidationError(f'Usuário(s) não encontrado(s): {sorted(faltando)}')
+        projetos = {operacao['projeto'] for operacao in value if 'projeto' in operacao}
+        faltando = projetos - set(Project.objects.filter(id__in=projetos).values_list('id', flat=True))
+        if faltando:
+            raise serializers.ValidationError(f'Projeto(s) não encontrado(s): {sorted(faltando)}')
+        return value
+
 
 class WeeklyPrioritySerializer(serializers.ModelSerializer):
     card_detail = CardSerializer(source='card', read_only=True)
@@ -1,40 +1,48 @@
 """
 Serviços de negócio para o app projects.
 """
+import time
+from datetime import timedelta
+
 from django.utils import timezone
-from django.db import transaction
+from django.db.models import Q, Case, When, Value, CharField, BooleanField, Exists, OuterRef, Subquery, Count, IntegerField
+from django.db.models.functions import Coalesce
 
-from .models import Sprint, Project, Card, CardStatus, ProjectStatus
+from .models import (
+    Project, Card, CardStatus, Event, Notification, NotificationType, SprintRolloverStatus, WeeklyPriorityConfig,
+)
+from .notification_utils import deliver_notifications
+from .rollover import get_proxima_sprint, replicar_sprint
 
 
-def get_proxima_sprint(sprint):
-    """
-    Retorna a sprint de destino para replicação: sprint em andamento ou
-    a próxima por data_inicio. Retorna None se não houver.
-    """
-    hoje = timezone.now().date()
-    # 1) Sprint em andamento: data_inicio <= hoje <= data_fim
-    em_andamento = Sprint.objects.filter(
-        data_inicio__lte=hoje,
-        data_fim__gte=hoje,
-    ).exclude(pk=sprint.pk).order_by('data_inicio').first()
-    if em_andamento:
-        return em_andamento
-    # 2) Próxima por data_inicio (primeira com data_inicio > data_fim da sprint que está finalizando)
-    proxima = Sprint.objects.filter(
-        data_inicio__gt=sprint.data_fim,
-    ).order_by('data_inicio').first()
-    return proxima
-
-
-def finalizar_sprint_replicacao(sprint, criado_por_user=None):
+# Janelas de alerta de prazo: (tipo, início, fim, título, texto), com início/fim
+# relativos a "agora". Início None significa "qualquer data anterior ao fim" (atraso).
+JANELAS_PRAZO = [
+    (NotificationType.CARD_OVERDUE, None, timedelta(0),
+     'Card Atrasado', 'está atrasado'),
+    (NotificationType.CARD_DUE_24H, timedelta(hours=23, minutes=50), timedelta(hours=24, minutes=10),
+     'Card Vence em 24 Horas', 'vence em 24 horas'),
+    (NotificationType.CARD_DUE_1H, timedelta(minutes=50), timedelta(hours=1, minutes=10),
+     'Card Vence em 1 Hora', 'vence em 1 hora'),
+    (NotificationType.CARD_DUE_10MIN, timedelta(minutes=5), timedelta(minutes=15),
+     'Card Vence em 10 Minutos', 'vence em 10 minutos'),
+]
+
+# Não repetir o mesmo alerta para um card dentro deste intervalo
+INTERVALO_REPETICAO_ALERTA = timedelta(hours=2)
+
+
+def finalizar_sprint_replicacao(sprint, criado_por_user=None, copiar_todos=None, max_lotes=None):
     """
     Executa a lógica de finalização: replica projetos com cards não entregues
-    para a próxima sprint e marca a sprint como finalizada.
+    para a próxima sprint (em lotes, ver rollover.py) e marca a sprint como finalizada.
+    Se uma finalização anterior foi interrompida, retoma do último lote gravado.
+    max_lotes limita os lotes copiados nesta chamada (a task continua em outra execução).
 
     Retorno:
-    - dict com 'proxima_sprint_id', 'proxima_sprint_nome', 'projetos_criados', 'cards_copiados'
-      (e opcionalmente 'ja_finalizada': True se já estava finalizada)
+    - dict com 'proxima_sprint_id', 'proxima_sprint_nome', 'projetos_criados', 'cards_copiados',
+      'todos_copiados' (e opcionalmente 'ja_finalizada': True se já estava finalizada, ou
+      'em_andamento': True se parou em max_lotes antes de concluir)
     - None se não houver próxima sprint (não altera finalizada nesse caso;
       o caller pode marcar finalizada na task e retornar 400 na view).
     """
@@ -43,60 +51,159 @@ def finalizar_sprint_replicacao(sprint, criado_por_user=None):
             'ja_finalizada': True,
             'projetos_criados': 0,
             'cards_copiados': 0,
+            'todos_copiados': 0,
         }
 
-    proxima = get_proxima_sprint(sprint)
-    if proxima is None:
+    rollover = replicar_sprint(
+        sprint, criado_por_user=criado_por_user, copiar_todos=copiar_todos, max_lotes=max_lotes
+    )
+    if rollover is None:
         return None
 
-    nao_entregues = [CardStatus.FINALIZADO, CardStatus.INVIABILIZADO]
-
-    with transaction.atomic():
-        projetos_criados = 0
-        cards_copiados = 0
-
-        for project in sprint.projects.all():
-            cards_pendentes = project.cards.exclude(status__in=nao_entregues)
-            if not cards_pendentes.exists():
-                continue
-
-            novo_projeto = Project.objects.create(
-                nome=project.nome,
-                descricao=project.descricao or '',
-                sprint=proxima,
-                gerente_atribuido=project.gerente_atribuido,
-                desenvolvedor=project.desenvolvedor,
-                status=ProjectStatus.CRIADO,
-            )
-            projetos_criados += 1
-
-            for card in cards_pendentes:
-                Card.objects.create(
-                    nome=card.nome,
-                    descricao=card.descricao or '',
-                    script_url=card.script_url,
-                    projeto=novo_projeto,
-                    area=card.area,
-                    tipo=card.tipo,
-                    responsavel=card.responsavel,
-                    criado_por=criado_por_user or card.criado_por,
-                    status=card.status,
-                    prioridade=card.prioridade,
-                    data_inicio=card.data_inicio,
-                    data_fim=card.data_fim,
-                    complexidade_selected_items=card.complexidade_selected_items or [],
-                    complexidade_selected_development=card.complexidade_selected_development or '',
-                    complexidade_custom_items=card.complexidade_custom_items or [],
-                    card_comment=card.card_comment or '',
-                )
-                cards_copiados += 1
-
-        sprint.finalizada = True
-        sprint.save(update_fields=['finalizada', 'updated_at'])
+    resultado = {
+        'proxima_sprint_id': str(rollover.sprint_destino_id),
+        'proxima_sprint_nome': rollover.sprint_destino.nome,
+        'projetos_criados': rollover.projetos_criados,
+        'cards_copiados': rollover.cards_copiados,
+        'todos_copiados': rollover.todos_copiados,
+    }
+    if rollover.status != SprintRolloverStatus.CONCLUIDA:
+        resultado['em_andamento'] = True
+    return resultado
+
+
+def verificar_prazos_cards(now=None):
+    """
+    Verifica os prazos de todos os cards abertos de forma set-based.
+
+    Uma única consulta seleciona os cards dentro de alguma janela de alerta
+    (atrasado, 24h, 1h, 10min), classifica cada um na sua janela e descarta,
+    via anti-join com Notification, os que já receberam o mesmo alerta nas
+    últimas horas. As notificações resultantes são criadas com bulk_create.
+
+    Retorno: dict com 'cards_alertados', 'notificacoes_criadas' e 'duracao_ms'.
+    """
+    inicio = time.monotonic()
+    now = now or timezone.now()
+
+    filtro_janelas = Q()
+    classificacao = []
+    for tipo, inicio_janela, fim_janela, _titulo, _texto in JANELAS_PRAZO:
+        if inicio_janela is None:
+            condicao = Q(data_fim__lt=now + fim_janela)
+        else:
+            condicao = Q(data_fim__gte=now + inicio_janela, data_fim__lte=now + fim_janela)
+        filtro_janelas |= condicao
+        classificacao.append(When(condicao, then=Value(tipo)))
+
+    ja_notificado = Notification.objects.filter(
+        card_id=OuterRef('pk'),
+        tipo=OuterRef('janela'),
+        data_criacao__gte=now - INTERVALO_REPETICAO_ALERTA,
+    )
+
+    cards = (
+        Card.objects.filter(data_fim__isnull=False)
+        .exclude(status__in=[CardStatus.FINALIZADO, CardStatus.INVIABILIZADO])
+        .filter(filtro_janelas)
+        .annotate(janela=Case(*classificacao, output_field=CharField()))
+        .filter(~Exists(ja_notificado))
+        .select_related('projeto')
+        .only('id', 'nome', 'data_fim', 'responsavel_id', 'projeto__id', 'projeto__nome', 'projeto__gerente_atribuido_id')
+    )
+
+    textos = {tipo: (titulo, texto) for tipo, _i, _f, titulo, texto in JANELAS_PRAZO}
+    notificacoes = []
+    cards_alertados = 0
+    for card in cards:
+        cards_alertados += 1
+        titulo, texto = textos[card.janela]
+        user_ids = {card.responsavel_id, card.projeto.gerente_atribuido_id} - {None}
+        for user_id in user_ids:
+            notificacoes.append(Notification(
+                usuario_id=user_id,
+                tipo=card.janela,
+                titulo=titulo,
+                mensagem=f'O card "{card.nome}" {texto}. Data de entrega: {card.data_fim.strftime("%d/%m/%Y %H:%M")}',
+                card_id=card.id,
+                project_id=card.projeto.id,
+                metadata={
+                    'card_nome': card.nome,
+                    'project_nome': card.projeto.nome,
+                    'data_fim': card.data_fim.isoformat()
+                }
+            ))
+
+    deliver_notifications(notificacoes)
 
     return {
-        'proxima_sprint_id': str(proxima.id),
-        'proxima_sprint_nome': proxima.nome,
-        'projetos_criados': projetos_criados,
-        'cards_copiados': cards_copiados,
+        'cards_alertados': cards_alertados,
+        'notificacoes_criadas': len(notificacoes),
+        'duracao_ms': round((time.monotonic() - inicio) * 1000, 1),
     }
+
+
+def _contagem_relacionada(model, campo, ref):
+    """Subquery correlacionada com COUNT(*) de model onde campo = ref (0 quando não há linhas)"""
+    contagem = (
+        model.objects.filter(**{campo: OuterRef(ref)})
+        .order_by()
+        .values(campo)
+        .annotate(total=Count('pk'))
+        .values('total')[:1]
+    )
+    return Coalesce(Subquery(contagem, output_field=IntegerField()), 0)
+
+
+def anotar_cards_para_leitura(queryset, projeto=True, todos=True, eventos=True):
+    """
+    Prepara um queryset de cards com o que o CardSerializer lê, em número fixo de
+    consultas: relacionamentos via JOIN, TODOs via prefetch e as contagens
+    (eventos do card, cards do projeto, projetos da sprint) como subqueries anotadas.
+
+    projeto/todos/eventos permitem pular as partes que a resposta não vai exibir.
+    As contagens de projeto/sprint ficam no card e o CardSerializer as repassa.
+    """
+    queryset = queryset.select_related('responsavel', 'criado_por', 'projeto')
+    if projeto:
+        queryset = queryset.select_related(
+            'projeto__gerente_atribuido', 'projeto__desenvolvedor',
+            'projeto__sprint', 'projeto__sprint__supervisor',
+        ).annotate(
+            projeto_cards_count=_contagem_relacionada(Card, 'projeto', 'projeto_id'),
+            sprint_projects_count=_contagem_relacionada(Project, 'sprint', 'projeto__sprint_id'),
+        )
+    if todos:
+        queryset = queryset.prefetch_related('todos')
+    if eventos:
+        queryset = queryset.annotate(events_count=_contagem_relacionada(Event, 'card', 'pk'))
+    return queryset
+
+
+def carregar_cards_para_leitura(queryset):
+    """Avalia o queryset de cards já com tudo que o CardSerializer completo precisa"""
+    return list(anotar_cards_para_leitura(queryset))
+
+
+def _booleano(condicao):
+    return Case(When(condicao, then=Value(True)), default=Value(False), output_field=BooleanField())
+
+
+def anotar_situacao_prioridades(queryset, agora=None):
+    """
+    Anota concluido_anotado e atrasado_anotado em prioridades semanais, calculados no SQL.
+
+    Mesma regra de WeeklyPriority.is_atrasado(): atrasada se o card não foi concluído e
+    já passou semana_fim no horário limite da configuração (no fuso atual). Como o horário
+    limite é o mesmo para todas as linhas, a comparação vira um filtro por data.
+    """
+    agora = timezone.localtime(agora or timezone.now())
+    horario_limite = WeeklyPriorityConfig.get_config().horario_limite
+    prazo_vencido = Q(semana_fim__lt=agora.date())
+    if agora.time() > horario_limite:
+        prazo_vencido |= Q(semana_fim=agora.date())
+    concluido = Q(card__status=CardStatus.FINALIZADO)
+    return queryset.annotate(
+        concluido_anotado=_booleano(concluido),
+        atrasado_anotado=_booleano(~concluido & prazo_vencido),
+    )
@@ -1,14 +1,19 @@
 import logging
-from celery import shared_task
-from datetime import datetime, timedelta, time
+from celery import chord, shared_task
+from datetime import timedelta
 from django.utils import timezone
-from django.db.models import Q
-from .models import Card, Notification, NotificationType, Sprint, WeeklyPriorityConfig
-from .notification_utils import send_notification
-from .services import finalizar_sprint_replicacao
+from .models import Sprint, WeeklyPriorityConfig
+from .services import finalizar_sprint_replicacao, verificar_prazos_cards
+from .rollover import encadear_sprints
+from .outbox import processar_outbox
+from .retention import aplicar_retencao
+from .notification_utils import reconciliar_contadores_nao_lidas
 
 logger = logging.getLogger(__name__)
 
+# Lotes de cards (rollover.TAMANHO_LOTE cada) copiados por execução de finalizar_sprints_encadeadas
+LOTES_POR_TAREFA = 10
+
 
 @shared_task
 def check_card_deadlines():
@@ -16,146 +21,15 @@ def check_card_deadlines():
     Verifica cards com data_fim próxima e cria notificações de alerta.
     Roda a cada minuto.
     """
-    now = timezone.now()
-    
-    # Buscar cards com data_fim definida e que não estão finalizados/inviabilizados
-    cards = Card.objects.filter(
-        data_fim__isnull=False,
-    ).exclude(
-        status__in=['finalizado', 'inviabilizado']
-    ).select_related('responsavel', 'projeto', 'projeto__gerente_atribuido')
-    
-    for card in cards:
-        if not card.data_fim:
-            continue
-        
-        time_remaining = card.data_fim - now
-        
-        # Verificar se já existe notificação do mesmo tipo criada recentemente (últimas 2 horas)
-        recent_threshold = now - timedelta(hours=2)
-        
-        # Card atrasado
-        if card.data_fim < now:
-            # Verificar se já existe notificação de atraso recente
-            existing = Notification.objects.filter(
-                card_id=card.id,
-                tipo=NotificationType.CARD_OVERDUE,
-                data_criacao__gte=recent_threshold
-            ).exists()
-            
-            if not existing:
-                user_ids = []
-                if card.responsavel:
-                    user_ids.append(card.responsavel.id)
-                if card.projeto.gerente_atribuido:
-                    user_ids.append(card.projeto.gerente_atribuido.id)
-                
-                for user_id in user_ids:
-                    send_notification(
-                        user_id=user_id,
-                        tipo=NotificationType.CARD_OVERDUE,
-                        titulo='Card Atrasado',
-                        mensagem=f'O card "{card.nome}" está atrasado. Data de entrega: {card.data_fim.strftime("%d/%m/%Y %H:%M")}',
-                        card_id=card.id,
-                        project_id=card.projeto.id,
-                        metadata={
-                            'card_nome': card.nome,
-                            'project_nome': card.projeto.nome,
-                            'data_fim': card.data_fim.isoformat()
-                        }
-                    )
-        
-        # Faltam 24 horas
-        elif timedelta(hours=23, minutes=50) <= time_remaining <= timedelta(hours=24, minutes=10):
-            existing = Notification.objects.filter(
-                card_id=card.id,
-                tipo=NotificationType.CARD_DUE_24H,
-                data_criacao__gte=recent_threshold
-            ).exists()
-            
-            if not existing:
-                user_ids = []
-                if card.responsavel:
-                    user_ids.append(card.responsavel.id)
-                if card.projeto.gerente_atribuido:
-                    user_ids.append(card.projeto.gerente_atribuido.id)
-                
-                for user_id in user_ids:
-                    send_notification(
-                        user_id=user_id,
-                        tipo=NotificationType.CARD_DUE_24H,
-                        titulo='Card Vence em 24 Horas',
-                        mensagem=f'O card "{card.nome}" vence em 24 horas. Data de entrega: {card.data_fim.strftime("%d/%m/%Y %H:%M")}',
-                        card_id=card.id,
-                        project_id=card.projeto.id,
-                        metadata={
-                            'card_nome': card.nome,
-                            'project_nome': card.projeto.nome,
-                            'data_fim': card.data_fim.isoformat()
-                        }
-                    )
-        
-        # Faltam 1 hora
-        elif timedelta(minutes=50) <= time_remaining <= timedelta(hours=1, minutes=10):
-            existing = Notification.objects.filter(
-                card_id=card.id,
-                tipo=NotificationType.CARD_DUE_1H,
-                data_criacao__gte=recent_threshold
-            ).exists()
-            
-            if not existing:
-                user_ids = []
-                if card.responsavel:
-                    user_ids.append(card.responsavel.id)
-                if card.projeto.gerente_atribuido:
-                    user_ids.append(card.projeto.gerente_atribuido.id)
-                
-                for user_id in user_ids:
-                    send_notification(
-                        user_id=user_id,
-                        tipo=NotificationType.CARD_DUE_1H,
-                        titulo='Card Vence em 1 Hora',
-                        mensagem=f'O card "{card.nome}" vence em 1 hora. Data de entrega: {card.data_fim.strftime("%d/%m/%Y %H:%M")}',
-                        card_id=card.id,
-                        project_id=card.projeto.id,
-                        metadata={
-                            'card_nome': card.nome,
-                            'project_nome': card.projeto.nome,
-                            'data_fim': card.data_fim.isoformat()
-                        }
-                    )
-        
-        # Faltam 10 minutos
-        elif timedelta(minutes=5) <= time_remaining <= timedelta(minutes=15):
-            existing = Notification.objects.filter(
-                card_id=card.id,
-                tipo=NotificationType.CARD_DUE_10MIN,
-                data_criacao__gte=recent_threshold
-            ).exists()
-            
-            if not existing:
-                user_ids = []
-                if card.responsavel:
-                    user_ids.append(card.responsavel.id)
-                if card.projeto.gerente_atribuido:
-                    user_ids.append(card.projeto.gerente_atribuido.id)
-                
-                for user_id in user_ids:
-                    send_notification(
-                        user_id=user_id,
-                        tipo=NotificationType.CARD_DUE_10MIN,
-                        titulo='Card Vence em 10 Minutos',
-                        mensagem=f'O card "{card.nome}" vence em 10 minutos. Data de entrega: {card.data_fim.strftime("%d/%m/%Y %H:%M")}',
-                        card_id=card.id,
-                        project_id=card.projeto.id,
-                        metadata={
-                            'card_nome': card.nome,
-                            'project_nome': card.projeto.nome,
-                            'data_fim': card.data_fim.isoformat()
-                        }
-                    )
-    
-    return f'Verificados {cards.count()} cards'
+    resultado = verificar_prazos_cards()
+    logger.info(
+        'Verificação de prazos: %s cards alertados, %s notificações criadas em %sms',
+        resultado['cards_alertados'], resultado['notificacoes_criadas'], resultado['duracao_ms']
+    )
+    return (
+        f"Alertados {resultado['cards_alertados']} cards, "
+        f"{resultado['notificacoes_criadas']} notificações criadas em {resultado['duracao_ms']}ms"
+    )
 
 
 @shared_task
@@ -203,21 +77,122 @@ def finalizar_sprints_por_data():
     """
     Finaliza sprints cuja data_fim já passou: executa a replicação de projetos
     com cards não entregues para a próxima sprint. Roda uma vez por dia (Beat).
+
+    As sprints são separadas em grupos independentes (rollover.encadear_sprints): quando
+    o destino de uma sprint vencida é outra sprint vencida, as duas são finalizadas em
+    sequência, em ordem de data_fim, para o trabalho pendente seguir em cascata. Cada grupo
+    vira uma sub-task (em paralelo nos workers) e um chord junta os resultados. O progresso
+    de cada sprint fica em SprintRollover, então uma sub-task repetida ou interrompida
+    retoma do último lote sem duplicar projetos nem cards.
     """
     hoje = timezone.now().date()
-    sprints = Sprint.objects.filter(data_fim__lt=hoje, finalizada=False).order_by('data_fim')
-    processadas = 0
-    sem_destino = 0
-    for sprint in sprints:
-        result = finalizar_sprint_replicacao(sprint, criado_por_user=None)
-        if result is None:
-            sprint.finalizada = True
-            sprint.save(update_fields=['finalizada', 'updated_at'])
-            logger.warning(
-                'Sprint %s (%s) finalizada por data mas nenhuma sprint de destino encontrada.',
-                sprint.nome, sprint.id
-            )
-            sem_destino += 1
-        else:
-            processadas += 1
-    return f'Sprints finalizadas por data: {processadas} replicadas, {sem_destino} sem destino.'
+    sprints = list(Sprint.objects.filter(data_fim__lt=hoje, finalizada=False).order_by('data_fim', 'id'))
+    if not sprints:
+        return 'Nenhuma sprint para finalizar por data.'
+    grupos = encadear_sprints(sprints)
+
+    try:
+        chord(finalizar_sprints_encadeadas.s(grupo) for grupo in grupos)(resumir_finalizacao_sprints.s())
+    except Exception as e:
+        # Sem broker/result backend: processar em sequência neste worker
+        logger.warning(f'Nao foi possivel disparar o chord de finalizacao ({e}). Processando em sequencia.')
+        return resumir_finalizacao_sprints([
+            [_finalizar_sprint_por_data(sprint_id) for sprint_id in grupo] for grupo in grupos
+        ])
+    return f'{len(sprints)} sprint(s) em {len(grupos)} grupo(s) enviada(s) para finalização.'
+
+
+def _finalizar_sprint_por_data(sprint_id, max_lotes=None):
+    sprint = Sprint.objects.filter(pk=sprint_id).first()
+    if sprint is None or sprint.finalizada:
+        return {'sprint_id': sprint_id, 'situacao': 'ja_finalizada'}
+
+    result = finalizar_sprint_replicacao(sprint, criado_por_user=None, max_lotes=max_lotes)
+    if result is None:
+        sprint.finalizada = True
+        sprint.save(update_fields=['finalizada', 'updated_at'])
+        logger.warning(
+            'Sprint %s (%s) finalizada por data mas nenhuma sprint de destino encontrada.',
+            sprint.nome, sprint.id
+        )
+        return {'sprint_id': sprint_id, 'situacao': 'sem_destino'}
+    if result.get('em_andamento'):
+        return {'sprint_id': sprint_id, 'situacao': 'em_andamento'}
+    return {'sprint_id': sprint_id, 'situacao': 'replicada', **result}
+
+
+@shared_task(bind=True, acks_late=True, autoretry_for=(Exception,), retry_backoff=True, max_retries=5)
+def finalizar_sprints_encadeadas(self, sprint_ids, resultados=None):
+    """
+    Finaliza, em ordem, um grupo de sprints encadeadas. Cada execução copia no máximo
+    LOTES_POR_TAREFA lotes e se substitui (Task.replace, que mantém a posição no chord)
+    por uma nova execução com o que falta: uma sprint enorme não prende um worker pela
+    janela inteira. Com acks_late, se o worker morrer no meio a mensagem volta para a
+    fila, e a nova execução continua do checkpoint da replicação.
+    """
+    resultados = list(resultados or [])
+    resultado = _finalizar_sprint_por_data(sprint_ids[0], max_lotes=LOTES_POR_TAREFA)
+    if resultado['situacao'] == 'em_andamento':
+        restantes = sprint_ids
+    else:
+        resultados.append(resultado)
+        restantes = sprint_ids[1:]
+    if restantes:
+        return self.replace(finalizar_sprints_encadeadas.si(restantes, resultados))
+    return resultados
+
+
+@shared_task
+def resumir_finalizacao_sprints(resultados):
+    """Callback do chord: consolida o resultado das sub-tasks de finalização (uma lista por grupo)"""
+    resultados = [r for grupo in resultados for r in grupo or []]
+    situacoes = [r.get('situacao') for r in resultados if r]
+    cards = sum(r.get('cards_copiados', 0) for r in resultados if r)
+    mensagem = (
+        f"Sprints finalizadas por data: {situacoes.count('replicada')} replicadas "
+        f"({cards} cards), {situacoes.count('sem_destino')} sem destino, "
+        f"{situacoes.count('ja_finalizada')} já finalizadas."
+    )
+    logger.info(mensagem)
+    return mensagem
+
+
+@shared_task
+def processar_outbox_notificacoes():
+    """
+    Entrega as notificações registradas na outbox pelos signals.
+    Disparada após o commit de cada evento e, como garantia, periodicamente pelo Beat.
+    """
+    total = 0
+    # Limitar o número de lotes por execução para não prender o worker indefinidamente
+    for _ in range(50):
+        processados = processar_outbox()
+        if not processados:
+            break
+        total += processados
+    return f'Eventos da outbox processados: {total}'
+
+
+@shared_task
+def reconciliar_contadores_notificacoes():
+    """
+    Recalcula os contadores de não lidas a partir da tabela de notificações
+    e corrige divergências. Roda a cada hora.
+    """
+    corrigidos = reconciliar_contadores_nao_lidas()
+    if corrigidos:
+        logger.warning(f'Contadores de notificações: {corrigidos} corrigidos na reconciliação')
+    return f'{corrigidos} contadores corrigidos'
+
+
+@shared_task
+def arquivar_historico():
+    """
+    Move notificações lidas antigas e logs de sprints finalizadas para as tabelas de
+    arquivo e apaga eventos já entregues da outbox (ver retention.py). Roda uma vez por dia.
+    """
+    resultado = aplicar_retencao()
+    return (
+        f"{resultado['notificacoes_arquivadas']} notificações e {resultado['logs_arquivados']} logs arquivados, "
+        f"{resultado['outbox_removidos']} eventos da outbox removidos"
+    )
@@ -1,3 +1,923 @@
-from django.test import TestCase
+import tempfile
+from datetime import date, datetime, time, timedelta
+from unittest import mock
 
-# Create your tests here.
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from kombu.exceptions import OperationalError
+
+from apps.accounts.models import User
+from config.celery import app as celery_app
+from . import card_bulk, notification_utils, outbox, recipients, retention, rollover, signals, tasks
+from .conditional import gerar_etag, versao_cards
+from .models import (
+    Sprint, Project, Card, CardTodo, Event, EventType, Notification, NotificationCounter, NotificationOutbox,
+    NotificationType, OutboxEventType, SprintRollover, SprintRolloverStatus, WeeklyPriority, WeeklyPriorityConfig,
+    CardTodoTemplate, CardStatus, CardLog, CardLogEventType, CardTodoStatus, ArchivedCardLog, ArchivedNotification,
+)
+from .notification_utils import deliver_notifications, marcar_todas_como_lidas
+from .services import JANELAS_PRAZO, anotar_situacao_prioridades, verificar_prazos_cards
+
+
+def criar_sprint(nome, data_inicio=date(2026, 1, 5), data_fim=date(2026, 1, 16)):
+    supervisor, _ = User.objects.get_or_create(username=f'supervisor_{nome}', defaults={'role': 'supervisor'})
+    return Sprint.objects.create(
+        nome=f'Sprint {nome}', data_inicio=data_inicio, data_fim=data_fim,
+        duracao_dias=(data_fim - data_inicio).days + 1, supervisor=supervisor,
+    )
+
+
+def criar_projeto(nome='Projeto', sprint=None, **kwargs):
+    """Sprint + projeto mínimos para os testes"""
+    return Project.objects.create(nome=nome, sprint=sprint or criar_sprint(nome), **kwargs)
+
+
+def criar_cards(projeto, *status, **kwargs):
+    """Um card por status informado, sem disparar o worker da outbox"""
+    with mock.patch('celery.app.task.Task.apply_async'):
+        return [
+            Card.objects.create(nome=f'Card {indice}', projeto=projeto, status=situacao, **kwargs)
+            for indice, situacao in enumerate(status)
+        ]
+
+
+class OutboxEntregaTests(TestCase):
+    """Entrega das notificações registradas na outbox após o commit"""
+
+    def setUp(self):
+        outbox._broker['falhou_em'] = None
+        self.addCleanup(outbox._broker.update, falhou_em=None)
+        self.responsavel = User.objects.create(username='dev', role='desenvolvedor')
+        self.projeto = criar_projeto()
+
+    def criar_card(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            return Card.objects.create(nome='Card', projeto=self.projeto, responsavel=self.responsavel)
+
+    @override_settings(NOTIFICATION_OUTBOX_SINCRONO=True)
+    def test_modo_sincrono_entrega_na_requisicao(self):
+        with mock.patch('celery.app.task.Task.apply_async') as apply_async:
+            self.criar_card()
+        apply_async.assert_not_called()
+        self.assertTrue(Notification.objects.filter(usuario=self.responsavel, titulo='Novo Card Atribuído').exists())
+        self.assertFalse(NotificationOutbox.objects.filter(processado_em__isnull=True).exists())
+
+    def test_enfileira_no_worker_sem_retentativas(self):
+        with mock.patch('celery.app.task.Task.apply_async') as apply_async:
+            self.criar_card()
+        apply_async.assert_called_once()
+        opcoes = apply_async.call_args.kwargs
+        self.assertIs(opcoes['retry'], False)
+        self.assertIs(opcoes['ignore_result'], True)
+        # Quem entrega é o worker: o evento continua pendente
+        self.assertFalse(Notification.objects.exists())
+        self.assertTrue(NotificationOutbox.objects.filter(processado_em__isnull=True).exists())
+
+        outbox.processar_outbox()
+        self.assertTrue(Notification.objects.filter(usuario=self.responsavel).exists())
+
+    def test_sem_broker_entrega_na_requisicao_e_nao_tenta_de_novo(self):
+        with mock.patch('celery.app.task.Task.apply_async', side_effect=OperationalError('sem broker')) as apply_async:
+            self.criar_card()
+            self.criar_card()
+        # A segunda escrita não paga outra tentativa de conexão
+        apply_async.assert_called_once()
+        self.assertEqual(Notification.objects.filter(usuario=self.responsavel, titulo='Novo Card Atribuído').count(), 2)
+        self.assertFalse(NotificationOutbox.objects.filter(processado_em__isnull=True).exists())
+
+
+class ResumoTodosTests(TestCase):
+    """Alterações de TODOs do mesmo card agrupadas na janela NOTIFICACAO_TODOS_JANELA_SEGUNDOS"""
+
+    def setUp(self):
+        outbox._broker['falhou_em'] = None
+        self.addCleanup(outbox._broker.update, falhou_em=None)
+        self.gerente = User.objects.create(username='gerente', role='gerente')
+        projeto = criar_projeto(gerente_atribuido=self.gerente)
+        with mock.patch('celery.app.task.Task.apply_async'), self.captureOnCommitCallbacks(execute=True):
+            self.card = Card.objects.create(nome='Card', projeto=projeto)
+        outbox.processar_outbox()
+        Notification.objects.all().delete()
+
+    def criar_todos(self, quantidade):
+        with self.captureOnCommitCallbacks(execute=True):
+            for indice in range(quantidade):
+                CardTodo.objects.create(card=self.card, label=f'TODO {indice}')
+
+    def test_janela_agenda_o_worker_e_entrega_um_resumo(self):
+        with mock.patch('celery.app.task.Task.apply_async') as apply_async:
+            self.criar_todos(3)
+        # Um agendamento para a janela inteira, para quando ela fechar
+        apply_async.assert_called_once()
+        self.assertGreater(apply_async.call_args.kwargs['countdown'], 0)
+
+        outbox.processar_outbox()
+        self.assertFalse(Notification.objects.exists())
+
+        NotificationOutbox.objects.filter(processado_em__isnull=True).update(disponivel_em=timezone.now())
+        outbox.processar_outbox()
+        resumo = Notification.objects.get(usuario=self.gerente)
+        self.assertEqual(resumo.titulo, 'TODOs Atualizados')
+        self.assertEqual(resumo.metadata['resumo'][OutboxEventType.CARD_TODO_CREATED], 3)
+
+    def test_sem_broker_a_janela_e_entregue_na_requisicao(self):
+        with mock.patch('celery.app.task.Task.apply_async', side_effect=OperationalError('sem broker')):
+            self.criar_todos(3)
+        self.assertFalse(NotificationOutbox.objects.filter(processado_em__isnull=True).exists())
+        self.assertTrue(Notification.objects.filter(usuario=self.gerente).exists())
+
+
+class ListagemProjetosCacheTests(TestCase):
+    """Contagem de cards da listagem de projetos em cache"""
+
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.origem = criar_projeto('Origem')
+        self.destino = criar_projeto('Destino')
+        self.client.force_login(self.origem.sprint.supervisor)
+        with mock.patch('celery.app.task.Task.apply_async'), self.captureOnCommitCallbacks(execute=True):
+            self.card = Card.objects.create(nome='Card', projeto=self.origem)
+
+    def contagens(self):
+        resposta = self.client.get('/api/projects/')
+        self.assertEqual(resposta.status_code, 200)
+        dados = resposta.json()
+        return {projeto['nome']: projeto['cards_count'] for projeto in dados.get('results', dados)}
+
+    def test_mover_card_de_projeto_atualiza_a_contagem(self):
+        self.assertEqual(self.contagens(), {'Origem': 1, 'Destino': 0})
+
+        card = Card.objects.get(pk=self.card.pk)
+        card.projeto = self.destino
+        with mock.patch('celery.app.task.Task.apply_async'), self.captureOnCommitCallbacks(execute=True):
+            card.save()
+        self.assertEqual(self.contagens(), {'Origem': 0, 'Destino': 1})
+
+
+class VersaoCondicionalTests(TestCase):
+    """Versões usadas no ETag das listagens de cards e prioridades"""
+
+    def setUp(self):
+        self.projeto = criar_projeto()
+        self.usuario = self.projeto.sprint.supervisor
+        with mock.patch('celery.app.task.Task.apply_async'), self.captureOnCommitCallbacks(execute=True):
+            self.card = Card.objects.create(nome='Card', projeto=self.projeto)
+            CardTodo.objects.bulk_create([CardTodo(card=self.card, label=f'TODO {indice}') for indice in range(3)])
+            Event.objects.bulk_create([
+                Event(card=self.card, tipo=EventType.COMENTARIO, descricao=f'Evento {indice}', usuario=self.usuario)
+                for indice in range(2)
+            ])
+
+    def test_todos_e_eventos_agregados_sem_produto_cartesiano(self):
+        with CaptureQueriesContext(connection) as consultas:
+            versao = versao_cards(Card.objects.filter(projeto=self.projeto))
+        self.assertEqual((versao['total'], versao['todos_total'], versao['eventos_total']), (1, 3, 2))
+        for consulta in consultas.captured_queries:
+            sql = consulta['sql']
+            self.assertFalse(
+                CardTodo._meta.db_table in sql and Event._meta.db_table in sql,
+                f'TODOs e eventos na mesma consulta: {sql}'
+            )
+
+    def test_listagem_valida_so_pelo_etag(self):
+        self.client.force_login(self.usuario)
+        url = f'/api/cards/?projeto={self.projeto.id}'
+        resposta = self.client.get(url)
+        self.assertEqual(resposta.status_code, 200)
+        self.assertFalse(resposta.has_header('Last-Modified'))
+        etag = resposta['ETag']
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        # A remoção não muda nenhum updated_at: If-Modified-Since não pode responder 304
+        with mock.patch('celery.app.task.Task.apply_async'):
+            CardTodo.objects.filter(card=self.card).first().delete()
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+        self.assertEqual(self.client.get(url, HTTP_IF_MODIFIED_SINCE='Fri, 01 Jan 2100 00:00:00 GMT').status_code, 200)
+
+    def test_versao_muda_ao_registrar_evento(self):
+        antes = versao_cards(Card.objects.filter(projeto=self.projeto))
+        Event.objects.create(card=self.card, tipo=EventType.COMENTARIO, descricao='Outro', usuario=self.usuario)
+        self.assertNotEqual(gerar_etag(antes), gerar_etag(versao_cards(Card.objects.filter(projeto=self.projeto))))
+
+
+class ContadoresNaoLidasTests(TestCase):
+    """Contadores de não lidas (NotificationCounter) mantidos junto com as notificações"""
+
+    def setUp(self):
+        self.usuario = User.objects.create(username='leitor', role='desenvolvedor')
+
+    def entregar(self, quantidade=1):
+        return deliver_notifications([
+            Notification(usuario=self.usuario, tipo=NotificationType.CARD_CREATED, titulo='Aviso', mensagem='Aviso')
+            for _ in range(quantidade)
+        ])
+
+    def contador(self):
+        return NotificationCounter.objects.values_list('nao_lidas', 'nao_lidas_minhas').get(usuario=self.usuario)
+
+    def test_marcar_todas_como_lidas_zera_o_contador(self):
+        self.entregar(3)
+        self.assertEqual(marcar_todas_como_lidas(self.usuario.id), 3)
+        self.assertEqual(self.contador(), (0, 0))
+        self.assertFalse(Notification.objects.filter(usuario=self.usuario, lida=False).exists())
+
+    def test_entrega_envia_pelo_websocket_so_apos_o_commit(self):
+        with mock.patch.object(notification_utils, 'broadcast_notifications') as broadcast:
+            with self.captureOnCommitCallbacks(execute=True):
+                criadas = self.entregar(2)
+                broadcast.assert_not_called()
+            broadcast.assert_called_once_with(criadas)
+        self.assertEqual(self.contador(), (2, 2))
+
+    def test_falha_no_contador_desfaz_o_insert_e_nao_envia(self):
+        with mock.patch.object(notification_utils, 'broadcast_notifications') as broadcast, \
+                mock.patch.object(notification_utils, 'incrementar_contadores_nao_lidas', side_effect=RuntimeError):
+            with self.captureOnCommitCallbacks(execute=True), self.assertRaises(RuntimeError):
+                self.entregar(2)
+        broadcast.assert_not_called()
+        self.assertFalse(Notification.objects.filter(usuario=self.usuario).exists())
+
+    def test_primeiro_acesso_cria_o_contador_a_partir_da_tabela(self):
+        Notification.objects.bulk_create([
+            Notification(usuario=self.usuario, tipo=NotificationType.CARD_CREATED, titulo='Aviso', mensagem='Aviso', lida=lida)
+            for lida in (False, False, True)
+        ])
+        self.client.force_login(self.usuario)
+        resposta = self.client.get('/api/notifications/unread_count/')
+        self.assertEqual(resposta.status_code, 200)
+        self.assertEqual(resposta.json(), {'total': 2, 'mine': 2})
+        self.assertEqual(self.contador(), (2, 2))
+
+    def test_reconciliacao_nao_sobrescreve_entrega_feita_durante_a_leitura(self):
+        self.entregar()
+        NotificationCounter.objects.filter(usuario=self.usuario).update(nao_lidas=5, nao_lidas_minhas=5)
+        contar = notification_utils._contar_nao_lidas
+        chamadas = []
+
+        def contar_e_entregar(filtro):
+            # Uma entrega concorrente logo depois da primeira passada (sem lock)
+            resultado = list(contar(filtro))
+            if not chamadas:
+                self.entregar()
+            chamadas.append(filtro)
+            return resultado
+
+        with mock.patch.object(notification_utils, '_contar_nao_lidas', side_effect=contar_e_entregar):
+            self.assertEqual(notification_utils.reconciliar_contadores_nao_lidas(), 1)
+        self.assertEqual(self.contador(), (2, 2))
+
+
+class ConfigSemanalMemoTests(TestCase):
+    """Memoização de WeeklyPriorityConfig.get_config no processo"""
+
+    def setUp(self):
+        # O rollback do teste anterior não passa pelos signals: começar sem memoização
+        WeeklyPriorityConfig.invalidar_cache(local_apenas=True)
+        self.addCleanup(WeeklyPriorityConfig.invalidar_cache, local_apenas=True)
+
+    def test_salvar_a_configuracao_reflete_na_hora(self):
+        config = WeeklyPriorityConfig.get_config()
+        config.horario_limite = time(18, 0)
+        config.save()
+        self.assertEqual(WeeklyPriorityConfig.get_config().horario_limite, time(18, 0))
+
+    def test_reset_local_descarta_a_configuracao_memoizada(self):
+        self.assertEqual(WeeklyPriorityConfig.get_config().horario_limite, time(9, 0))
+        # Alteração sem signals (como o rollback de outro teste): a memoização não vê
+        WeeklyPriorityConfig.objects.update(horario_limite=time(7, 30))
+        self.assertEqual(WeeklyPriorityConfig.get_config().horario_limite, time(9, 0))
+
+        WeeklyPriorityConfig.invalidar_cache(local_apenas=True)
+        self.assertEqual(WeeklyPriorityConfig.get_config().horario_limite, time(7, 30))
+
+
+class FinalizacaoSprintsPorDataTests(TestCase):
+    """Finalização noturna (finalizar_sprints_por_data): grupos encadeados, lotes por execução e retomada"""
+
+    def setUp(self):
+        hoje = timezone.localdate()
+        # A -> B -> C (B também vencida); X -> C em paralelo
+        self.a = criar_sprint('A', hoje - timedelta(days=30), hoje - timedelta(days=20))
+        self.b = criar_sprint('B', hoje - timedelta(days=19), hoje - timedelta(days=10))
+        self.x = criar_sprint('X', hoje - timedelta(days=15), hoje - timedelta(days=5))
+        self.c = criar_sprint('C', hoje + timedelta(days=1), hoje + timedelta(days=10))
+        self.projeto_a = criar_projeto('Projeto A', sprint=self.a)
+        criar_cards(self.projeto_a, CardStatus.EM_DESENVOLVIMENTO, CardStatus.A_DESENVOLVER, CardStatus.FINALIZADO)
+        criar_cards(criar_projeto('Projeto X', sprint=self.x), CardStatus.A_DESENVOLVER)
+        # Chord e Task.replace executados na hora, sem broker
+        self.addCleanup(celery_app.conf.update, task_always_eager=celery_app.conf.task_always_eager)
+        celery_app.conf.update(task_always_eager=True)
+
+    def nomes_dos_cards(self, sprint):
+        return sorted(Card.objects.filter(projeto__sprint=sprint).values_list('projeto__nome', 'nome'))
+
+    def test_destino_vencido_fica_no_mesmo_grupo_em_ordem_de_data_fim(self):
+        self.assertEqual(
+            rollover.encadear_sprints([self.x, self.b, self.a]),
+            [[self.a.pk, self.b.pk], [self.x.pk]]
+        )
+
+    def test_chord_replica_em_cascata_ate_a_sprint_aberta(self):
+        # Pelo chord (sem cair no processamento em sequência do fallback)
+        with mock.patch('celery.app.task.Task.apply_async'), self.assertNoLogs(tasks.logger, 'WARNING'):
+            tasks.finalizar_sprints_por_data()
+
+        self.assertEqual(Sprint.objects.filter(finalizada=True).count(), 3)
+        # Os cards pendentes de A passaram por B e chegaram em C, junto com os de X
+        self.assertEqual(self.nomes_dos_cards(self.b), [('Projeto A', 'Card 0'), ('Projeto A', 'Card 1')])
+        self.assertEqual(
+            self.nomes_dos_cards(self.c),
+            [('Projeto A', 'Card 0'), ('Projeto A', 'Card 1'), ('Projeto X', 'Card 0')]
+        )
+
+    def test_cada_execucao_copia_no_maximo_lotes_por_tarefa(self):
+        replicar_lote = rollover.replicar_proximo_lote
+        with mock.patch.object(tasks, 'LOTES_POR_TAREFA', 1), \
+                mock.patch.object(rollover, 'replicar_proximo_lote',
+                                  side_effect=lambda rollover_id, batch_size: replicar_lote(rollover_id, batch_size=1)), \
+                mock.patch.object(tasks, '_finalizar_sprint_por_data', wraps=tasks._finalizar_sprint_por_data) as etapa, \
+                mock.patch('celery.app.task.Task.apply_async'):
+            resultados = tasks.finalizar_sprints_encadeadas.apply(args=([self.a.pk],)).get()
+
+        # Um card por execução (2) e a execução que conclui
+        self.assertEqual(etapa.call_count, 3)
+        self.assertEqual([r['situacao'] for r in resultados], ['replicada'])
+        self.assertEqual(resultados[0]['cards_copiados'], 2)
+        self.assertEqual(len(self.nomes_dos_cards(self.b)), 2)
+
+    def test_retomada_apos_falha_e_repeticao_nao_duplicam(self):
+        criar_bulk = CardLog.objects.bulk_create
+        falhas = []
+
+        def falhar_no_segundo_lote(objs, *args, **kwargs):
+            if falhas:
+                raise RuntimeError('worker caiu')
+            falhas.append(1)
+            return criar_bulk(objs, *args, **kwargs)
+
+        replicar_lote = rollover.replicar_proximo_lote
+        with mock.patch.object(rollover, 'replicar_proximo_lote',
+                               side_effect=lambda rollover_id, batch_size: replicar_lote(rollover_id, batch_size=1)):
+            with mock.patch.object(CardLog.objects, 'bulk_create', side_effect=falhar_no_segundo_lote), \
+                    self.assertRaises(RuntimeError):
+                tasks._finalizar_sprint_por_data(self.a.pk)
+            # O primeiro lote ficou gravado com o checkpoint; o segundo foi desfeito inteiro
+            checkpoint = SprintRollover.objects.get(sprint=self.a)
+            self.assertEqual((checkpoint.status, checkpoint.cards_copiados), (SprintRolloverStatus.EM_ANDAMENTO, 1))
+            self.assertEqual(len(self.nomes_dos_cards(self.b)), 1)
+
+            with mock.patch('celery.app.task.Task.apply_async'):
+                self.assertEqual(tasks._finalizar_sprint_por_data(self.a.pk)['situacao'], 'replicada')
+                # Task entregue de novo (acks_late) depois de concluída
+                self.assertEqual(tasks._finalizar_sprint_por_data(self.a.pk)['situacao'], 'ja_finalizada')
+
+        self.assertEqual(self.nomes_dos_cards(self.b), [('Projeto A', 'Card 0'), ('Projeto A', 'Card 1')])
+        self.assertEqual(Project.objects.filter(sprint=self.b).count(), 1)
+
+
+class ReplicacaoSprintTests(TestCase):
+    """Replicação em lote dos projetos com cards pendentes (rollover.py)"""
+
+    def setUp(self):
+        hoje = timezone.localdate()
+        self.origem = criar_sprint('Origem', hoje - timedelta(days=20), hoje - timedelta(days=10))
+        self.destino = criar_sprint('Destino', hoje + timedelta(days=1), hoje + timedelta(days=10))
+        self.projeto = criar_projeto('Projeto', sprint=self.origem)
+        criar_projeto('Entregue', sprint=self.origem)
+        self.responsavel = User.objects.create(username='dev', role='desenvolvedor')
+        self.cards = criar_cards(
+            self.projeto, CardStatus.A_DESENVOLVER, CardStatus.EM_DESENVOLVIMENTO,
+            CardStatus.EM_HOMOLOGACAO, CardStatus.FINALIZADO, responsavel=self.responsavel,
+        )
+
+    def replicar(self, **kwargs):
+        with mock.patch('celery.app.task.Task.apply_async'):
+            return rollover.replicar_sprint(self.origem, **kwargs)
+
+    def cards_no_destino(self):
+        return sorted(Card.objects.filter(projeto__sprint=self.destino).values_list('nome', flat=True))
+
+    def test_copia_so_os_projetos_e_cards_pendentes(self):
+        replicacao = self.replicar()
+        self.assertEqual(replicacao.status, SprintRolloverStatus.CONCLUIDA)
+        self.assertEqual(list(Project.objects.filter(sprint=self.destino).values_list('nome', flat=True)), ['Projeto'])
+        self.assertEqual(self.cards_no_destino(), ['Card 0', 'Card 1', 'Card 2'])
+        # Um CardLog por card copiado; a notificação é um evento só
+        self.assertEqual(CardLog.objects.filter(card__projeto__sprint=self.destino).count(), 3)
+        evento = NotificationOutbox.objects.get(tipo_evento=OutboxEventType.SPRINT_ROLLOVER)
+        self.assertEqual(evento.payload['destinatarios'], {str(self.responsavel.id): {'cards': 3, 'projetos': 0}})
+        self.origem.refresh_from_db()
+        self.assertTrue(self.origem.finalizada)
+
+    def test_repetir_a_replicacao_nao_duplica(self):
+        self.replicar()
+        repetida = self.replicar()
+        self.assertEqual(repetida.cards_copiados, 3)
+        self.assertEqual(Project.objects.filter(sprint=self.destino).count(), 1)
+        self.assertEqual(self.cards_no_destino(), ['Card 0', 'Card 1', 'Card 2'])
+        self.assertEqual(NotificationOutbox.objects.filter(tipo_evento=OutboxEventType.SPRINT_ROLLOVER).count(), 1)
+
+    def test_retoma_depois_do_ultimo_card_gravado(self):
+        checkpoint = rollover.iniciar_replicacao(self.origem)
+        self.assertEqual(rollover.replicar_proximo_lote(checkpoint.id, batch_size=2), 2)
+        checkpoint.refresh_from_db()
+        self.assertEqual(checkpoint.ultimo_card_id, self.cards[1].id)
+
+        # Outro processo retoma: só o que vem depois do checkpoint é copiado
+        replicacao = self.replicar()
+        self.assertEqual((replicacao.cards_copiados, replicacao.projetos_criados), (3, 1))
+        self.assertEqual(self.cards_no_destino(), ['Card 0', 'Card 1', 'Card 2'])
+
+    def test_copiar_todos_leva_status_e_comentarios(self):
+        CardTodo.objects.filter(card__in=self.cards).delete()
+        CardTodo.objects.create(card=self.cards[0], label='Revisar', status=CardTodoStatus.COMPLETED, comment='ok', order=2)
+        CardTodo.objects.create(card=self.cards[0], label='Publicar', order=1)
+
+        replicacao = self.replicar(copiar_todos=True)
+        self.assertEqual(replicacao.todos_copiados, 2)
+        copia = Card.objects.get(projeto__sprint=self.destino, nome='Card 0')
+        self.assertEqual(
+            list(copia.todos.order_by('order').values_list('label', 'status', 'comment')),
+            [('Publicar', CardTodoStatus.PENDING, None), ('Revisar', CardTodoStatus.COMPLETED, 'ok')]
+        )
+
+    def test_sem_copiar_todos_os_cards_vao_sem_todos(self):
+        CardTodo.objects.create(card=self.cards[0], label='Revisar')
+        self.assertEqual(self.replicar(copiar_todos=False).todos_copiados, 0)
+        self.assertFalse(CardTodo.objects.filter(card__projeto__sprint=self.destino).exists())
+
+    def test_sem_sprint_de_destino_nada_e_criado(self):
+        self.destino.delete()
+        self.assertIsNone(self.replicar())
+        self.assertFalse(SprintRollover.objects.exists())
+        self.assertEqual(Project.objects.count(), 2)
+        self.origem.refresh_from_db()
+        self.assertFalse(self.origem.finalizada)
+
+
+class HistoricoPaginadoTests(TestCase):
+    """Paginação por cursor das notificações, logs e arquivos (sem COUNT, só next/previous)"""
+
+    def setUp(self):
+        self.usuario = User.objects.create(username='leitor', role='desenvolvedor')
+        self.client.force_login(self.usuario)
+        # Mesmo data_criacao para todas: só o desempate por id separa as linhas
+        notificacoes = Notification.objects.bulk_create([
+            Notification(usuario=self.usuario, tipo=NotificationType.CARD_CREATED, titulo=f'Aviso {indice}', mensagem='Aviso')
+            for indice in range(5)
+        ])
+        Notification.objects.update(data_criacao=timezone.now())
+        self.ids = sorted(notificacao.id for notificacao in notificacoes)
+
+    def percorrer(self, url):
+        paginas, ids = 0, []
+        while url:
+            dados = self.client.get(url).json()
+            self.assertEqual(set(dados), {'next', 'previous', 'results'})
+            ids.extend(item['id'] for item in dados['results'])
+            url, paginas = dados['next'], paginas + 1
+        return paginas, ids
+
+    def test_cursor_percorre_todas_sem_repetir(self):
+        paginas, ids = self.percorrer('/api/notifications/?page_size=2')
+        self.assertEqual(paginas, 3)
+        self.assertEqual([int(i) for i in ids], sorted(self.ids, reverse=True))
+
+    def test_ordering_mantem_o_desempate_por_id(self):
+        _, ids = self.percorrer('/api/notifications/?page_size=2&ordering=-data_criacao')
+        self.assertEqual([int(i) for i in ids], sorted(self.ids, reverse=True))
+        with CaptureQueriesContext(connection) as consultas:
+            _, ids = self.percorrer('/api/notifications/?page_size=2&ordering=data_criacao')
+        self.assertEqual([int(i) for i in ids], self.ids)
+        # O desempate vem da consulta, não da ordem física das linhas no banco
+        listagens = [c['sql'] for c in consultas.captured_queries if 'ORDER BY' in c['sql'] and 'notification"' in c['sql']]
+        self.assertTrue(listagens)
+        for sql in listagens:
+            self.assertRegex(sql, r'ORDER BY .*"data_criacao" ASC, .*"id" ASC')
+
+    def test_notificacoes_arquivadas_so_do_usuario(self):
+        outro = User.objects.create(username='outro', role='desenvolvedor')
+        agora = timezone.now()
+        ArchivedNotification.objects.bulk_create([
+            ArchivedNotification(id=1000 + indice, usuario=usuario, tipo=NotificationType.CARD_CREATED,
+                                 titulo='Antiga', mensagem='Antiga', data_criacao=agora)
+            for indice, usuario in enumerate([self.usuario, self.usuario, outro])
+        ])
+        _, ids = self.percorrer('/api/notifications/archived/?page_size=1')
+        self.assertEqual([int(i) for i in ids], [1001, 1000])
+
+    def test_logs_arquivados_exigem_o_card(self):
+        card = criar_cards(criar_projeto(), CardStatus.FINALIZADO)[0]
+        ArchivedCardLog.objects.create(
+            id=5000, card=card, tipo_evento=CardLogEventType.CRIADO, descricao='Criado', data=timezone.now()
+        )
+        self.assertEqual(self.client.get('/api/card-logs/archived/').status_code, 400)
+        _, ids = self.percorrer(f'/api/card-logs/archived/?card={card.id}')
+        self.assertEqual([int(i) for i in ids], [5000])
+
+
+class PrazosCardsTests(TestCase):
+    """Alertas de prazo (verificar_prazos_cards): uma janela por card, sem repetir o alerta"""
+
+    def setUp(self):
+        self.agora = timezone.now().replace(microsecond=0)
+        self.responsavel = User.objects.create(username='dev', role='desenvolvedor')
+        self.gerente = User.objects.create(username='gerente', role='gerente')
+        self.projeto = criar_projeto(gerente_atribuido=self.gerente)
+        prazos = {
+            'Atrasado': timedelta(hours=-1),
+            '24 horas': timedelta(hours=24),
+            '1 hora': timedelta(hours=1),
+            '10 minutos': timedelta(minutes=10),
+            'Fora das janelas': timedelta(hours=3),
+        }
+        with mock.patch('celery.app.task.Task.apply_async'):
+            for nome, prazo in prazos.items():
+                Card.objects.create(nome=nome, projeto=self.projeto, responsavel=self.responsavel, data_fim=self.agora + prazo)
+            Card.objects.create(
+                nome='Entregue', projeto=self.projeto, responsavel=self.responsavel,
+                status=CardStatus.FINALIZADO, data_fim=self.agora - timedelta(days=1),
+            )
+
+    def alertas(self):
+        tipos = [tipo for tipo, *_ in JANELAS_PRAZO]
+        nomes = dict(Card.objects.values_list('id', 'nome'))
+        return sorted(
+            (nomes[card_id], tipo)
+            for card_id, tipo in Notification.objects.filter(tipo__in=tipos, usuario=self.responsavel).values_list('card_id', 'tipo')
+        )
+
+    def test_cada_card_cai_na_sua_janela(self):
+        resultado = verificar_prazos_cards(now=self.agora)
+        self.assertEqual((resultado['cards_alertados'], resultado['notificacoes_criadas']), (4, 8))
+        self.assertEqual(self.alertas(), [
+            ('1 hora', NotificationType.CARD_DUE_1H),
+            ('10 minutos', NotificationType.CARD_DUE_10MIN),
+            ('24 horas', NotificationType.CARD_DUE_24H),
+            ('Atrasado', NotificationType.CARD_OVERDUE),
+        ])
+        self.assertEqual(Notification.objects.filter(usuario=self.gerente, tipo=NotificationType.CARD_OVERDUE).count(), 1)
+
+    def test_alerta_nao_se_repete_no_intervalo(self):
+        verificar_prazos_cards(now=self.agora)
+        self.assertEqual(verificar_prazos_cards(now=self.agora + timedelta(minutes=1))['notificacoes_criadas'], 0)
+        # Passado o intervalo de repetição, o card atrasado volta a ser alertado
+        depois = verificar_prazos_cards(now=self.agora + timedelta(hours=3))
+        self.assertIn(('Atrasado', NotificationType.CARD_OVERDUE), self.alertas())
+        self.assertGreater(depois['notificacoes_criadas'], 0)
+
+
+class SnapshotCardTests(TestCase):
+    """Estado anterior do card para os signals vindo do snapshot do carregamento (FieldTrackerMixin)"""
+
+    def setUp(self):
+        self.card = criar_cards(criar_projeto(), CardStatus.A_DESENVOLVER)[0]
+
+    def test_pre_save_usa_o_snapshot_sem_consultar_o_banco(self):
+        card = Card.objects.get(pk=self.card.pk)
+        card.status = CardStatus.EM_DESENVOLVIMENTO
+        card.nome = 'Renomeado'
+        with CaptureQueriesContext(connection) as consultas:
+            signals.card_pre_save(Card, card)
+        self.assertEqual(len(consultas), 0)
+        self.assertEqual(card._previous_status, CardStatus.A_DESENVOLVER)
+        self.assertEqual(card._previous_data['nome'], 'Card 0')
+
+    def test_save_parcial_so_atualiza_os_campos_gravados(self):
+        card = Card.objects.get(pk=self.card.pk)
+        card.status = CardStatus.EM_DESENVOLVIMENTO
+        card.nome = 'Nao gravado'
+        with mock.patch('celery.app.task.Task.apply_async'):
+            card.save(update_fields=['status', 'updated_at'])
+        snapshot = card.get_tracked_snapshot()
+        # status passou a ser a nova base; nome continua o valor do banco
+        self.assertEqual((snapshot['status'], snapshot['nome']), (CardStatus.EM_DESENVOLVIMENTO, 'Card 0'))
+        signals.card_pre_save(Card, card)
+        self.assertEqual(card._previous_data['nome'], 'Card 0')
+        self.assertEqual(card._previous_status, CardStatus.EM_DESENVOLVIMENTO)
+
+    def test_campos_adiados_recorrem_ao_banco(self):
+        card = Card.objects.only('id', 'status').get(pk=self.card.pk)
+        self.assertIsNone(card.get_tracked_snapshot())
+        card.status = CardStatus.EM_HOMOLOGACAO
+        with CaptureQueriesContext(connection) as consultas:
+            signals.card_pre_save(Card, card)
+        self.assertEqual(len(consultas), 1)
+        self.assertEqual(card._previous_status, CardStatus.A_DESENVOLVER)
+
+    def test_alteracoes_levam_o_valor_anterior_ao_log_e_a_notificacao(self):
+        card = Card.objects.get(pk=self.card.pk)
+        card.status = CardStatus.EM_DESENVOLVIMENTO
+        with mock.patch('celery.app.task.Task.apply_async'):
+            card.save()
+            card.nome = 'Renomeado'
+            card.save()
+        movido = NotificationOutbox.objects.get(tipo_evento=OutboxEventType.CARD_MOVED)
+        self.assertEqual(
+            (movido.payload['old_status'], movido.payload['new_status']),
+            (CardStatus.A_DESENVOLVER, CardStatus.EM_DESENVOLVIMENTO)
+        )
+        # O segundo save compara com o estado do primeiro, não com o do carregamento
+        log = CardLog.objects.get(card=card, tipo_evento=CardLogEventType.ALTERACAO)
+        self.assertIn('Card 0', log.descricao)
+        self.assertIn('Renomeado', log.descricao)
+        self.assertNotIn('Status', log.descricao)
+
+
+class PlanoPrioridadesTests(TestCase):
+    """Plano semanal aplicado como diferença sobre as prioridades existentes"""
+
+    SEGUNDA = date(2026, 1, 5)
+
+    def setUp(self):
+        projeto = criar_projeto()
+        self.supervisor = projeto.sprint.supervisor
+        self.cards = criar_cards(projeto, *[CardStatus.A_DESENVOLVER] * 3)
+        self.dev_a = User.objects.create(username='dev_a', role='desenvolvedor')
+        self.dev_b = User.objects.create(username='dev_b', role='desenvolvedor')
+        for usuario, card in [(self.dev_a, self.cards[0]), (self.dev_a, self.cards[1]), (self.dev_b, self.cards[2])]:
+            WeeklyPriority.objects.create(
+                usuario=usuario, card=card, semana_inicio=self.SEGUNDA, semana_fim=self.SEGUNDA + timedelta(days=4)
+            )
+        self.originais = dict(WeeklyPriority.objects.filter(usuario=self.dev_a).values_list('card_id', 'id'))
+        self.client.force_login(self.supervisor)
+
+    def aplicar(self, substituir):
+        plano = {
+            'semana_inicio': self.SEGUNDA.isoformat(),
+            'substituir': substituir,
+            'plano': [{'usuario': self.dev_a.id, 'cards': [self.cards[1].id, self.cards[2].id]}],
+        }
+        resposta = self.client.post('/api/weekly-priorities/bulk/', plano, content_type='application/json')
+        self.assertEqual(resposta.status_code, 200, resposta.content)
+        return resposta.json()
+
+    def prioridades(self, usuario):
+        return set(WeeklyPriority.objects.filter(usuario=usuario, semana_inicio=self.SEGUNDA).values_list('card_id', flat=True))
+
+    def test_sem_substituir_preserva_usuarios_fora_do_plano(self):
+        resposta = self.aplicar(substituir=False)
+        self.assertEqual((resposta['criadas'], resposta['removidas']), (1, 1))
+        self.assertEqual(self.prioridades(self.dev_a), {self.cards[1].id, self.cards[2].id})
+        self.assertEqual(self.prioridades(self.dev_b), {self.cards[2].id})
+        # A prioridade mantida é a mesma linha, não uma recriada
+        self.assertTrue(WeeklyPriority.objects.filter(id=self.originais[self.cards[1].id]).exists())
+
+    def test_substituir_limpa_usuarios_fora_do_plano(self):
+        resposta = self.aplicar(substituir=True)
+        self.assertEqual((resposta['criadas'], resposta['removidas']), (1, 2))
+        self.assertEqual(self.prioridades(self.dev_a), {self.cards[1].id, self.cards[2].id})
+        self.assertEqual(self.prioridades(self.dev_b), set())
+        self.assertTrue(WeeklyPriority.objects.filter(id=self.originais[self.cards[1].id]).exists())
+
+
+class SituacaoPrioridadesTests(TestCase):
+    """atrasado_anotado no SQL tem de concordar com WeeklyPriority.is_atrasado()"""
+
+    SEXTA = date(2026, 1, 9)
+
+    def setUp(self):
+        WeeklyPriorityConfig.invalidar_cache(local_apenas=True)
+        self.addCleanup(WeeklyPriorityConfig.invalidar_cache, local_apenas=True)
+        config = WeeklyPriorityConfig.get_config()
+        config.horario_limite = time(18, 0)
+        config.save()
+
+        projeto = criar_projeto()
+        aberto, finalizado = criar_cards(projeto, CardStatus.EM_DESENVOLVIMENTO, CardStatus.FINALIZADO)
+        usuario = User.objects.create(username='dev', role='desenvolvedor')
+        for card in (aberto, finalizado):
+            WeeklyPriority.objects.create(
+                usuario=usuario, card=card, semana_inicio=self.SEXTA - timedelta(days=4), semana_fim=self.SEXTA
+            )
+
+    def test_anotacao_concorda_com_o_metodo_em_volta_do_horario_limite(self):
+        instantes = [
+            datetime(2026, 1, 8, 23, 59),   # véspera
+            datetime(2026, 1, 9, 17, 59),   # sexta, antes do limite
+            datetime(2026, 1, 9, 18, 1),    # sexta, depois do limite
+            datetime(2026, 1, 9, 23, 30),   # sexta à noite: já é sábado em UTC
+            datetime(2026, 1, 10, 0, 30),   # sábado
+        ]
+        esperado = [False, False, True, True, True]
+        for instante, atrasado in zip(instantes, esperado):
+            agora = timezone.make_aware(instante)
+            with self.subTest(agora=agora), mock.patch('django.utils.timezone.now', return_value=agora):
+                anotadas = anotar_situacao_prioridades(WeeklyPriority.objects.select_related('card'), agora=agora)
+                for prioridade in anotadas:
+                    metodo = WeeklyPriority.objects.select_related('card').get(pk=prioridade.pk).is_atrasado()
+                    self.assertEqual(prioridade.atrasado_anotado, metodo)
+                    self.assertEqual(metodo, atrasado and not prioridade.is_concluido())
+
+
+class RetencaoTests(TestCase):
+    """Arquivamento em lotes do histórico antigo e leitura pelas rotas de arquivo"""
+
+    def setUp(self):
+        self.agora = timezone.now()
+        self.antigo = self.agora - timedelta(days=365)
+        self.usuario = User.objects.create(username='dev', role='desenvolvedor')
+        self.client.force_login(self.usuario)
+
+    def criar_notificacoes(self, quantidade, lida, data_criacao):
+        criadas = Notification.objects.bulk_create([
+            Notification(usuario=self.usuario, tipo=NotificationType.CARD_CREATED, titulo='Aviso', mensagem='Aviso', lida=lida)
+            for _ in range(quantidade)
+        ])
+        ids = [notificacao.id for notificacao in criadas]
+        Notification.objects.filter(id__in=ids).update(data_criacao=data_criacao)
+        return ids
+
+    def test_notificacoes_lidas_antigas_em_lotes_e_nunca_as_nao_lidas(self):
+        lidas = self.criar_notificacoes(5, True, self.antigo)
+        nao_lidas = self.criar_notificacoes(2, False, self.antigo)
+        recente = self.criar_notificacoes(1, True, self.agora)
+        nao_lidas_antes = self.client.get('/api/notifications/unread_count/').json()
+
+        # Dois lotes de 2 por execução: a sobra fica para a próxima
+        self.assertEqual(retention.arquivar_notificacoes(batch_size=2, max_lotes=2, agora=self.agora), 4)
+        self.assertEqual(retention.arquivar_notificacoes(batch_size=2, max_lotes=2, agora=self.agora), 1)
+        self.assertEqual(retention.arquivar_notificacoes(batch_size=2, max_lotes=2, agora=self.agora), 0)
+
+        self.assertEqual(set(Notification.objects.values_list('id', flat=True)), set(nao_lidas + recente))
+        self.assertEqual(set(ArchivedNotification.objects.values_list('id', flat=True)), set(lidas))
+        self.assertEqual(self.client.get('/api/notifications/unread_count/').json(), nao_lidas_antes)
+
+        resposta = self.client.get('/api/notifications/archived/')
+        self.assertEqual(resposta.status_code, 200)
+        self.assertEqual(sorted(int(item['id']) for item in resposta.json()['results']), sorted(lidas))
+
+    def test_logs_so_de_sprints_finalizadas(self):
+        finalizada = criar_sprint('Finalizada')
+        Sprint.objects.filter(pk=finalizada.pk).update(finalizada=True)
+        arquivar = criar_cards(criar_projeto('Finalizada', sprint=finalizada), CardStatus.FINALIZADO)[0]
+        manter = criar_cards(criar_projeto('Aberta'), CardStatus.FINALIZADO)[0]
+        CardLog.objects.all().delete()
+        for card in (arquivar, manter):
+            CardLog.objects.create(card=card, tipo_evento=CardLogEventType.CRIADO, descricao='Criado')
+        CardLog.objects.update(data=self.antigo)
+        log_arquivado = CardLog.objects.get(card=arquivar).id
+
+        resultado = retention.aplicar_retencao(agora=self.agora)
+
+        self.assertEqual(resultado['logs_arquivados'], 1)
+        self.assertEqual(list(CardLog.objects.values_list('card_id', flat=True)), [manter.id])
+        resposta = self.client.get(f'/api/card-logs/archived/?card={arquivar.id}')
+        self.assertEqual(resposta.status_code, 200)
+        self.assertEqual([int(item['id']) for item in resposta.json()['results']], [log_arquivado])
+
+
+class DiretorioDestinatariosTests(TestCase):
+    """Diretório de destinatários por cargo invalidado quando o cargo muda"""
+
+    def setUp(self):
+        recipients._descartar_local()
+        self.addCleanup(recipients._descartar_local)
+        self.supervisor = User.objects.create(username='supervisor', role='supervisor')
+        self.dev = User.objects.create(username='dev', role='desenvolvedor')
+
+    def promover(self):
+        self.dev.role = 'supervisor'
+        with mock.patch('celery.app.task.Task.apply_async'), self.captureOnCommitCallbacks(execute=True):
+            self.dev.save()
+
+    def test_mudanca_de_cargo_vale_na_hora_no_processo(self):
+        self.assertEqual(recipients.usuarios_por_cargos(['supervisor']), [self.supervisor.id])
+        self.promover()
+        self.assertEqual(sorted(recipients.usuarios_por_cargos(['supervisor'])), [self.supervisor.id, self.dev.id])
+        self.assertEqual(recipients.usuarios_por_cargos(['desenvolvedor']), [])
+
+    def test_outros_processos_recarregam_pela_versao_compartilhada(self):
+        pasta = tempfile.TemporaryDirectory()
+        self.addCleanup(pasta.cleanup)
+        caches = {
+            'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'},
+            'compartilhado': {'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache', 'LOCATION': pasta.name},
+        }
+        with override_settings(CACHES=caches, RESPONSE_CACHE_ALIAS='compartilhado'):
+            self.assertEqual(recipients.usuarios_por_cargos(['supervisor']), [self.supervisor.id])
+            # Outro processo: continua com o diretório carregado antes da mudança
+            outro_processo = dict(recipients._estado)
+            self.promover()
+            recipients._estado.update(outro_processo)
+            self.assertEqual(sorted(recipients.usuarios_por_cargos(['supervisor'])), [self.supervisor.id, self.dev.id])
+
+
+class ModelosTodoTests(TestCase):
+    """TODOs originais dos cards novos vindos de CardTodoTemplate, por área"""
+
+    def setUp(self):
+        CardTodoTemplate.invalidar_cache(local_apenas=True)
+        self.addCleanup(CardTodoTemplate.invalidar_cache, local_apenas=True)
+        self.projeto = criar_projeto()
+        self.client.force_login(self.projeto.sprint.supervisor)
+
+    def criar_card(self, area, **kwargs):
+        dados = {'nome': f'Card {area}', 'projeto': self.projeto.id, 'area': area, **kwargs}
+        with mock.patch('celery.app.task.Task.apply_async'), self.captureOnCommitCallbacks(execute=True):
+            resposta = self.client.post('/api/cards/', dados, content_type='application/json')
+        self.assertEqual(resposta.status_code, 201, resposta.content)
+        return list(CardTodo.objects.filter(card_id=resposta.json()['id']).order_by('order').values_list('label', flat=True))
+
+    def test_migracao_semeia_os_modelos_de_cada_area(self):
+        por_area = CardTodoTemplate.modelos_por_area()
+        self.assertEqual({area: len(modelos) for area, modelos in por_area.items()},
+                         {'backend': 14, 'frontend': 18, 'rpa': 10, 'sistema': 10, 'script': 10})
+        dependentes = {codigo for modelos in por_area.values() for codigo, _label, depende in modelos if depende}
+        self.assertEqual(dependentes, {'desenvolvimento_basico', 'desenvolvimento_medio', 'desenvolvimento_dificil'})
+
+    def test_card_novo_recebe_os_todos_da_area(self):
+        backend = self.criar_card('backend')
+        self.assertEqual(backend[0], 'Modelagem Do Banco De Dados (Models)')
+        self.assertEqual(len(backend), 14)
+
+        # Desenvolvimento só no nível escolhido na complexidade
+        rpa = self.criar_card('rpa', complexidade_selected_development='desenvolvimento_medio')
+        self.assertEqual(len(rpa), 8)
+        self.assertIn('Desenvolvimento (Médio)', rpa)
+        self.assertNotIn('Desenvolvimento (Básico)', rpa)
+
+    def test_modelo_desativado_no_admin_sai_dos_cards_novos(self):
+        modelo = CardTodoTemplate.objects.get(area='backend', codigo='testes_manuais')
+        modelo.ativo = False
+        with self.captureOnCommitCallbacks(execute=True):
+            modelo.save()
+        backend = self.criar_card('backend')
+        self.assertEqual(len(backend), 13)
+        self.assertNotIn(modelo.label, backend)
+
+
+class AlteracaoEmLoteTests(TestCase):
+    """card_bulk.aplicar_operacoes e POST /api/cards/bulk/"""
+
+    def setUp(self):
+        outbox._broker['falhou_em'] = None
+        self.addCleanup(outbox._broker.update, falhou_em=None)
+        self.gerente = User.objects.create(username='gerente', role='gerente')
+        self.dev_a = User.objects.create(username='dev_a', role='desenvolvedor')
+        self.dev_b = User.objects.create(username='dev_b', role='desenvolvedor')
+        self.projeto = criar_projeto(gerente_atribuido=self.gerente)
+
+    def evento_lote(self):
+        return NotificationOutbox.objects.get(tipo_evento=OutboxEventType.CARDS_BULK_UPDATED).payload
+
+    def test_log_por_card_alterado_e_resumo_por_destinatario(self):
+        movido, ja_no_destino, reatribuido = criar_cards(
+            self.projeto, CardStatus.A_DESENVOLVER, CardStatus.EM_DESENVOLVIMENTO, CardStatus.A_DESENVOLVER,
+            responsavel=self.dev_a,
+        )
+        CardLog.objects.all().delete()
+        with mock.patch('celery.app.task.Task.apply_async'):
+            alterados = card_bulk.aplicar_operacoes([
+                {'cards': [movido.id, ja_no_destino.id], 'status': CardStatus.EM_DESENVOLVIMENTO},
+                {'cards': [reatribuido.id], 'responsavel': self.dev_b.id},
+            ], usuario=self.gerente)
+
+        # O card que já estava no status pedido não conta como alterado
+        self.assertEqual(alterados, [movido.id, reatribuido.id])
+        logs = dict(CardLog.objects.values_list('card_id', 'tipo_evento'))
+        self.assertEqual(logs, {movido.id: CardLogEventType.MOVIMENTADO, reatribuido.id: CardLogEventType.ALTERACAO})
+        self.assertIn('Responsável: dev_a → dev_b', CardLog.objects.get(card=reatribuido).descricao)
+
+        payload = self.evento_lote()
+        self.assertEqual(payload['destinatarios'], {
+            str(self.dev_a.id): {'cards': 2, 'status': 1, 'responsavel_id': 1},
+            str(self.dev_b.id): {'cards': 1, 'responsavel_id': 1},
+            str(self.gerente.id): {'cards': 2, 'status': 1, 'responsavel_id': 1},
+        })
+        self.assertEqual(payload['demandas'], 0)
+
+        outbox.processar_outbox()
+        self.assertEqual(
+            set(Notification.objects.filter(titulo='Cards Alterados em Lote').values_list('usuario_id', flat=True)),
+            {self.dev_a.id, self.dev_b.id, self.gerente.id}
+        )
+
+    def test_demandas_so_pelo_criador_ou_supervisao(self):
+        demandas = criar_projeto(card_bulk.PROJETO_DEMANDAS)
+        supervisor = demandas.sprint.supervisor
+        alheia = criar_cards(demandas, CardStatus.A_DESENVOLVER, criado_por=self.dev_b)[0]
+        propria = criar_cards(demandas, CardStatus.A_DESENVOLVER, criado_por=self.dev_a)[0]
+
+        def alterar(usuario, card):
+            self.client.force_login(usuario)
+            corpo = {'operacoes': [{'cards': [card.id], 'status': CardStatus.EM_DESENVOLVIMENTO}]}
+            with mock.patch('celery.app.task.Task.apply_async'):
+                return self.client.post('/api/cards/bulk/', corpo, content_type='application/json')
+
+        self.assertEqual(alterar(self.dev_a, alheia).status_code, 403)
+        self.assertEqual(Card.objects.get(pk=alheia.pk).status, CardStatus.A_DESENVOLVER)
+        self.assertFalse(NotificationOutbox.objects.filter(tipo_evento=OutboxEventType.CARDS_BULK_UPDATED).exists())
+
+        resposta = alterar(self.dev_a, propria)
+        self.assertEqual(resposta.status_code, 200, resposta.content)
+        self.assertEqual(resposta.json()['alterados'], [propria.id])
+        self.assertEqual(alterar(supervisor, alheia).status_code, 200)
+
+        # Demandas alteradas avisam a supervisão
+        outbox.processar_outbox()
+        self.assertTrue(Notification.objects.filter(usuario=supervisor, titulo='Demandas Alteradas em Lote').exists())
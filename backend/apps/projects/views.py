@@ -2,15 +2,34 @@ from rest_framework import viewsets, filters, status
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.decorators import action
 from rest_framework.response import Response
+from rest_framework.exceptions import PermissionDenied, ValidationError
 from django_filters.rest_framework import DjangoFilterBackend
-from django.db.models import Q
+from django.db import transaction
+from django.db.models import Q, Prefetch
 from django.utils import timezone
 from datetime import datetime, timedelta
-from .models import Sprint, Project, Card, CardTodo, Event, CardLog, Notification, WeeklyPriority, WeeklyPriorityConfig
-from .services import finalizar_sprint_replicacao
+from apps.response_cache import resposta_em_cache
+from .models import (
+    Sprint, Project, Card, CardTodo, Event, CardLog, Notification, WeeklyPriority, WeeklyPriorityConfig,
+    ArchivedCardLog, ArchivedNotification,
+)
+from .notification_utils import (
+    TIPOS_NOTIFICACAO_GERAIS, marcar_notificacao_como_lida, marcar_todas_como_lidas,
+    notificar_leitura, obter_contadores_nao_lidas
+)
+from .services import (
+    finalizar_sprint_replicacao, anotar_cards_para_leitura, carregar_cards_para_leitura, anotar_situacao_prioridades
+)
+from .card_bulk import aplicar_operacoes, PROJETO_DEMANDAS
+from .pagination import DataCursorPagination, DataCriacaoCursorPagination, OrdenacaoComDesempateFilter
+from .conditional import (
+    versao_cards, versao_prioridades, versao_usuarios, gerar_etag,
+    resposta_condicional, aplicar_validadores, marco_prazo_prioridades
+)
 from .serializers import (
-    SprintSerializer, ProjectSerializer, CardSerializer, CardTodoSerializer, EventSerializer, 
-    CardLogSerializer, NotificationSerializer, WeeklyPrioritySerializer, WeeklyPriorityConfigSerializer
+    SprintSerializer, ProjectSerializer, CardSerializer, CardListSerializer, CardTodoSerializer, EventSerializer, 
+    CardLogSerializer, NotificationSerializer, WeeklyPrioritySerializer, WeeklyPriorityConfigSerializer,
+    WeeklyPriorityPlanSerializer, ArchivedCardLogSerializer, ArchivedNotificationSerializer, CardBulkUpdateSerializer
 )
 
 
@@ -24,6 +43,10 @@ class SprintViewSet(viewsets.ModelViewSet):
     ordering_fields = ['data_inicio', 'data_fim', 'created_at']
     ordering = ['-data_inicio']
 
+    @resposta_em_cache('sprints')
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+
     @action(detail=True, methods=['post'], url_path='finalizar')
     def finalizar(self, request, pk=None):
         if request.user.role not in ['supervisor', 'admin']:
@@ -32,7 +55,10 @@ class SprintViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_403_FORBIDDEN
             )
         sprint = self.get_object()
-        result = finalizar_sprint_replicacao(sprint, criado_por_user=request.user)
+        copiar_todos = request.data.get('copiar_todos')
+        if copiar_todos is not None:
+            copiar_todos = str(copiar_todos).lower() in ('true', '1')
+        result = finalizar_sprint_replicacao(sprint, criado_por_user=request.user, copiar_todos=copiar_todos)
         if result is None:
             return Response(
                 {'detail': 'Nenhuma sprint de destino encontrada (em andamento ou próxima por data).'},
@@ -59,6 +85,10 @@ class ProjectViewSet(viewsets.ModelViewSet):
     ordering_fields = ['created_at', 'data_criacao', 'data_entrega']
     ordering = ['-created_at']
 
+    @resposta_em_cache('projects')
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+
 
 class CardViewSet(viewsets.ModelViewSet):
     queryset = Card.objects.all()
@@ -77,8 +107,46 @@ class CardViewSet(viewsets.ModelViewSet):
         responsavel_id = self.request.query_params.get('responsavel', None)
         if responsavel_id:
             queryset = queryset.filter(responsavel_id=responsavel_id)
+        if self.action == 'list':
+            # Carregar só o que a listagem vai exibir (ver CardListSerializer)
+            expand = self._parse_lista_param('expand')
+            queryset = anotar_cards_para_leitura(
+                queryset,
+                projeto='projeto_detail' in expand,
+                todos='todos' in expand,
+                eventos='events_count' in expand,
+            )
+        elif self.action == 'retrieve':
+            queryset = anotar_cards_para_leitura(queryset)
         return queryset
     
+    def _parse_lista_param(self, nome):
+        """Lê parâmetros como ?expand=todos,projeto_detail (também aceita o parâmetro repetido)"""
+        valores = []
+        for valor in self.request.query_params.getlist(nome):
+            valores.extend(v.strip() for v in valor.split(',') if v.strip())
+        return valores
+    
+    def get_serializer_class(self):
+        if self.action == 'list':
+            return CardListSerializer
+        return CardSerializer
+    
+    def get_serializer(self, *args, **kwargs):
+        if self.action == 'list':
+            kwargs.setdefault('fields', self._parse_lista_param('fields'))
+            kwargs.setdefault('expand', self._parse_lista_param('expand'))
+        return super().get_serializer(*args, **kwargs)
+    
+    def list(self, request, *args, **kwargs):
+        """Listagem (quadro Kanban) com GET condicional: 304 sem serializar se nada mudou"""
+        versao = versao_cards(self.filter_queryset(Card.objects.all()))
+        etag = gerar_etag(request.get_full_path(), versao)
+        nao_modificado = resposta_condicional(request, etag)
+        if nao_modificado is not None:
+            return nao_modificado
+        return aplicar_validadores(super().list(request, *args, **kwargs), etag)
+    
     def perform_create(self, serializer):
         """Define o criado_por automaticamente ao criar um card"""
         serializer.save(criado_por=self.request.user)
@@ -138,22 +206,45 @@ class CardViewSet(viewsets.ModelViewSet):
         
         return super().destroy(request, *args, **kwargs)
     
+    @action(detail=False, methods=['post'], url_path='bulk')
+    def bulk(self, request):
+        """
+        Altera status, responsável, prioridade e/ou projeto de vários cards em uma única transação.
+
+        Corpo: {"operacoes": [{"cards": [1, 2], "status": "em_homologacao"},
+                              {"cards": [3], "responsavel": 7, "prioridade": "alta"}]}
+        Cada operação vira um UPDATE; o histórico e as notificações saem agregados (ver card_bulk.py).
+        Retorna os ids alterados e os cards informados já com os novos valores.
+        """
+        serializer = CardBulkUpdateSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        operacoes = serializer.validated_data['operacoes']
+        card_ids = [card_id for operacao in operacoes for card_id in operacao['cards']]
+
+        # Mesma regra do update: demandas só podem ser editadas pelo criador (ou supervisor/admin)
+        if request.user.role not in ['supervisor', 'admin']:
+            bloqueados = list(
+                Card.objects.filter(id__in=card_ids, projeto__nome=PROJETO_DEMANDAS)
+                .exclude(criado_por=request.user).values_list('id', flat=True)
+            )
+            if bloqueados:
+                raise PermissionDenied(f'Você só pode editar demandas que você mesmo criou: {sorted(bloqueados)}')
+
+        alterados = aplicar_operacoes(operacoes, usuario=request.user)
+        cards = carregar_cards_para_leitura(Card.objects.filter(id__in=card_ids).order_by('id'))
+        return Response({
+            'alterados': alterados,
+            'cards': CardSerializer(cards, many=True, context=self.get_serializer_context()).data,
+        })
+
     @action(detail=False, methods=['get'], url_path='priorities_view')
     def priorities_view(self, request):
         """Retorna usuários com seus cards em desenvolvimento para a página de Prioridades"""
         from django.contrib.auth import get_user_model
-        from django.utils import timezone
-        from datetime import timedelta, datetime
-        from .serializers import CardSerializer
-        from .models import CardLog, CardLogEventType
         
         User = get_user_model()
         periodo = request.query_params.get('periodo', 'dia')  # 'dia' ou 'semana'
-        
-        # Definir filtro de data baseado no período
         hoje = timezone.now().date()
-        inicio_hoje = timezone.make_aware(datetime.combine(hoje, datetime.min.time()))
-        fim_hoje = timezone.make_aware(datetime.combine(hoje, datetime.max.time()))
         
         # Buscar TODOS os usuários com cargos abaixo de supervisor (gerente, desenvolvedor, dados)
         usuarios_ativos = User.objects.filter(
@@ -162,13 +253,16 @@ class CardViewSet(viewsets.ModelViewSet):
             role__in=['supervisor', 'admin']
         )
         
+        cards_em_desenvolvimento = Card.objects.exclude(responsavel__isnull=True).exclude(
+            responsavel__role__in=['supervisor', 'admin']
+        )
         if periodo == 'dia':
             # Prioridades do dia: considerar apenas cards de sprints em andamento
             # Definição de sprint em andamento:
             # - sprint não finalizada
             # - data_inicio <= hoje <= data_fim
             # E com status relevantes ou finalizados hoje
-            cards_em_desenvolvimento = Card.objects.filter(
+            cards_em_desenvolvimento = cards_em_desenvolvimento.filter(
                 Q(status='em_desenvolvimento') |  # Cards em desenvolvimento
                 Q(status='em_homologacao') |  # Cards em homologação
                 Q(status='parado_pendencias') |  # Cards parados por pendências
@@ -177,57 +271,45 @@ class CardViewSet(viewsets.ModelViewSet):
                 projeto__sprint__finalizada=False,
                 projeto__sprint__data_inicio__lte=hoje,
                 projeto__sprint__data_fim__gte=hoje,
-            ).exclude(responsavel__isnull=True).exclude(
-                responsavel__role__in=['supervisor', 'admin']
-            ).select_related('responsavel', 'projeto')
-            
-            # Debug
-            print(f"[Priorities] Periodo: DIA - Cards encontrados: {cards_em_desenvolvimento.count()}")
-            for card in cards_em_desenvolvimento:
-                print(f"  - Card: {card.nome} | Status: {card.status} | Responsavel: {card.responsavel.username if card.responsavel else None} | Responsavel ID: {card.responsavel.id if card.responsavel else None}")
-            
+            )
         else:
             # Prioridades da semana: cards que vencem até o final da semana (7 dias)
             fim_semana = hoje + timedelta(days=7)
-            cards_em_desenvolvimento = Card.objects.filter(
+            cards_em_desenvolvimento = cards_em_desenvolvimento.filter(
                 status__in=['a_desenvolver', 'em_desenvolvimento', 'parado_pendencias', 'em_homologacao', 'finalizado']
-            ).exclude(responsavel__isnull=True).exclude(
-                responsavel__role__in=['supervisor', 'admin']
             ).filter(
                 Q(data_fim__gte=hoje, data_fim__lte=fim_semana) |
                 Q(status='finalizado', updated_at__date__gte=hoje, updated_at__date__lte=fim_semana)
             )
         
-        # Agrupar cards por responsável
+        # GET condicional: com a mesma versão de cards e usuários, 304 sem montar o quadro
+        versao_cards_quadro = versao_cards(cards_em_desenvolvimento)
+        versao_usuarios_quadro = versao_usuarios(usuarios_ativos)
+        etag = gerar_etag(request.get_full_path(), hoje.isoformat(), versao_cards_quadro, versao_usuarios_quadro)
+        nao_modificado = resposta_condicional(request, etag)
+        if nao_modificado is not None:
+            return nao_modificado
+        
+        # Cards, relacionamentos, TODOs e contagens em número fixo de consultas;
+        # agrupar por responsável em uma única passada
         cards_por_usuario = {}
-        for card in cards_em_desenvolvimento:
-            if card.responsavel:  # Verificação adicional de segurança
-                user_id = int(card.responsavel.id)  # Garantir que é int
-                if user_id not in cards_por_usuario:
-                    cards_por_usuario[user_id] = []
-                cards_por_usuario[user_id].append(card)
-                print(f"[Priorities] Card '{card.nome}' atribuído ao usuário {card.responsavel.username} (ID: {user_id})")
+        for card in carregar_cards_para_leitura(cards_em_desenvolvimento):
+            cards_por_usuario.setdefault(card.responsavel_id, []).append(card)
         
         # Ordenar cards por prioridade (absoluta > alta > media > baixa)
         prioridade_order = {'absoluta': 0, 'alta': 1, 'media': 2, 'baixa': 3}
-        for user_id in cards_por_usuario:
-            cards_por_usuario[user_id].sort(key=lambda c: (
+        for cards_do_usuario in cards_por_usuario.values():
+            cards_do_usuario.sort(key=lambda c: (
                 prioridade_order.get(c.prioridade, 99),
                 c.data_fim or c.data_inicio or c.created_at
             ))
         
         # Criar resultado incluindo TODOS os usuários (mesmo sem cards)
         result = []
-        usuarios_com_cards = 0
         for usuario in usuarios_ativos:
-            # Garantir que estamos usando o mesmo tipo de ID (int)
-            user_id = int(usuario.id)
-            cards_do_usuario = cards_por_usuario.get(user_id, [])
+            cards_do_usuario = cards_por_usuario.get(usuario.id, [])
             cards_serializados = CardSerializer(cards_do_usuario, many=True).data if cards_do_usuario else []
             
-            if cards_serializados:
-                usuarios_com_cards += 1
-            
             result.append({
                 'usuario': {
                     'id': usuario.id,
@@ -242,26 +324,13 @@ class CardViewSet(viewsets.ModelViewSet):
                 'cards': cards_serializados
             })
         
-        # Debug detalhado
-        print(f"[Priorities] Usuarios com cards: {usuarios_com_cards} de {len(usuarios_ativos)}")
-        print(f"[Priorities] Total de resultados: {len(result)}")
-        print(f"[Priorities] Cards por usuario (dict): {list(cards_por_usuario.keys())}")
-        for r in result:
-            if r['cards']:
-                print(f"  - {r['usuario']['username']} (ID: {r['usuario']['id']}): {len(r['cards'])} cards")
-                for card in r['cards']:
-                    print(f"    * {card.get('nome', 'N/A')} | Status: {card.get('status', 'N/A')}")
-            elif r['usuario']['username'] in ['jefferson', 'italo', 'ilton']:  # Usuários que devem ter cards
-                print(f"  - {r['usuario']['username']} (ID: {r['usuario']['id']}): SEM CARDS (esperado ter cards)")
-                print(f"    Cards no dict para este usuario: {cards_por_usuario.get(r['usuario']['id'], [])}")
-            
         # Ordenar: primeiro usuários com cards (por prioridade), depois sem cards
         result.sort(key=lambda x: (
             0 if x['cards'] else 1,  # Com cards primeiro
             prioridade_order.get(x['cards'][0]['prioridade'], 99) if x['cards'] else 99
         ))
         
-        return Response(result)
+        return aplicar_validadores(Response(result), etag)
 
 
 class CardTodoViewSet(viewsets.ModelViewSet):
@@ -312,20 +381,22 @@ class EventViewSet(viewsets.ModelViewSet):
     queryset = Event.objects.all()
     serializer_class = EventSerializer
     permission_classes = [IsAuthenticated]
-    filter_backends = [DjangoFilterBackend, filters.OrderingFilter]
+    filter_backends = [DjangoFilterBackend, OrdenacaoComDesempateFilter]
     filterset_fields = ['card', 'tipo', 'usuario']
     ordering_fields = ['data']
-    ordering = ['-data']
+    ordering = ['-data', '-id']
+    pagination_class = DataCursorPagination
 
 
 class CardLogViewSet(viewsets.ModelViewSet):
     queryset = CardLog.objects.all()
     serializer_class = CardLogSerializer
     permission_classes = [IsAuthenticated]
-    filter_backends = [DjangoFilterBackend, filters.OrderingFilter]
+    filter_backends = [DjangoFilterBackend, OrdenacaoComDesempateFilter]
     filterset_fields = ['card', 'tipo_evento', 'usuario']
     ordering_fields = ['data']
-    ordering = ['-data']
+    ordering = ['-data', '-id']
+    pagination_class = DataCursorPagination
 
     def perform_create(self, serializer):
         # Preencher o usuário automaticamente se não foi fornecido
@@ -334,14 +405,26 @@ class CardLogViewSet(viewsets.ModelViewSet):
         else:
             serializer.save()
 
+    @action(detail=False, methods=['get'])
+    def archived(self, request):
+        """Logs movidos para o arquivo pela retenção (sob demanda, ?card= obrigatório)"""
+        card_id = request.query_params.get('card', '')
+        if not card_id.isdigit():
+            raise ValidationError({'card': ['Informe o id do card.']})
+        queryset = ArchivedCardLog.objects.filter(card_id=card_id).select_related('usuario')
+        page = self.paginate_queryset(queryset)
+        serializer = ArchivedCardLogSerializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
+
 
 class NotificationViewSet(viewsets.ReadOnlyModelViewSet):
     serializer_class = NotificationSerializer
     permission_classes = [IsAuthenticated]
-    filter_backends = [DjangoFilterBackend, filters.OrderingFilter]
+    filter_backends = [DjangoFilterBackend, OrdenacaoComDesempateFilter]
     filterset_fields = ['tipo', 'lida']
     ordering_fields = ['data_criacao']
-    ordering = ['-data_criacao']
+    ordering = ['-data_criacao', '-id']
+    pagination_class = DataCriacaoCursorPagination
     
     def get_queryset(self):
         # Retornar apenas notificações do usuário atual
@@ -351,10 +434,7 @@ class NotificationViewSet(viewsets.ReadOnlyModelViewSet):
         filter_type = self.request.query_params.get('filter', None)
         if filter_type == 'mine':
             # Notificações específicas do usuário (excluir gerais como sprint criada)
-            from .models import NotificationType
-            queryset = queryset.exclude(tipo__in=[
-                NotificationType.SPRINT_CREATED
-            ])
+            queryset = queryset.exclude(tipo__in=TIPOS_NOTIFICACAO_GERAIS)
         
         return queryset
     
@@ -362,41 +442,31 @@ class NotificationViewSet(viewsets.ReadOnlyModelViewSet):
     def mark_as_read(self, request, pk=None):
         """Marcar uma notificação como lida"""
         notification = self.get_object()
-        notification.lida = True
-        notification.save()
+        if marcar_notificacao_como_lida(notification):
+            notificar_leitura(request.user.id, ids=[notification.id])
         serializer = self.get_serializer(notification)
         return Response(serializer.data)
     
     @action(detail=False, methods=['post'])
     def mark_all_as_read(self, request):
         """Marcar todas as notificações do usuário como lidas"""
-        count = Notification.objects.filter(
-            usuario=request.user,
-            lida=False
-        ).update(lida=True)
+        count = marcar_todas_como_lidas(request.user.id)
+        if count:
+            notificar_leitura(request.user.id, todas=True)
         return Response({'count': count})
     
+    @action(detail=False, methods=['get'])
+    def archived(self, request):
+        """Notificações lidas movidas para o arquivo pela retenção (sob demanda)"""
+        queryset = ArchivedNotification.objects.filter(usuario=request.user)
+        page = self.paginate_queryset(queryset)
+        serializer = ArchivedNotificationSerializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
+    
     @action(detail=False, methods=['get'])
     def unread_count(self, request):
-        """Contar notificações não lidas"""
-        count = Notification.objects.filter(
-            usuario=request.user,
-            lida=False
-        ).count()
-        
-        # Contar notificações específicas do usuário (excluindo gerais)
-        from .models import NotificationType
-        mine_count = Notification.objects.filter(
-            usuario=request.user,
-            lida=False
-        ).exclude(tipo__in=[
-            NotificationType.SPRINT_CREATED
-        ]).count()
-        
-        return Response({
-            'total': count,
-            'mine': mine_count
-        })
+        """Contar notificações não lidas (respondido pelo contador do usuário, sem COUNT na tabela)"""
+        return Response(obter_contadores_nao_lidas(request.user.id))
 
 
 class WeeklyPriorityConfigViewSet(viewsets.ModelViewSet):
@@ -453,7 +523,7 @@ class WeeklyPriorityConfigViewSet(viewsets.ModelViewSet):
         semana_inicio = hoje - timedelta(days=dias_ate_segunda)
         
         config = WeeklyPriorityConfig.get_config()
-        config.fechar_semana(semana_inicio)
+        config.fechar_semana(semana_inicio, usuario=request.user)
         
         return Response({
             'message': 'Semana fechada com sucesso.',
@@ -477,13 +547,11 @@ class WeeklyPriorityConfigViewSet(viewsets.ModelViewSet):
         if not config.is_semana_fechada(semana_inicio):
             raise ValidationError("A semana deve estar fechada antes de limpar as prioridades.")
         
-        # Deletar todas as prioridades da semana atual
-        priorities = WeeklyPriority.objects.filter(semana_inicio=semana_inicio)
-        count = priorities.count()
-        priorities.delete()
-        
-        # Abrir a semana novamente para permitir novas prioridades
-        config.abrir_semana(semana_inicio)
+        with transaction.atomic():
+            # DELETE único (sem carregar as linhas); o retorno já traz a quantidade removida
+            count = WeeklyPriority.objects.filter(semana_inicio=semana_inicio).delete()[0]
+            # Abrir a semana novamente para permitir novas prioridades
+            config.abrir_semana(semana_inicio)
         
         return Response({
             'message': f'{count} prioridade(s) removida(s) com sucesso.',
@@ -501,8 +569,19 @@ class WeeklyPriorityViewSet(viewsets.ModelViewSet):
     ordering_fields = ['semana_inicio', 'usuario']
     ordering = ['-semana_inicio', 'usuario']
     
+    @staticmethod
+    def _preparar_leitura(queryset):
+        """Conclusão/atraso anotados no SQL e card_detail carregado em lote (número fixo de consultas)"""
+        return anotar_situacao_prioridades(
+            queryset.select_related('usuario', 'definido_por')
+        ).prefetch_related(Prefetch('card', queryset=anotar_cards_para_leitura(Card.objects.all())))
+
     def get_queryset(self):
-        queryset = WeeklyPriority.objects.select_related('usuario', 'card', 'definido_por')
+        queryset = WeeklyPriority.objects.all()
+        if self.action in ('list', 'retrieve'):
+            queryset = self._preparar_leitura(queryset)
+        else:
+            queryset = queryset.select_related('usuario', 'card', 'definido_por')
         
         # Filtrar por semana atual se não especificado
         semana = self.request.query_params.get('semana', None)
@@ -577,12 +656,17 @@ class WeeklyPriorityViewSet(viewsets.ModelViewSet):
         semana_inicio = hoje - timedelta(days=dias_ate_segunda)
         semana_fim = semana_inicio + timedelta(days=4)  # Sexta-feira
         
-        priorities = WeeklyPriority.objects.filter(
-            semana_inicio=semana_inicio
-        ).select_related('usuario', 'card', 'definido_por')
+        escopo = WeeklyPriority.objects.filter(semana_inicio=semana_inicio)
         
-        serializer = self.get_serializer(priorities, many=True)
-        return Response(serializer.data)
+        # GET condicional: 304 sem serializar se as prioridades (e o atraso) não mudaram
+        versao = versao_prioridades(escopo)
+        etag = gerar_etag(request.get_full_path(), semana_inicio.isoformat(), marco_prazo_prioridades(), versao)
+        nao_modificado = resposta_condicional(request, etag)
+        if nao_modificado is not None:
+            return nao_modificado
+        
+        serializer = self.get_serializer(self._preparar_leitura(escopo), many=True)
+        return aplicar_validadores(Response(serializer.data), etag)
     
     @action(detail=False, methods=['get'], url_path='priorities_view')
     def priorities_view(self, request):
@@ -591,55 +675,70 @@ class WeeklyPriorityViewSet(viewsets.ModelViewSet):
         # Calcular segunda-feira da semana atual
         dias_ate_segunda = hoje.weekday()  # 0 = segunda, 6 = domingo
         semana_inicio = hoje - timedelta(days=dias_ate_segunda)
-        semana_fim = semana_inicio + timedelta(days=4)  # Sexta-feira
         
-        # Buscar TODOS os usuários com cargos abaixo de supervisor
+        # GET condicional: prioridades, usuários, fechamento da semana e atraso na versão
+        versao = versao_prioridades(WeeklyPriority.objects.filter(semana_inicio=semana_inicio))
+        versao_usuarios_quadro = versao_usuarios(self._usuarios_quadro())
+        semana_fechada = WeeklyPriorityConfig.get_config().is_semana_fechada(semana_inicio)
+        etag = gerar_etag(
+            request.get_full_path(), semana_inicio.isoformat(), semana_fechada, marco_prazo_prioridades(),
+            versao, versao_usuarios_quadro
+        )
+        nao_modificado = resposta_condicional(request, etag)
+        if nao_modificado is not None:
+            return nao_modificado
+        return aplicar_validadores(Response(self._quadro_prioridades(request, semana_inicio)), etag)
+
+    @staticmethod
+    def _usuarios_quadro():
+        """TODOS os usuários com cargos abaixo de supervisor"""
         from django.contrib.auth import get_user_model
         User = get_user_model()
-        usuarios_ativos = User.objects.filter(
+        return User.objects.filter(
             is_active=True
         ).exclude(
             role__in=['supervisor', 'admin']
         )
+
+    def _quadro_prioridades(self, request, semana_inicio):
+        """Quadro da semana: todos os usuários abaixo de supervisor com os cards priorizados"""
+        usuarios_ativos = self._usuarios_quadro()
         
         # Verificar se a semana está fechada
         config = WeeklyPriorityConfig.get_config()
         semana_fechada = config.is_semana_fechada(semana_inicio)
         
-        # Buscar prioridades da semana atual
-        priorities = WeeklyPriority.objects.filter(
-            semana_inicio=semana_inicio
-        ).select_related('usuario', 'card', 'definido_por', 'card__projeto')
-        
-        # Criar dicionário de prioridades por usuário (lista de prioridades)
+        # Prioridades da semana com conclusão/atraso calculados no SQL (uma consulta)
+        priorities = anotar_situacao_prioridades(
+            WeeklyPriority.objects.filter(semana_inicio=semana_inicio)
+        ).values('id', 'usuario_id', 'card_id', 'semana_inicio', 'semana_fim', 'concluido_anotado', 'atrasado_anotado').order_by('id')
         priorities_por_usuario = {}
         for priority in priorities:
-            user_id = int(priority.usuario.id)
-            if user_id not in priorities_por_usuario:
-                priorities_por_usuario[user_id] = []
-            priorities_por_usuario[user_id].append(priority)
+            priorities_por_usuario.setdefault(priority['usuario_id'], []).append(priority)
+        
+        # Todos os cards priorizados serializados em uma única passada (TODOs e contagens em número fixo de consultas)
+        card_ids = {priority['card_id'] for priority in priorities}
+        cards = carregar_cards_para_leitura(Card.objects.filter(id__in=card_ids)) if card_ids else []
+        cards_por_id = {
+            card_data['id']: card_data
+            for card_data in CardSerializer(cards, many=True).data
+        }
         
         # Criar resultado incluindo TODOS os usuários
         result = []
         for usuario in usuarios_ativos:
-            user_priorities = priorities_por_usuario.get(int(usuario.id), [])
-            
-            if user_priorities:
-                # Serializar todos os cards das prioridades
-                cards_serializados = []
-                for priority in user_priorities:
-                    card_data = CardSerializer(priority.card).data
-                    priority_data = {
-                        'id': str(priority.id),
-                        'is_concluido': priority.is_concluido(),
-                        'is_atrasado': priority.is_atrasado(),
-                        'semana_inicio': priority.semana_inicio.isoformat(),
-                        'semana_fim': priority.semana_fim.isoformat(),
-                    }
-                    card_data['weekly_priority'] = priority_data
-                    cards_serializados.append(card_data)
-            else:
-                cards_serializados = []
+            cards_serializados = []
+            for priority in priorities_por_usuario.get(usuario.id, []):
+                # Cópia: o mesmo card pode ser prioridade de mais de um usuário
+                card_data = dict(cards_por_id[priority['card_id']])
+                card_data['weekly_priority'] = {
+                    'id': str(priority['id']),
+                    'is_concluido': priority['concluido_anotado'],
+                    'is_atrasado': priority['atrasado_anotado'],
+                    'semana_inicio': priority['semana_inicio'].isoformat(),
+                    'semana_fim': priority['semana_fim'].isoformat(),
+                }
+                cards_serializados.append(card_data)
             
             result.append({
                 'usuario': {
@@ -661,8 +760,58 @@ class WeeklyPriorityViewSet(viewsets.ModelViewSet):
             x['usuario']['username'] # Ordenar por nome de usuário se não tiver cards
         ))
         
-        return Response({
+        return {
             'semana_fechada': semana_fechada,
             'semana_inicio': semana_inicio.isoformat(),
             'data': result
+        }
+
+    @action(detail=False, methods=['post'], url_path='bulk')
+    def bulk(self, request):
+        """
+        Aplica o plano de prioridades de uma semana em uma única transação.
+
+        Corpo: {"semana_inicio": "YYYY-MM-DD" (opcional, padrão semana atual), "substituir": false,
+                "plano": [{"usuario": 3, "cards": [10, 12]}, ...]}
+        Para cada usuário do plano, as prioridades da semana passam a ser exatamente os cards
+        informados (lista vazia remove todas). Com substituir=true, usuários fora do plano também
+        ficam sem prioridades. Retorna o quadro resultante (mesmo formato de priorities_view).
+        """
+        if request.user.role not in ['supervisor', 'admin']:
+            raise PermissionDenied("Apenas supervisores e administradores podem definir prioridades semanais.")
+
+        serializer = WeeklyPriorityPlanSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        dados = serializer.validated_data
+
+        semana_inicio = dados.get('semana_inicio')
+        if semana_inicio is None:
+            hoje = timezone.now().date()
+            semana_inicio = hoje - timedelta(days=hoje.weekday())
+        semana_fim = semana_inicio + timedelta(days=4)  # Sexta-feira
+
+        desejados = {(item['usuario'], card_id) for item in dados['plano'] for card_id in item['cards']}
+        atuais = WeeklyPriority.objects.filter(semana_inicio=semana_inicio)
+        if not dados['substituir']:
+            atuais = atuais.filter(usuario_id__in=[item['usuario'] for item in dados['plano']])
+
+        with transaction.atomic():
+            existentes = {(usuario_id, card_id): pk for pk, usuario_id, card_id in atuais.values_list('id', 'usuario_id', 'card_id')}
+            remover = [pk for par, pk in existentes.items() if par not in desejados]
+            removidas = WeeklyPriority.objects.filter(id__in=remover).delete()[0] if remover else 0
+            criadas = WeeklyPriority.objects.bulk_create([
+                WeeklyPriority(
+                    usuario_id=usuario_id,
+                    card_id=card_id,
+                    semana_inicio=semana_inicio,
+                    semana_fim=semana_fim,
+                    definido_por=request.user,
+                )
+                for usuario_id, card_id in sorted(desejados - existentes.keys())
+            ], batch_size=500, ignore_conflicts=True)
+
+        return Response({
+            'criadas': len(criadas),
+            'removidas': removidas,
+            **self._quadro_prioridades(request, semana_inicio),
         })
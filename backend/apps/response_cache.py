@@ -0,0 +1,183 @@
+"""
+Cache de respostas das listagens de referência.
+
+Sprints, projetos, times, hierarquia, posições do organograma e usuários mudam pouco
+e são pedidos a cada carregamento de página. A resposta serializada fica no cache com
+a chave formada por grupo, versão do grupo, URL completa (endpoint + query params) e
+escopo de permissão (cargo do usuário). Os signals de post_save / post_delete dos
+modelos envolvidos só incrementam a versão dos grupos após o commit: as entradas
+antigas deixam de ser lidas e expiram sozinhas.
+
+Backend: o alias RESPONSE_CACHE_ALIAS de settings.CACHES (Redis em produção, ver
+CACHE_REDIS_URL). Se o alias não existir ou o backend falhar, usa um cache em memória
+do próprio processo. Com cache em memória a invalidação só alcança o processo que
+gravou, por isso o tempo de vida ali é curto (RESPONSE_CACHE_LOCAL_TIMEOUT).
+
+Métricas: acertos e faltas por grupo, no mesmo backend (metricas() e o comando
+response_cache_stats).
+
+Uso:
+    class SprintViewSet(viewsets.ModelViewSet):
+        @resposta_em_cache('sprints')
+        def list(self, request, *args, **kwargs):
+            return super().list(request, *args, **kwargs)
+"""
+import functools
+import hashlib
+import logging
+import time
+
+from django.conf import settings
+from django.core.cache import caches, InvalidCacheBackendError
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import transaction
+from rest_framework.response import Response
+
+logger = logging.getLogger(__name__)
+
+PREFIXO = 'respostas'
+
+# Grupos invalidados juntos; cada endpoint em cache pertence a um deles
+GRUPOS = ('sprints', 'projects', 'teams', 'hierarchy', 'node_positions', 'users')
+
+_cache_local = LocMemCache('respostas-local', {'OPTIONS': {'MAX_ENTRIES': 1000}})
+
+
+def _timeout_local():
+    return getattr(settings, 'RESPONSE_CACHE_LOCAL_TIMEOUT', 30)
+
+
+def _backend():
+    """(cache, timeout) do alias configurado, ou a memória local do processo"""
+    try:
+        cache = caches[getattr(settings, 'RESPONSE_CACHE_ALIAS', 'default')]
+    except InvalidCacheBackendError:
+        return _cache_local, _timeout_local()
+    if isinstance(cache, LocMemCache):
+        return cache, _timeout_local()
+    return cache, getattr(settings, 'RESPONSE_CACHE_TIMEOUT', 300)
+
+
+def _executar(operacao):
+    """Executa operacao(cache, timeout) no backend; se ele falhar (ex.: Redis fora do ar), na memória local"""
+    cache, timeout = _backend()
+    try:
+        return operacao(cache, timeout)
+    except Exception as e:
+        if cache is _cache_local:
+            raise
+        logger.warning(f'Cache de respostas indisponivel ({e}). Usando memoria local.')
+        return operacao(_cache_local, _timeout_local())
+
+
+def _incrementar(cache, chave):
+    try:
+        return cache.incr(chave)
+    except ValueError:
+        # Chave ausente (primeiro uso ou expulsa do cache)
+        if cache.add(chave, 1, None):
+            return 1
+        return cache.incr(chave)
+
+
+def _chave_versao(grupo):
+    return f'{PREFIXO}:versao:{grupo}'
+
+
+def _versao(cache, grupo):
+    chave = _chave_versao(grupo)
+    versao = cache.get(chave)
+    if versao is None:
+        # Valor novo a cada recriação: nunca coincide com uma versão já usada (e expulsa) antes
+        cache.add(chave, time.time_ns(), None)
+        versao = cache.get(chave)
+    return versao
+
+
+def invalidar(*grupos):
+    """Nova versão dos grupos: as respostas guardadas deixam de ser usadas"""
+    def operacao(cache, timeout):
+        for grupo in grupos:
+            try:
+                cache.incr(_chave_versao(grupo))
+            except ValueError:
+                cache.set(_chave_versao(grupo), time.time_ns(), None)
+    _executar(operacao)
+
+
+def invalidar_apos_commit(*grupos):
+    """Invalida quando a transação atual for confirmada (imediatamente se não houver transação)"""
+    transaction.on_commit(lambda: invalidar(*grupos))
+
+
+def _registrar(cache, grupo, resultado):
+    _incrementar(cache, f'{PREFIXO}:metricas:{grupo}:{resultado}')
+
+
+def metricas():
+    """Acertos, faltas e taxa de acerto por grupo (contadores do backend em uso)"""
+    def operacao(cache, timeout):
+        chaves = [f'{PREFIXO}:metricas:{grupo}:{resultado}' for grupo in GRUPOS for resultado in ('acertos', 'faltas')]
+        return cache.get_many(chaves)
+
+    valores = _executar(operacao)
+    resultado = {}
+    for grupo in GRUPOS:
+        acertos = valores.get(f'{PREFIXO}:metricas:{grupo}:acertos', 0)
+        faltas = valores.get(f'{PREFIXO}:metricas:{grupo}:faltas', 0)
+        total = acertos + faltas
+        resultado[grupo] = {
+            'acertos': acertos,
+            'faltas': faltas,
+            'taxa_acerto': round(acertos / total, 3) if total else None,
+        }
+    return resultado
+
+
+def zerar_metricas():
+    _executar(lambda cache, timeout: cache.delete_many([
+        f'{PREFIXO}:metricas:{grupo}:{resultado}' for grupo in GRUPOS for resultado in ('acertos', 'faltas')
+    ]))
+
+
+def escopo_por_cargo(request):
+    """Escopo de permissão padrão: usuários do mesmo cargo recebem a mesma resposta"""
+    return getattr(request.user, 'role', '') or ''
+
+
+def resposta_em_cache(grupo, escopo=escopo_por_cargo):
+    """
+    Decorator para métodos GET de ViewSets: devolve a resposta guardada se o grupo não
+    mudou desde então; senão executa a view e guarda as respostas 200.
+    escopo(request) entra na chave; use quando a resposta depende de quem pede.
+    """
+    def decorador(metodo):
+        @functools.wraps(metodo)
+        def wrapper(self, request, *args, **kwargs):
+            if request.method != 'GET':
+                return metodo(self, request, *args, **kwargs)
+
+            identificador = hashlib.md5(
+                f'{request.build_absolute_uri()}|{escopo(request)}'.encode('utf-8'), usedforsecurity=False
+            ).hexdigest()
+
+            def buscar(cache, timeout):
+                chave = f'{PREFIXO}:{grupo}:{_versao(cache, grupo)}:{identificador}'
+                guardada = cache.get(chave)
+                _registrar(cache, grupo, 'acertos' if guardada is not None else 'faltas')
+                return chave, guardada
+
+            chave, guardada = _executar(buscar)
+            if guardada is not None:
+                status_code, data = guardada
+                response = Response(data, status=status_code)
+                response['X-Cache'] = 'HIT'
+                return response
+
+            response = metodo(self, request, *args, **kwargs)
+            if response.status_code == 200:
+                _executar(lambda cache, timeout: cache.set(chave, (response.status_code, response.data), timeout))
+            response['X-Cache'] = 'MISS'
+            return response
+        return wrapper
+    return decorador
@@ -0,0 +1,22 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from apps.response_cache import invalidar_apos_commit
+from .models import Team, Hierarchy, NodePosition
+
+
+@receiver(post_save, sender=Team)
+@receiver(post_delete, sender=Team)
+def team_alterado(sender, instance, **kwargs):
+    invalidar_apos_commit('teams')
+
+
+@receiver(post_save, sender=Hierarchy)
+@receiver(post_delete, sender=Hierarchy)
+def hierarchy_alterada(sender, instance, **kwargs):
+    invalidar_apos_commit('hierarchy')
+
+
+@receiver(post_save, sender=NodePosition)
+@receiver(post_delete, sender=NodePosition)
+def node_position_alterada(sender, instance, **kwargs):
+    invalidar_apos_commit('node_positions')
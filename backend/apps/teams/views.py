@@ -3,6 +3,7 @@ from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from django_filters.rest_framework import DjangoFilterBackend
+from apps.response_cache import resposta_em_cache
 from .models import Team, TeamMember, Hierarchy, NodePosition
 from .serializers import TeamSerializer, TeamMemberSerializer, HierarchySerializer, NodePositionSerializer
 
@@ -17,6 +18,10 @@ class TeamViewSet(viewsets.ModelViewSet):
     ordering_fields = ['nome', 'created_at']
     ordering = ['-created_at']
 
+    @resposta_em_cache('teams')
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+
 
 class TeamMemberViewSet(viewsets.ModelViewSet):
     queryset = TeamMember.objects.all()
@@ -37,6 +42,10 @@ class HierarchyViewSet(viewsets.ModelViewSet):
     ordering_fields = ['created_at']
     ordering = ['-created_at']
 
+    @resposta_em_cache('hierarchy')
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+
 
 class NodePositionViewSet(viewsets.ModelViewSet):
     queryset = NodePosition.objects.all()
@@ -65,6 +74,7 @@ class NodePositionViewSet(viewsets.ModelViewSet):
             return Response(serializer.data, status=status.HTTP_201_CREATED)
     
     @action(detail=False, methods=['get'])
+    @resposta_em_cache('node_positions')
     def bulk(self, request):
         """Retorna todas as posições dos nodes"""
         positions = NodePosition.objects.all()
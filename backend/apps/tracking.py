@@ -0,0 +1,70 @@
+"""
+Rastreamento de campos em memória.
+
+Os signals de pre_save precisavam buscar a versão anterior do registro no banco
+(Model.objects.get(pk=...)) só para descobrir o que mudou. Com o FieldTrackerMixin
+o modelo guarda uma cópia dos campos rastreados quando é carregado do banco e
+depois de cada save, e os signals comparam contra essa cópia sem nenhuma consulta.
+"""
+import copy
+
+
+class FieldTrackerMixin:
+    """
+    Mixin para modelos que precisam detectar mudanças de campos.
+
+    Uso:
+        class Card(FieldTrackerMixin, models.Model):
+            tracked_fields = ('status', 'responsavel_id')
+
+    Os nomes em tracked_fields são attnames (para FKs use '<campo>_id').
+    Instâncias que não vieram do banco (ou com campos adiados via only/defer)
+    não têm snapshot completo; nesse caso get_tracked_snapshot() retorna None
+    e quem chama deve recorrer ao banco.
+    """
+
+    tracked_fields = ()
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._snapshot_tracked_fields()
+        return instance
+
+    def _snapshot_tracked_fields(self, campos=None):
+        carregados = self.__dict__
+        snapshot = {}
+        if campos is not None:
+            # Save parcial (update_fields): só os campos gravados passam a ser a nova base
+            snapshot = dict(getattr(self, '_tracked_snapshot', None) or {})
+        for nome in self.tracked_fields if campos is None else campos:
+            if nome not in carregados:
+                # Campo adiado: o snapshot fica incompleto
+                continue
+            valor = carregados[nome]
+            # JSONField pode ser alterado in-place; copiar para não comparar o objeto com ele mesmo
+            if isinstance(valor, (list, dict)):
+                valor = copy.deepcopy(valor)
+            snapshot[nome] = valor
+        self._tracked_snapshot = snapshot
+
+    def get_tracked_snapshot(self):
+        """Valores dos campos rastreados no último carregamento/save, ou None se indisponível"""
+        snapshot = getattr(self, '_tracked_snapshot', None)
+        if snapshot is None or len(snapshot) != len(self.tracked_fields):
+            return None
+        return snapshot
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        # Os signals de post_save já rodaram contra o snapshot antigo; agora o estado salvo é a nova base
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None:
+            self._snapshot_tracked_fields()
+        else:
+            attnames = {self._meta.get_field(nome).attname for nome in update_fields}
+            self._snapshot_tracked_fields([nome for nome in self.tracked_fields if nome in attnames])
+
+    def refresh_from_db(self, *args, **kwargs):
+        super().refresh_from_db(*args, **kwargs)
+        self._snapshot_tracked_fields()
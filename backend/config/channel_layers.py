@@ -0,0 +1,54 @@
+"""
+Configuração do channel layer (Django Channels).
+
+- memory: InMemoryChannelLayer, só entrega dentro do mesmo processo (desenvolvimento).
+- redis: channels_redis com sharding: cada host em CHANNEL_REDIS_HOSTS é um shard e
+  canais/grupos são distribuídos entre eles por hash consistente.
+- redis_pubsub: RedisPubSubChannelLayer (pub/sub puro, sem fila por canal); menor
+  latência, mas mensagens para consumidores desconectados são perdidas.
+
+Com mais de um processo (Daphne + workers Celery), use redis ou redis_pubsub:
+notificações enviadas por um processo só chegam aos sockets de outro via Redis.
+"""
+
+BACKENDS = {
+    'memory': 'channels.layers.InMemoryChannelLayer',
+    'redis': 'channels_redis.core.RedisChannelLayer',
+    'redis_pubsub': 'channels_redis.pubsub.RedisPubSubChannelLayer',
+}
+
+
+def build_channel_layers(backend='memory', hosts=None, prefix='bwaproj', expiry=30,
+                         group_expiry=86400, capacity=100, channel_capacity=None):
+    """
+    Monta o dicionário CHANNEL_LAYERS.
+
+    expiry: segundos que uma mensagem espera na fila de um canal antes de ser descartada
+    (notificações são persistidas no banco, então não vale segurar mensagens antigas).
+    group_expiry: segundos até uma inscrição em grupo expirar sem group_discard
+    (deve ser maior que a duração esperada de uma conexão WebSocket).
+    capacity: mensagens por canal antes de o envio para ele ser recusado (ChannelFull).
+    channel_capacity: capacidades específicas por padrão de nome, ex. {'user_*': 200}.
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f"CHANNEL_LAYER_BACKEND inválido: {backend!r} (use {', '.join(BACKENDS)})")
+
+    if backend == 'memory':
+        return {
+            'default': {
+                'BACKEND': BACKENDS['memory'],
+                'CONFIG': {'expiry': expiry, 'group_expiry': group_expiry, 'capacity': capacity},
+            },
+        }
+
+    hosts = list(hosts or ['redis://127.0.0.1:6379/1'])
+    config = {'hosts': hosts, 'prefix': prefix}
+    if backend == 'redis':
+        config.update({
+            'expiry': expiry,
+            'group_expiry': group_expiry,
+            'capacity': capacity,
+        })
+        if channel_capacity:
+            config['channel_capacity'] = channel_capacity
+    return {'default': {'BACKEND': BACKENDS[backend], 'CONFIG': config}}
@@ -13,6 +13,7 @@ https://docs.djangoproject.com/en/5.2/ref/settings/
 from pathlib import Path
 import os
 from dotenv import load_dotenv
+from config.channel_layers import build_channel_layers
 
 load_dotenv()
 
@@ -172,7 +173,8 @@ AUTH_USER_MODEL = 'accounts.User'
 # REST Framework configuration
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework.authentication.TokenAuthentication',
+        # TokenAuthentication com cache (compartilhado com o WebSocket, ver apps/accounts/authentication.py)
+        'apps.accounts.authentication.CachedTokenAuthentication',
         'rest_framework.authentication.SessionAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
@@ -230,14 +232,50 @@ CSRF_COOKIE_SECURE = False
 LANGUAGE_CODE = 'pt-br'
 TIME_ZONE = 'America/Sao_Paulo'
 
-# Channels configuration
-# Usar InMemoryChannelLayer para desenvolvimento (não requer Redis)
-# Para produção, usar Redis: 'BACKEND': 'channels_redis.core.RedisChannelLayer'
-CHANNEL_LAYERS = {
-    'default': {
-        'BACKEND': 'channels.layers.InMemoryChannelLayer',
-    },
-}
+# Cache
+# Sem CACHE_REDIS_URL: memória local (cada processo tem o seu).
+# Em produção: CACHE_REDIS_URL=redis://redis:6379/2 (compartilhado entre processos e workers)
+CACHE_REDIS_URL = os.getenv('CACHE_REDIS_URL', '')
+if CACHE_REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': CACHE_REDIS_URL,
+            'KEY_PREFIX': os.getenv('CACHE_KEY_PREFIX', 'bwaproj'),
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+
+# Cache de respostas das listagens de referência (ver apps/response_cache.py)
+RESPONSE_CACHE_ALIAS = os.getenv('RESPONSE_CACHE_ALIAS', 'default')
+RESPONSE_CACHE_TIMEOUT = int(os.getenv('RESPONSE_CACHE_TIMEOUT', '300'))
+# Com cache em memória a invalidação não chega aos outros processos: tempo de vida curto
+RESPONSE_CACHE_LOCAL_TIMEOUT = int(os.getenv('RESPONSE_CACHE_LOCAL_TIMEOUT', '30'))
+
+# Cache da autenticação por token (REST e WebSocket). Logout, troca de senha e desativação
+# invalidam as entradas; com cache em memória local isso só vale no processo atual, então
+# manter o tempo de vida curto
+AUTH_TOKEN_CACHE_ALIAS = os.getenv('AUTH_TOKEN_CACHE_ALIAS', 'default')
+AUTH_TOKEN_CACHE_TIMEOUT = int(os.getenv('AUTH_TOKEN_CACHE_TIMEOUT', '60'))
+
+# Channels configuration (ver config/channel_layers.py)
+# CHANNEL_LAYER_BACKEND=memory (padrão, não requer Redis) só entrega no mesmo processo.
+# Em produção, com workers Celery enviando notificações, usar redis:
+#   CHANNEL_LAYER_BACKEND=redis CHANNEL_REDIS_HOSTS=redis://redis-a:6379/1,redis://redis-b:6379/1
+# (cada host é um shard; grupos e canais são distribuídos entre eles)
+CHANNEL_LAYERS = build_channel_layers(
+    backend=os.getenv('CHANNEL_LAYER_BACKEND', 'memory'),
+    hosts=[h.strip() for h in os.getenv('CHANNEL_REDIS_HOSTS', 'redis://127.0.0.1:6379/1').split(',') if h.strip()],
+    prefix=os.getenv('CHANNEL_LAYER_PREFIX', 'bwaproj'),
+    expiry=int(os.getenv('CHANNEL_MESSAGE_EXPIRY', '30')),
+    group_expiry=int(os.getenv('CHANNEL_GROUP_EXPIRY', '86400')),
+    capacity=int(os.getenv('CHANNEL_CAPACITY', '100')),
+)
 
 # Celery configuration
 # Usar Redis se disponível, caso contrário usar broker em memória para desenvolvimento
@@ -266,8 +304,39 @@ CELERY_BEAT_SCHEDULE = {
         'task': 'apps.projects.tasks.finalizar_sprints_por_data',
         'schedule': crontab(hour=0, minute=0),  # Uma vez por dia à meia-noite
     },
+    'processar-outbox-notificacoes': {
+        'task': 'apps.projects.tasks.processar_outbox_notificacoes',
+        'schedule': 30.0,  # Varredura de segurança (o envio normal é disparado após cada commit)
+    },
+    'reconciliar-contadores-notificacoes': {
+        'task': 'apps.projects.tasks.reconciliar_contadores_notificacoes',
+        'schedule': crontab(minute=15),  # A cada hora
+    },
+    'arquivar-historico': {
+        'task': 'apps.projects.tasks.arquivar_historico',
+        'schedule': crontab(hour=3, minute=30),  # Uma vez por dia, fora do horário de uso
+    },
 }
 
+# Outbox de notificações: com True, entrega na própria requisição após o commit
+# (útil em desenvolvimento sem worker Celery). Em produção, deixar False.
+NOTIFICATION_OUTBOX_SINCRONO = os.getenv('NOTIFICATION_OUTBOX_SINCRONO', 'False').lower() == 'true'
+# Alterações de TODOs do mesmo card dentro desta janela viram um único aviso de resumo
+NOTIFICACAO_TODOS_JANELA_SEGUNDOS = int(os.getenv('NOTIFICACAO_TODOS_JANELA_SEGUNDOS', '60'))
+# Diretório de destinatários por cargo (apps/projects/recipients.py): sem cache compartilhado,
+# cada processo recarrega após este tempo para ver mudanças de cargo feitas em outro processo
+DESTINATARIOS_TTL_SEGUNDOS = int(os.getenv('DESTINATARIOS_TTL_SEGUNDOS', '300'))
+
+# Finalização de sprint: copiar também os TODOs (com status e comentários) dos cards replicados
+SPRINT_ROLLOVER_COPIAR_TODOS = os.getenv('SPRINT_ROLLOVER_COPIAR_TODOS', 'False').lower() == 'true'
+
+# Retenção do histórico (ver apps/projects/retention.py)
+RETENCAO_NOTIFICACOES_LIDAS_DIAS = int(os.getenv('RETENCAO_NOTIFICACOES_LIDAS_DIAS', '90'))
+RETENCAO_LOGS_SPRINT_FINALIZADA_DIAS = int(os.getenv('RETENCAO_LOGS_SPRINT_FINALIZADA_DIAS', '180'))
+RETENCAO_OUTBOX_PROCESSADA_DIAS = int(os.getenv('RETENCAO_OUTBOX_PROCESSADA_DIAS', '7'))
+ARQUIVAMENTO_TAMANHO_LOTE = int(os.getenv('ARQUIVAMENTO_TAMANHO_LOTE', '1000'))
+ARQUIVAMENTO_MAX_LOTES = int(os.getenv('ARQUIVAMENTO_MAX_LOTES', '50'))
+
 # Logging configuration
 LOGGING = {
     'version': 1,
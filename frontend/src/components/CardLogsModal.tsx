@@ -26,8 +26,12 @@ export function CardLogsModal({ cardId, isOpen, onClose, refreshTrigger }: CardL
   const [loading, setLoading] = useState(false);
   const [filter, setFilter] = useState<FilterType>('tudo');
   const [sortOrder, setSortOrder] = useState<SortOrder>('desc');
+  // Histórico arquivado (logs antigos de sprints finalizadas) só é buscado quando pedido
+  const [archivedLoaded, setArchivedLoaded] = useState(false);
+  const [loadingArchived, setLoadingArchived] = useState(false);
 
   useEffect(() => {
+    setArchivedLoaded(false);
     if (isOpen && cardId) {
       loadLogs();
     } else {
@@ -50,6 +54,23 @@ export function CardLogsModal({ cardId, isOpen, onClose, refreshTrigger }: CardL
     }
   };
 
+  const loadArchivedLogs = async () => {
+    if (!cardId) return;
+    setLoadingArchived(true);
+    try {
+      const archived = await cardLogService.getArchivedByCard(cardId);
+      setLogs((current) => {
+        const ids = new Set(current.map((log) => log.id));
+        return [...current, ...archived.filter((log) => !ids.has(log.id))];
+      });
+      setArchivedLoaded(true);
+    } catch (error) {
+      console.error('Erro ao carregar histórico arquivado:', error);
+    } finally {
+      setLoadingArchived(false);
+    }
+  };
+
   // Filtrar e ordenar logs
   const filteredAndSortedLogs = useMemo(() => {
     let filtered = [...logs];
@@ -292,6 +313,20 @@ export function CardLogsModal({ cardId, isOpen, onClose, refreshTrigger }: CardL
               </div>
             </div>
           )}
+          {!loading && !archivedLoaded && (
+            <div className="flex justify-center mt-[24px]">
+              <Button
+                variant="outline"
+                size="sm"
+                className="h-[32px] gap-[4px]"
+                onClick={loadArchivedLogs}
+                disabled={loadingArchived}
+              >
+                {loadingArchived && <Loader2 className="h-[14px] w-[14px] animate-spin" />}
+                Carregar histórico arquivado
+              </Button>
+            </div>
+          )}
         </div>
       </div>
     </div>
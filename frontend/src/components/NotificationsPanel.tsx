@@ -53,6 +53,8 @@ export function NotificationsPanel({ onClose }: NotificationsPanelProps) {
         return 'bg-indigo-500';
       case 'project_created':
         return 'bg-cyan-500';
+      case 'sprint_rollover':
+        return 'bg-indigo-400';
       case 'role_changed':
         return 'bg-yellow-500';
       case 'card_overdue':
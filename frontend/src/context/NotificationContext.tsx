@@ -1,7 +1,7 @@
 import { createContext, useContext, useState, useEffect, useCallback } from 'react';
 import type { ReactNode } from 'react';
 import { notificationService, type Notification } from '@/services/notificationService';
-import { useWebSocket } from '@/hooks/useWebSocket';
+import { useWebSocket, type NotificationReadEvent, type NotificationSnapshot, type UnreadCounts } from '@/hooks/useWebSocket';
 import { useAuth } from './AuthContext';
 
 type NotificationFilter = 'all' | 'mine' | 'unread';
@@ -70,7 +70,7 @@ export function NotificationProvider({ children }: { children: ReactNode }) {
   }, [isAuthenticated]);
 
   // Handler para notificações recebidas via WebSocket
-  const handleNotification = useCallback((notification: Notification) => {
+  const handleNotification = useCallback((notification: Notification, delta?: UnreadCounts) => {
     console.log('[NotificationContext] Nova notificação recebida via WebSocket:', notification);
     
     // Adicionar nova notificação no início da lista (evitando duplicatas)
@@ -86,23 +86,10 @@ export function NotificationProvider({ children }: { children: ReactNode }) {
       return [notification, ...prev];
     });
     
-    // Atualizar contadores
-    if (!notification.lida) {
-      setUnreadCount((prev) => {
-        const newCount = prev + 1;
-        console.log('[NotificationContext] Contador de não lidas atualizado:', newCount);
-        return newCount;
-      });
-      
-      // Verificar se é notificação específica do usuário
-      const generalTypes = ['sprint_created'];
-      if (!generalTypes.includes(notification.tipo)) {
-        setMineCount((prev) => {
-          const newCount = prev + 1;
-          console.log('[NotificationContext] Contador de minhas atualizado:', newCount);
-          return newCount;
-        });
-      }
+    // Aplicar a variação de contadores calculada pelo servidor
+    if (delta) {
+      setUnreadCount((prev) => prev + delta.total);
+      setMineCount((prev) => prev + delta.mine);
     }
     
     // Disparar evento customizado para atualização em tempo real
@@ -114,35 +101,50 @@ export function NotificationProvider({ children }: { children: ReactNode }) {
     );
   }, []);
 
-  // Conectar WebSocket
+  // Snapshot enviado pelo servidor ao conectar: contadores exatos e não lidas recentes
+  const handleSnapshot = useCallback((snapshot: NotificationSnapshot) => {
+    setUnreadCount(snapshot.counts.total);
+    setMineCount(snapshot.counts.mine);
+    setNotifications((prev) => {
+      const known = new Set(prev.map((n) => n.id));
+      const missing = snapshot.notifications.filter((n) => !known.has(n.id));
+      if (!missing.length) return prev;
+      return [...missing, ...prev].sort(
+        (a, b) => new Date(b.data_criacao).getTime() - new Date(a.data_criacao).getTime()
+      );
+    });
+  }, []);
+
+  // Leituras feitas em qualquer aba/dispositivo: o servidor envia os contadores já atualizados
+  const handleRead = useCallback((event: NotificationReadEvent) => {
+    const ids = new Set(event.ids);
+    setNotifications((prev) =>
+      prev.map((n) => (event.all || ids.has(n.id) ? { ...n, lida: true } : n))
+    );
+    setUnreadCount(event.counts.total);
+    setMineCount(event.counts.mine);
+  }, []);
+
+  // Conectar WebSocket (contadores chegam por ele; não há polling de unread_count)
   useWebSocket({
     onNotification: handleNotification,
+    onSnapshot: handleSnapshot,
+    onRead: handleRead,
     enabled: isAuthenticated,
   });
 
-  // Carregar notificações e contadores quando autenticado ou filtro mudar
+  // Carregar notificações quando autenticado ou filtro mudar
+  // (os contadores chegam pelo snapshot do WebSocket)
   useEffect(() => {
     if (isAuthenticated) {
       loadNotifications();
-      loadCounts();
     } else {
       setNotifications([]);
       setUnreadCount(0);
       setMineCount(0);
       setLoading(false);
     }
-  }, [isAuthenticated, filter, loadNotifications, loadCounts]);
-
-  // Recarregar contadores periodicamente (a cada 30 segundos)
-  useEffect(() => {
-    if (!isAuthenticated) return;
-
-    const interval = setInterval(() => {
-      loadCounts();
-    }, 30000);
-
-    return () => clearInterval(interval);
-  }, [isAuthenticated, loadCounts]);
+  }, [isAuthenticated, filter, loadNotifications]);
 
   // Marcar como lida
   const markAsRead = useCallback(async (id: string) => {
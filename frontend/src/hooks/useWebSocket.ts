@@ -1,17 +1,38 @@
 import { useEffect, useRef, useCallback } from 'react';
 import type { Notification } from '@/services/notificationService';
 
-type WebSocketMessage = {
-  type: 'notification' | 'pong';
-  data?: Notification;
+export type UnreadCounts = {
+  total: number;
+  mine: number;
 };
 
+export type NotificationSnapshot = {
+  counts: UnreadCounts;
+  notifications: Notification[];
+};
+
+export type NotificationReadEvent = {
+  ids: string[];
+  all: boolean;
+  counts: UnreadCounts;
+};
+
+type WebSocketMessage =
+  | { type: 'notification'; data: Notification; delta?: UnreadCounts }
+  | { type: 'snapshot'; data: NotificationSnapshot }
+  | ({ type: 'read' } & NotificationReadEvent)
+  | { type: 'pong' };
+
 type UseWebSocketOptions = {
-  onNotification?: (notification: Notification) => void;
+  onNotification?: (notification: Notification, delta?: UnreadCounts) => void;
+  // Enviado pelo servidor a cada conexão/reconexão: contadores e não lidas recentes
+  onSnapshot?: (snapshot: NotificationSnapshot) => void;
+  // Notificações marcadas como lidas (nesta ou em outra aba/dispositivo)
+  onRead?: (event: NotificationReadEvent) => void;
   enabled?: boolean;
 };
 
-export function useWebSocket({ onNotification, enabled = true }: UseWebSocketOptions) {
+export function useWebSocket({ onNotification, onSnapshot, onRead, enabled = true }: UseWebSocketOptions) {
   const wsRef = useRef<WebSocket | null>(null);
   const reconnectTimeoutRef = useRef<ReturnType<typeof setTimeout> | null>(null);
   const reconnectAttemptsRef = useRef(0);
@@ -71,7 +92,11 @@ export function useWebSocket({ onNotification, enabled = true }: UseWebSocketOpt
           
           if (message.type === 'notification' && message.data) {
             console.log('[WebSocket] Nova notificação recebida:', message.data);
-            onNotification?.(message.data);
+            onNotification?.(message.data, message.delta);
+          } else if (message.type === 'snapshot') {
+            onSnapshot?.(message.data);
+          } else if (message.type === 'read') {
+            onRead?.({ ids: message.ids, all: message.all, counts: message.counts });
           } else if (message.type === 'pong') {
             console.log('[WebSocket] Pong recebido - conexão viva');
           }
@@ -105,7 +130,7 @@ export function useWebSocket({ onNotification, enabled = true }: UseWebSocketOpt
     } catch (error) {
       console.error('Erro ao criar conexão WebSocket:', error);
     }
-  }, [enabled, onNotification]);
+  }, [enabled, onNotification, onSnapshot, onRead]);
 
   const disconnect = useCallback(() => {
     if (reconnectTimeoutRef.current) {
@@ -169,7 +169,7 @@ export default function Metrics() {
       setLoading(true);
       try {
         const [cardsRes, sprintsRes, usersRes, projectsRes] = await Promise.all([
-          cardService.getAll(),
+          cardService.getAll({ expand: ['projeto_detail'] }),
           sprintService.getAll(),
           userService.getAll(),
           projectService.getAll(),
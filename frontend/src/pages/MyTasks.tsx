@@ -600,22 +600,10 @@ export default function MyTasks() {
   
   const loadAllCards = useCallback(async () => {
     try {
-      const cards = await cardService.getAll();
       // Não filtrar aqui, deixar os filtros fazerem isso
-      // Carregar TODOs para cada card
-      const cardsWithTodos = await Promise.all(
-        cards.map(async (card) => {
-          try {
-            const todos = await cardTodoService.getByCard(card.id);
-            return { ...card, todos };
-          } catch (error) {
-            console.error(`Erro ao carregar TODOs do card ${card.id}:`, error);
-            return { ...card, todos: [] };
-          }
-        })
-      );
-      
-      setAllCards(cardsWithTodos);
+      // TODOs e projeto vêm na mesma listagem (expand), sem uma requisição por card
+      const cards = await cardService.getAll({ expand: ['projeto_detail', 'todos'] });
+      setAllCards(cards.map(card => ({ ...card, todos: card.todos || [] })));
     } catch (error) {
       console.error('Erro ao carregar todos os cards:', error);
     }
@@ -625,27 +613,14 @@ export default function MyTasks() {
     if (!user?.id) return;
     try {
       setLoading(true);
-      const allCards = await cardService.getByResponsavel(user.id);
+      const allCards = await cardService.getByResponsavel(user.id, { expand: ['projeto_detail', 'todos'] });
       
       // Filtrar por status baseado no período
       const filteredCards = periodo === 'concluidas'
         ? allCards.filter(card => card.status === 'finalizado')
         : allCards.filter(card => card.status !== 'finalizado');
       
-      // Carregar TODOs para cada card
-      const cardsWithTodos = await Promise.all(
-        filteredCards.map(async (card) => {
-          try {
-            const todos = await cardTodoService.getByCard(card.id);
-            return { ...card, todos };
-          } catch (error) {
-            console.error(`Erro ao carregar TODOs do card ${card.id}:`, error);
-            return { ...card, todos: [] };
-          }
-        })
-      );
-      
-      setCards(cardsWithTodos);
+      setCards(filteredCards.map(card => ({ ...card, todos: card.todos || [] })));
     } catch (error) {
       console.error('Erro ao carregar cards:', error);
     } finally {
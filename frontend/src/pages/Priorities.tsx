@@ -22,7 +22,7 @@ import { useAuth } from '@/context/AuthContext';
 import api from '@/services/api';
 import { cardService, type Card as CardType, CARD_AREAS, CARD_TYPES, CARD_PRIORITIES, CARD_STATUSES } from '@/services/cardService';
 import { userService, type User as UserType } from '@/services/userService';
-import { weeklyPriorityService } from '@/services/weeklyPriorityService';
+import { weeklyPriorityService, type WeeklyPriorityBoard } from '@/services/weeklyPriorityService';
 import { cn } from '@/lib/utils';
 // Formatação de data sem dependência externa
 
@@ -244,7 +244,7 @@ export default function Priorities() {
       setSelectedUserForPriority(userObj || null);
       
       // Carregar cards do usuário
-      const allCards = await cardService.getAll();
+      const allCards = await cardService.getAll({ expand: ['projeto_detail'] });
       const userCards = allCards.filter(card => 
         card.responsavel === user.id && 
         card.status !== 'finalizado' && 
@@ -280,126 +280,40 @@ export default function Priorities() {
     }
   };
 
+  // Atualizar a tela com o quadro devolvido pelo endpoint de plano (evita recarregar)
+  const applyBoard = async (board: WeeklyPriorityBoard) => {
+    if (periodo === 'semana') {
+      setSemanaFechada(board.semana_fechada || false);
+      setUsersWithCards(board.data || []);
+    } else {
+      await loadData();
+    }
+  };
+
   // Função para salvar prioridade da semana
   const handleSavePriority = async () => {
     if (!selectedUserForPriority) return;
     
-    // Permitir salvar mesmo sem seleção (para remover todas as prioridades)
-    if (selectedCardsForPriority.length === 0) {
-      // Se não há seleção, apenas deletar todas as prioridades existentes
-      const hoje = new Date();
-      const diasAteSegunda = hoje.getDay() === 0 ? 6 : hoje.getDay() - 1;
-      const segundaFeira = new Date(hoje);
-      segundaFeira.setDate(hoje.getDate() - diasAteSegunda);
-      const semanaInicio = segundaFeira.toISOString().split('T')[0];
-      
-      const existingPriorities = await weeklyPriorityService.getAll({ semana: semanaInicio });
-      const existingForUser = existingPriorities.filter(p => p.usuario === selectedUserForPriority.id);
-      
-      // Deletar todas as prioridades
-      for (const priority of existingForUser) {
-        await weeklyPriorityService.delete(priority.id);
-      }
-      
-      await loadData();
-      
-      // Disparar evento customizado para atualização em tempo real
-      window.dispatchEvent(
-        new CustomEvent('weeklyPriorityUpdated', {
-          detail: {
-            usuario: selectedUserForPriority.id,
-            action: 'deleted_all'
-          }
-        })
-      );
-      
-      setDefinePriorityDialogOpen(false);
-      setSelectedUserForPriority(null);
-      setSelectedCardsForPriority([]);
-      return;
-    }
-    
     try {
       setSavingPriority(true);
       
-      // Calcular segunda-feira e sexta-feira da semana atual
-      const hoje = new Date();
-      const diasAteSegunda = hoje.getDay() === 0 ? 6 : hoje.getDay() - 1; // 0 = domingo, 1 = segunda, etc.
-      const segundaFeira = new Date(hoje);
-      segundaFeira.setDate(hoje.getDate() - diasAteSegunda);
-      segundaFeira.setHours(0, 0, 0, 0);
-      
-      const sextaFeira = new Date(segundaFeira);
-      sextaFeira.setDate(segundaFeira.getDate() + 4);
-      
-      const semanaInicio = segundaFeira.toISOString().split('T')[0];
-      const semanaFim = sextaFeira.toISOString().split('T')[0];
-      
-      // Buscar prioridades existentes para este usuário nesta semana
-      const existingPriorities = await weeklyPriorityService.getAll({ semana: semanaInicio });
-      const existingForUser = existingPriorities.filter(p => String(p.usuario) === String(selectedUserForPriority.id));
-      
-      // IDs dos cards selecionados (normalizar para string)
-      const selectedCardIds = selectedCardsForPriority.map(c => String(c.id));
-      
-      // IDs dos cards que já têm prioridade (normalizar para string)
-      const existingCardIds = existingForUser.map(p => String(p.card));
-      
-      console.log('[Priorities] IDs selecionados:', selectedCardIds);
-      console.log('[Priorities] IDs existentes:', existingCardIds);
-      
-      // Cards para criar (selecionados mas não existentes)
-      const cardsToCreate = selectedCardIds.filter(id => !existingCardIds.includes(id));
-      
-      // Cards para deletar (existentes mas não selecionados)
-      const cardsToDelete = existingForUser.filter(p => !selectedCardIds.includes(String(p.card)));
-      
-      console.log('[Priorities] Cards para criar:', cardsToCreate);
-      console.log('[Priorities] Cards para deletar:', cardsToDelete.map(p => p.card));
-      
-      // Criar novas prioridades
-      const createPromises = cardsToCreate.map(async (cardId) => {
-        try {
-          await weeklyPriorityService.create({
-            usuario: selectedUserForPriority.id,
-            card: cardId,
-            semana_inicio: semanaInicio,
-            semana_fim: semanaFim,
-          });
-        } catch (error: any) {
-          console.error('Erro ao criar prioridade:', error);
-          console.error('Dados enviados:', {
-            usuario: selectedUserForPriority.id,
-            card: cardId,
-            semana_inicio: semanaInicio,
-            semana_fim: semanaFim,
-          });
-          console.error('Resposta do servidor:', error.response?.data);
-          // Se for erro de duplicata, ignorar (já existe)
-          if (error.response?.status === 400 && error.response?.data?.non_field_errors) {
-            console.warn('Prioridade já existe, ignorando...');
-            return;
-          }
-          throw error;
-        }
-      });
-      
-      await Promise.all(createPromises);
-      
-      // Deletar prioridades removidas
-      for (const priority of cardsToDelete) {
-        await weeklyPriorityService.delete(priority.id);
-      }
-      
-      // Recarregar dados
-      await loadData();
+      // Uma requisição: o backend compara com as prioridades atuais do usuário na semana,
+      // cria as novas e remove as desmarcadas (lista vazia remove todas)
+      const board = await weeklyPriorityService.applyPlan([
+        {
+          usuario: selectedUserForPriority.id,
+          cards: selectedCardsForPriority.map(c => c.id),
+        },
+      ]);
+      console.log('[Priorities] Plano aplicado:', { criadas: board.criadas, removidas: board.removidas });
+      await applyBoard(board);
       
       // Disparar evento customizado para atualização em tempo real
       window.dispatchEvent(
         new CustomEvent('weeklyPriorityUpdated', {
           detail: {
             usuario: selectedUserForPriority.id,
-            action: 'saved'
+            action: selectedCardsForPriority.length === 0 ? 'deleted_all' : 'saved'
           }
         })
       );
@@ -489,21 +403,13 @@ export default function Priorities() {
     
     setDeletePriorityLoading(true);
     try {
-      const hoje = new Date();
-      const diasAteSegunda = hoje.getDay() === 0 ? 6 : hoje.getDay() - 1;
-      const segundaFeira = new Date(hoje);
-      segundaFeira.setDate(hoje.getDate() - diasAteSegunda);
-      const semanaInicio = segundaFeira.toISOString().split('T')[0];
-      
-      // Buscar todas as prioridades do usuário para a semana atual
-      const existingPriorities = await weeklyPriorityService.getAll({ semana: semanaInicio });
-      const userPriorities = existingPriorities.filter(p => String(p.usuario) === String(priorityToDelete.userId));
+      // Remover todas as prioridades do usuário na semana atual (plano com lista vazia)
+      const board = await weeklyPriorityService.applyPlan([
+        { usuario: priorityToDelete.userId, cards: [] },
+      ]);
+      await applyBoard(board);
       
-      // Deletar todas as prioridades do usuário
-      if (userPriorities.length > 0) {
-        await Promise.all(userPriorities.map(p => weeklyPriorityService.delete(p.id)));
-        await loadData();
-        
+      if (board.removidas > 0) {
         // Disparar evento customizado para atualização em tempo real
         window.dispatchEvent(
           new CustomEvent('weeklyPriorityUpdated', {
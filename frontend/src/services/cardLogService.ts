@@ -13,26 +13,50 @@ export type CardLog = {
   data: string;
 };
 
-// Tipo para resposta paginada
+// Tipo para resposta paginada (por cursor: sem count, seguir o link next)
 type PaginatedResponse<T> = {
-  count: number;
   next: string | null;
   previous: string | null;
   results: T[];
 };
 
-export const cardLogService = {
-  getByCard: async (cardId: string): Promise<CardLog[]> => {
-    const response = await api.get<PaginatedResponse<CardLog> | CardLog[]>(`/card-logs/?card=${cardId}`);
+// Segue o cursor (link next) até a última página
+const fetchAllPages = async (firstUrl: string): Promise<CardLog[]> => {
+  const allLogs: CardLog[] = [];
+  let nextUrl: string | null = firstUrl;
+  
+  while (nextUrl) {
+    const response = await api.get<PaginatedResponse<CardLog> | CardLog[]>(nextUrl);
     
     // Se for um array direto, retornar
     if (Array.isArray(response.data)) {
       return response.data;
     }
     
-    // Se for paginado, retornar os results
+    // Se for paginado, acumular os results e seguir o cursor da próxima página
     const paginatedData = response.data as PaginatedResponse<CardLog>;
-    return paginatedData.results || [];
+    allLogs.push(...(paginatedData.results || []));
+    if (paginatedData.next) {
+      const url = new URL(paginatedData.next);
+      // A baseURL já inclui /api
+      const pathname = url.pathname.startsWith('/api/') ? url.pathname.substring(4) : url.pathname;
+      nextUrl = pathname + url.search;
+    } else {
+      nextUrl = null;
+    }
+  }
+  
+  return allLogs;
+};
+
+export const cardLogService = {
+  getByCard: async (cardId: string): Promise<CardLog[]> => {
+    return fetchAllPages(`/card-logs/?card=${cardId}&page_size=100`);
+  },
+
+  // Logs de sprints finalizadas movidos para o arquivo (carregados sob demanda)
+  getArchivedByCard: async (cardId: string): Promise<CardLog[]> => {
+    return fetchAllPages(`/card-logs/archived/?card=${cardId}&page_size=100`);
   },
 
   create: async (data: {
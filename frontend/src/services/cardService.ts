@@ -56,6 +56,14 @@ export type Card = {
   updated_at?: string;
 };
 
+export type CardBulkOperation = {
+  cards: string[];
+  status?: string;
+  prioridade?: string;
+  responsavel?: string | null;
+  projeto?: string;
+};
+
 export type CardCreate = {
   nome: string;
   descricao?: string;
@@ -119,6 +127,22 @@ export const CARD_STATUSES = [
   { value: 'inviabilizado', label: 'Inviabilizado' },
 ];
 
+// Projeção da listagem: por padrão /cards/ devolve a versão enxuta do card.
+// expand inclui campos caros (projeto_detail, todos, events_count) e
+// fields limita a resposta às colunas informadas.
+export type CardListOptions = {
+  expand?: Array<'projeto_detail' | 'todos' | 'events_count'>;
+  fields?: Array<keyof Card>;
+};
+
+const withListOptions = (url: string, options?: CardListOptions): string => {
+  const params: string[] = [];
+  if (options?.expand?.length) params.push(`expand=${options.expand.join(',')}`);
+  if (options?.fields?.length) params.push(`fields=${options.fields.join(',')}`);
+  if (!params.length) return url;
+  return url + (url.includes('?') ? '&' : '?') + params.join('&');
+};
+
 // Tipo para resposta paginada
 type PaginatedResponse<T> = {
   count: number;
@@ -128,9 +152,9 @@ type PaginatedResponse<T> = {
 };
 
 export const cardService = {
-  async getAll(): Promise<Card[]> {
+  async getAll(options?: CardListOptions): Promise<Card[]> {
     const allCards: Card[] = [];
-    let nextUrl: string | null = '/cards/';
+    let nextUrl: string | null = withListOptions('/cards/', options);
     
     // Fazer requisições paginadas até obter todos os cards
     while (nextUrl) {
@@ -174,9 +198,9 @@ export const cardService = {
     return allCards;
   },
 
-  async getByProject(projectId: string): Promise<Card[]> {
+  async getByProject(projectId: string, options?: CardListOptions): Promise<Card[]> {
     const allCards: Card[] = [];
-    let nextUrl: string | null = `/cards/?projeto=${projectId}`;
+    let nextUrl: string | null = withListOptions(`/cards/?projeto=${projectId}`, options);
     
     // Fazer requisições paginadas até obter todos os cards do projeto
     while (nextUrl) {
@@ -220,9 +244,9 @@ export const cardService = {
     return allCards;
   },
 
-  async getByResponsavel(userId: string): Promise<Card[]> {
+  async getByResponsavel(userId: string, options?: CardListOptions): Promise<Card[]> {
     const allCards: Card[] = [];
-    let nextUrl: string | null = `/cards/?responsavel=${userId}`;
+    let nextUrl: string | null = withListOptions(`/cards/?responsavel=${userId}`, options);
     
     // Fazer requisições paginadas até obter todos os cards do responsável
     while (nextUrl) {
@@ -288,4 +312,11 @@ export const cardService = {
   async delete(id: string): Promise<void> {
     await api.delete(`/cards/${id}/`);
   },
+
+  // Altera vários cards em uma requisição (ex.: reorganizar o quadro). Cada operação aplica
+  // os mesmos valores a uma lista de cards; retorna os ids alterados e os cards atualizados.
+  async bulkUpdate(operacoes: CardBulkOperation[]): Promise<{ alterados: string[]; cards: Card[] }> {
+    const response = await api.post('/cards/bulk/', { operacoes });
+    return response.data;
+  },
 };
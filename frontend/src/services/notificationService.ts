@@ -14,8 +14,8 @@ export type Notification = {
   metadata?: Record<string, any>;
 };
 
+// Paginação por cursor: sem count, navegar sempre pelo link next
 type PaginatedResponse<T> = {
-  count: number;
   next: string | null;
   previous: string | null;
   results: T[];
@@ -31,7 +31,6 @@ export const notificationService = {
     filter?: 'mine' | 'all';
     tipo?: string;
     lida?: boolean;
-    page?: number;
   }): Promise<Notification[]> {
     const allNotifications: Notification[] = [];
     const queryParams = new URLSearchParams();
@@ -45,11 +44,10 @@ export const notificationService = {
     if (params?.lida !== undefined) {
       queryParams.append('lida', params.lida.toString());
     }
-    if (params?.page) {
-      queryParams.append('page', params.page.toString());
-    }
     
-    let nextUrl: string | null = `/notifications/${queryParams.toString() ? `?${queryParams.toString()}` : ''}`;
+    queryParams.append('page_size', '100');
+    
+    let nextUrl: string | null = `/notifications/?${queryParams.toString()}`;
     
     // Fazer requisições paginadas até obter todas as notificações
     while (nextUrl) {
@@ -25,6 +25,17 @@ export type WeeklyPriorityConfig = {
   updated_at?: string;
 };
 
+export type WeeklyPriorityBoard = {
+  semana_fechada: boolean;
+  semana_inicio: string;
+  data: any[];
+};
+
+export type WeeklyPriorityPlanItem = {
+  usuario: string | number;
+  cards: (string | number)[];
+};
+
 export const weeklyPriorityService = {
   async getAll(params?: { semana?: string }): Promise<WeeklyPriority[]> {
     const response = await api.get('/weekly-priorities/', { params });
@@ -65,7 +76,17 @@ export const weeklyPriorityService = {
     return response.data || [];
   },
 
-  async getPrioritiesView(): Promise<{ semana_fechada: boolean; semana_inicio: string; data: any[] }> {
+  // Aplica o plano da semana em uma requisição: para cada usuário, as prioridades passam
+  // a ser exatamente os cards informados (lista vazia remove todas). Retorna o quadro atualizado.
+  async applyPlan(
+    plano: WeeklyPriorityPlanItem[],
+    options?: { semana_inicio?: string; substituir?: boolean }
+  ): Promise<WeeklyPriorityBoard & { criadas: number; removidas: number }> {
+    const response = await api.post('/weekly-priorities/bulk/', { plano, ...options });
+    return response.data;
+  },
+
+  async getPrioritiesView(): Promise<WeeklyPriorityBoard> {
     const response = await api.get('/weekly-priorities/priorities_view/');
     return response.data || { semana_fechada: false, semana_inicio: '', data: [] };
   },